@@ -16,6 +16,8 @@ import os
 import sys
 import re
 
+from models.entity_extractor import get_extractor
+
 # Global variables
 DEFAULT_CHROME_PROFILE = None
 test_count = 0
@@ -287,123 +289,15 @@ MODEL2_STEP_RULES = {
 }
 
 # ============================================================================
-# HELPER FUNCTIONS (reusable extraction logic)
+# KEYWORD EXTRACTION (shared gazetteer: models/entity_extractor.py)
 # ============================================================================
 
-def extract_profile_name(text):
-    """Extract Chrome profile name from text"""
-    patterns = [
-        r'with chrome profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-        r'chrome profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-        r'with profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-        r'use profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-        r'profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
-        if match:
-            return match.group(1).strip()
-
-    return DEFAULT_CHROME_PROFILE or "Default"
-
-def extract_website_and_action(text):
-    """Extract website URL and search query from text"""
-    websites = {
-        'youtube': 'youtube.com', 'google': 'google.com', 'gmail': 'mail.google.com',
-        'facebook': 'facebook.com', 'twitter': 'twitter.com', 'instagram': 'instagram.com',
-        'linkedin': 'linkedin.com', 'github': 'github.com', 'reddit': 'reddit.com',
-        'amazon': 'amazon.com', 'netflix': 'netflix.com', 'spotify': 'open.spotify.com',
-    }
-
-    text_l = text.lower()
-    website = 'google.com'  # default
-
-    # Detect website
-    for keyword, url in websites.items():
-        if keyword in text_l:
-            website = url
-            break
-
-    # Extract query (remove profile, website names, command words)
-    query_text = text_l
-    for pattern in [r'with chrome profile [\w\s]+', r'chrome profile [\w\s]+', r'profile [\w\s]+']:
-        query_text = re.sub(pattern, '', query_text)
-
-    skip_words = {'with', 'chrome', 'search', 'for', 'open', 'go', 'to', 'on', 'in', 'and', 
-                  'youtube', 'google', 'gmail', 'facebook', 'profile'}
-    query_words = [w for w in query_text.split() if w not in skip_words and w.strip()]
-
-    return website, ' '.join(query_words) if query_words else None
-
-def extract_app_name(words, trigger_words):
-    """Extract app name after trigger words"""
-    for trigger in trigger_words:
-        if trigger in words:
-            idx = words.index(trigger)
-            app_words = [w for w in words[idx+1:] if w not in ['app', 'application', 'program']]
-            if app_words:
-                return ' '.join(app_words)
-    return None
-
-def extract_text_after_keywords(words, keywords, skip_words):
-    """Generic function to extract text after certain keywords"""
-    for keyword in keywords:
-        if keyword in words:
-            idx = words.index(keyword)
-            text_words = [w for w in words[idx+1:] if w not in skip_words]
-            if text_words:
-                return ' '.join(text_words)
-    return None
-def extract_file_or_folder_path(words, raw_command):
-    """
-    Detect if command is for file/folder and extract path/name.
-    Returns: (is_file_operation, target_name, target_type, is_known_folder)
-    """
-    # File/folder indicators
-    file_indicators = ['file', 'document', 'doc', 'pdf', 'image', 'video', 'folder', 'directory']
-    
-    # Common folder names with full paths
-    common_folders = {
-        'documents': r'%USERPROFILE%\Documents',
-        'downloads': r'%USERPROFILE%\Downloads',
-        'desktop': r'%USERPROFILE%\Desktop',
-        'pictures': r'%USERPROFILE%\Pictures',
-        'videos': r'%USERPROFILE%\Videos',
-        'music': r'%USERPROFILE%\Music',
-    }
-    
-    is_file_operation = any(indicator in words for indicator in file_indicators)
-    
-    if not is_file_operation:
-        return False, None, None, False  # ✅ FIXED: Return 4 values
-    
-    # Check for common folder names
-    for folder_keyword, folder_path in common_folders.items():
-        if folder_keyword in words:
-            return True, folder_path, 'folder', True  # ✅ Return 4 values: is_file_op, path, type, is_known
-    
-    # Extract custom file/folder name (needs search)
-    skip_words = {'open', 'file', 'folder', 'document', 'my', 'the', 'launch', 'show', 'browse', 'to'}
-    target_words = [w for w in words if w not in skip_words]
-    
-    if target_words:
-        target_name = ' '.join(target_words)
-        target_type = 'folder' if 'folder' in words or 'directory' in words else 'file'
-        return True, target_name, target_type, False  # ✅ Return 4 values: is_file_op, name, type, NOT known (needs search)
-    
-    return False, None, None, False  # ✅ FIXED: Return 4 values
-
-
-
-# ============================================================================
-# KEYWORD EXTRACTION (simplified using helpers)
-# ============================================================================
+EXTRACTOR = get_extractor()
 
 def extract_keywords_by_command_type(raw_command, command_type):
-    """Unified keyword extraction using helper functions"""
-    raw_command_lower = raw_command.lower().strip()
-    words = raw_command_lower.split()
+    """Unified keyword extraction over a single tokenization of the command"""
+    parsed = EXTRACTOR.parse(raw_command)
+    words = parsed.words
 
     extracted = {
     'app_name': None, 
@@ -429,23 +323,16 @@ def extract_keywords_by_command_type(raw_command, command_type):
     'has_message_content': False,
 }
 
-
-    # OPEN_APP / CLOSE_APP
-        # OPEN_APP / CLOSE_APP (now handles files/folders too)
-    
-        # ✅ SIMPLIFIED: OPEN_APP (no file/folder logic)
     if command_type == "OPEN_APP":
         trigger = ['open', 'launch', 'start', 'run']
-        extracted['app_name'] = extract_app_name(words, trigger) or ('chrome' if 'chrome' in words else 'current')
+        extracted['app_name'] = EXTRACTOR.app_name(parsed, trigger) or ('chrome' if parsed.has('chrome') else 'current')
     
-    # ✅ SIMPLIFIED: CLOSE_APP (no file/folder logic)
     elif command_type == "CLOSE_APP":
         trigger = ['close', 'exit', 'quit']
-        extracted['app_name'] = extract_app_name(words, trigger) or 'current'
+        extracted['app_name'] = EXTRACTOR.app_name(parsed, trigger) or 'current'
     
-    # ✅ NEW: FILE_FOLDER_OPERATION (dedicated handler)
     elif command_type == "FILE_FOLDER_OPERATION":
-        is_file_op, target_name, target_type, is_known = extract_file_or_folder_path(words, raw_command_lower)
+        is_file_op, target_name, target_type, is_known = EXTRACTOR.file_or_folder(parsed)
         
         extracted['is_file_operation'] = True
         extracted['is_known_folder'] = is_known
@@ -458,19 +345,17 @@ def extract_keywords_by_command_type(raw_command, command_type):
         else:
             # Unknown file/folder - will search
             extracted['search_target'] = target_name
-    
-
 
     # WEB_SEARCH
     elif command_type == "WEB_SEARCH":
-        extracted['profile_name'] = extract_profile_name(raw_command_lower)
-        website, query = extract_website_and_action(raw_command_lower)
+        extracted['profile_name'] = EXTRACTOR.profile_name(parsed.lower) or DEFAULT_CHROME_PROFILE or "Default"
+        website, query = EXTRACTOR.website_and_query(parsed, default='google.com')
         extracted['website'] = website
         extracted['search_query'] = query
 
     # TYPE_TEXT
     elif command_type == "TYPE_TEXT":
-        extracted['text_content'] = extract_text_after_keywords(words, ['type', 'write', 'enter'], {'text', 'message'})
+        extracted['text_content'] = EXTRACTOR.words_after(parsed, ['type', 'write', 'enter'], {'text', 'message'})
 
     # MOUSE_CLICK
     elif command_type in ["MOUSE_CLICK", "MOUSE_RIGHTCLICK", "MOUSE_DOUBLECLICK"]:
@@ -479,54 +364,38 @@ def extract_keywords_by_command_type(raw_command, command_type):
 
     # WINDOW_ACTION
     elif command_type == "WINDOW_ACTION":
-        extracted['window_action'] = 'maximize' if any(w in words for w in ['maximize', 'fullscreen']) else 'minimize'
+        extracted['window_action'] = 'maximize' if parsed.has('maximize') or parsed.has('fullscreen') else 'minimize'
 
     # KEYBOARD
     elif command_type == "KEYBOARD":
         shortcuts = {'copy': 'ctrl+c', 'paste': 'ctrl+v', 'save': 'ctrl+s', 'undo': 'ctrl+z'}
-        for word, shortcut in shortcuts.items():
-            if word in words:
-                extracted['keyboard_shortcut'] = shortcut
-                break
+        extracted['keyboard_shortcut'] = next((s for word, s in shortcuts.items() if parsed.has(word)), None)
 
     # SYSTEM
     elif command_type == "SYSTEM":
-        extracted['system_action'] = 'screenshot' if 'screenshot' in words or 'capture' in words else 'lock'
+        extracted['system_action'] = 'screenshot' if parsed.has('screenshot') or parsed.has('capture') else 'lock'
 
     # APP_WITH_ACTION (consolidated: search/type/play/compose)
     elif command_type == "APP_WITH_ACTION":
-        if 'and' in words:
-            and_idx = words.index('and')
-            extracted['app_name'] = extract_app_name(words[:and_idx], ['open', 'launch', 'start'])
+        and_idx = parsed.index('and')
+        if and_idx != -1:
+            extracted['app_name'] = EXTRACTOR.app_name(parsed, ['open', 'launch', 'start'], end=and_idx)
             extracted['action_content'] = ' '.join([w for w in words[and_idx+1:] if w not in ['search', 'type', 'play']])
 
     # MEDIA_CONTROL (consolidated: music/video streaming)
     elif command_type == "MEDIA_CONTROL":
-        apps = ['spotify', 'netflix', 'youtube', 'vlc']
-        extracted['app_name'] = next((app for app in apps if app in words), 'spotify')
+        extracted['app_name'] = parsed.first('media_app', 'spotify')
         extracted['media_query'] = ' '.join([w for w in words if w not in ['play', 'stream', 'music', 'video', extracted['app_name']]])
 
     # SEND_MESSAGE (consolidated: WhatsApp/email/social)
     elif command_type == "SEND_MESSAGE":
-    # 1. Detect which messaging app
-        apps_map = {
-        'whatsapp': 'whatsapp', 
-        'email': 'outlook', 
-        'social': 'facebook',
-        'twitter': 'twitter',
-        'instagram': 'instagram',
-        'telegram': 'telegram',
-    }
-        extracted['app_name'] = next((v for k, v in apps_map.items() if k in raw_command_lower), 'whatsapp')
-    
-    # 2. Extract FULL recipient (supports multi-word names like "john smith")
-    if 'to' in words:
-        to_idx = words.index('to')
-        recipient_words = words[to_idx + 1:]
-        if recipient_words:
-            extracted['recipient'] = ' '.join(recipient_words)
-    
-    # 3. Message content e
+        extracted['app_name'] = parsed.first('messaging_app', 'whatsapp')
+
+        # Full recipient (supports multi-word names like "john smith")
+        to_idx = parsed.index('to')
+        if to_idx != -1 and words[to_idx + 1:]:
+            extracted['recipient'] = parsed.first('contact', start=to_idx + 1) or ' '.join(words[to_idx + 1:])
+
     return extracted
 
 # ============================================================================
@@ -644,22 +513,84 @@ def calculate_tfidf_similarity(str1, str2):
     order_bonus = sum(0.1 for i in range(min(len(words1), len(words2))) if words1[i] == words2[i])
     return min(1.0, similarity + order_bonus)
 
+# Order bonus for k aligned words, summed exactly like calculate_tfidf_similarity
+# does (0.1 + 0.1 + 0.1 != 0.3 in floating point)
+def _order_bonus(k):
+    return sum(0.1 for _ in range(k))
+
+
+class PatternIndex:
+    """
+    Inverted index (token -> patterns) giving the same scores as calculate_tfidf_similarity.
+    Only patterns that share a token with the input are scored; every other
+    pattern scores 0 and can never be the best match.
+    """
+
+    def __init__(self, training_data):
+        self.patterns = [pattern for pattern, _ in training_data]
+        self.command_types = [cmd_type for _, cmd_type in training_data]
+        self.lengths = []
+        self.postings = {}  # token -> [(pattern id, positions of token in pattern), ...]
+        for pattern_id, pattern in enumerate(self.patterns):
+            words = pattern.lower().split()
+            self.lengths.append(len(words))
+            positions = {}
+            for i, word in enumerate(words):
+                positions.setdefault(word, []).append(i)
+            for word, word_positions in positions.items():
+                self.postings.setdefault(word, []).append((pattern_id, frozenset(word_positions)))
+        self._bonus = [_order_bonus(k) for k in range(max(self.lengths, default=0) + 1)]
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def scores(self, input_text):
+        """{pattern id: similarity} for every pattern sharing a token with the input"""
+        words = input_text.lower().split()
+        input_positions = {}
+        for i, word in enumerate(words):
+            input_positions.setdefault(word, []).append(i)
+
+        matches, aligned = {}, {}
+        for word, positions in input_positions.items():
+            for pattern_id, pattern_positions in self.postings.get(word, ()):
+                matches[pattern_id] = matches.get(pattern_id, 0) + len(positions)
+                same_place = sum(1 for i in positions if i in pattern_positions)
+                if same_place:
+                    aligned[pattern_id] = aligned.get(pattern_id, 0) + same_place
+
+        n_words = len(words)
+        return {
+            pattern_id: min(1.0, count / max(n_words, self.lengths[pattern_id])
+                            + self._bonus[aligned.get(pattern_id, 0)])
+            for pattern_id, count in matches.items()
+        }
+
+    def best(self, input_text):
+        """(pattern id, similarity) of the best match - earliest pattern wins ties - or None"""
+        best_id, highest = None, 0
+        for pattern_id, similarity in self.scores(input_text).items():
+            if similarity > highest or (similarity == highest and best_id is not None and pattern_id < best_id):
+                best_id, highest = pattern_id, similarity
+        return (best_id, highest) if best_id is not None else None
+
+
+MODEL1_INDEX = PatternIndex(MODEL1_TRAINING_DATA)
+
+
 def process_command_model1(input_text):
     """Model 1: Command type classifier"""
-    best_match, highest_similarity = None, 0
-
-    for pattern, cmd_type in MODEL1_TRAINING_DATA:
-        similarity = calculate_tfidf_similarity(input_text, pattern)
-        if similarity > highest_similarity:
-            highest_similarity = similarity
-            best_match = (pattern, cmd_type)
+    match = MODEL1_INDEX.best(input_text)
+    if not match:
+        return None
 
+    pattern_id, similarity = match
     return {
         "input": input_text,
-        "command_type": best_match[1],
-        "confidence": highest_similarity,
-        "training_pattern": best_match[0],
-    } if best_match else None
+        "command_type": MODEL1_INDEX.command_types[pattern_id],
+        "confidence": similarity,
+        "training_pattern": MODEL1_INDEX.patterns[pattern_id],
+    }
 
 # ============================================================================
 # PIPELINE & UI
@@ -0,0 +1,79 @@
+"""
+Keyword-extraction parity check for models.command_pipeline.extract_keywords
+Runs a fixed set of commands through the shared extractor and compares the
+non-empty fields with the values the original per-front-end substring scan
+produced (plus the punctuation/domain cases that the token-level gazetteer
+must also handle), and times the extraction.
+
+Usage:
+    python -m benchmarks.extraction_check
+    python -m benchmarks.extraction_check --repeat 1000
+"""
+
+import argparse
+import sys
+import time
+
+from models.command_pipeline import extract_keywords
+
+# (command, command type, expected non-empty fields)
+CASES = [
+    ("search python on youtube", "WEB_SEARCH",
+     {"website": "youtube.com", "search_query": "python", "profile_name": "Default"}),
+    ("with chrome profile work search cats", "WEB_SEARCH", {"profile_name": "work"}),
+    ("open gmail", "WEB_SEARCH", {"website": "mail.google.com", "profile_name": "Default"}),
+    ("open spotify", "OPEN_APP", {"app_name": "spotify"}),
+    ("close chrome", "CLOSE_APP", {"app_name": "chrome"}),
+    ("open my downloads folder", "OPEN_FOLDER", {"file_path": r"%USERPROFILE%\Downloads"}),
+    ("type Hello World", "TYPE_TEXT", {"text_content": "Hello World"}),
+    ("play believer", "MEDIA_CONTROL", {"app_name": "spotify", "media_query": "believer"}),
+    ("send hi to mom", "SEND_MESSAGE", {"app_name": "whatsapp", "recipient": "mom", "message_content": "hi"}),
+    ("open spotify and play believer", "APP_WITH_ACTION", {"app_name": "spotify", "action_content": "believer"}),
+    # Punctuation and domain names
+    ("go to github.com", "WEB_SEARCH", {"website": "github.com", "profile_name": "Default"}),
+    ("go to www.youtube.com", "WEB_SEARCH", {"website": "youtube.com", "profile_name": "Default"}),
+    ("open https://reddit.com/", "WEB_SEARCH", {"website": "reddit.com", "profile_name": "Default"}),
+    ("go to mail.google.com", "WEB_SEARCH", {"website": "mail.google.com", "profile_name": "Default"}),
+    ("search cats on youtube.", "WEB_SEARCH",
+     {"website": "youtube.com", "search_query": "cats", "profile_name": "Default"}),
+    ("search c++ tutorial on google!", "WEB_SEARCH",
+     {"website": "google.com", "search_query": "c++ tutorial", "profile_name": "Default"}),
+    ("search example.com pricing", "WEB_SEARCH", {"search_query": "example.com pricing", "profile_name": "Default"}),
+    ("play despacito on spotify.", "MEDIA_CONTROL", {"app_name": "spotify", "media_query": "despacito"}),
+    ("play lofi beats on youtube", "MEDIA_CONTROL", {"app_name": "youtube", "media_query": "lofi beats"}),
+    ("open my downloads folder.", "OPEN_FOLDER", {"file_path": r"%USERPROFILE%\Downloads"}),
+    ("maximize.", "WINDOW_ACTION", {"window_action": "maximize"}),
+]
+
+
+def run_checks(cases=CASES):
+    """[(command, field, expected, actual), ...] for every mismatching field"""
+    mismatches = []
+    for command, command_type, expected in cases:
+        actual = {key: value for key, value in extract_keywords(command, command_type).items() if value}
+        for field in sorted(set(expected) | set(actual)):
+            if expected.get(field) != actual.get(field):
+                mismatches.append((command, field, expected.get(field), actual.get(field)))
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check extract_keywords against known-good outputs")
+    parser.add_argument("--repeat", type=int, default=100, help="Timed passes over the cases")
+    args = parser.parse_args(argv)
+
+    mismatches = run_checks()
+    for command, field, expected, actual in mismatches:
+        print(f"❌ {command!r}: {field} expected {expected!r}, got {actual!r}")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for command, command_type, _ in CASES:
+            extract_keywords(command, command_type)
+    per_call_us = (time.perf_counter() - start) / (args.repeat * len(CASES)) * 1e6
+    print(f"{len(CASES)} cases, {len(mismatches)} mismatches, {per_call_us:.1f} µs per extraction")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
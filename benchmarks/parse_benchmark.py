@@ -0,0 +1,447 @@
+"""
+Screen-parsing benchmark over the temp_screenshots corpus
+Runs parse_screen's stages (decode, YOLO, OCR) and, optionally, the
+util/utils pipeline stages (overlap removal, captioning, annotation) on
+every image, reports p50/p95/p99 latency, peak RSS and element counts,
+stores the results as JSON and can fail on regressions vs a baseline.
+Synthetic screens (benchmarks/synthetic_screens.py) add ground-truth recall
+and element-count scaling of overlap removal, target matching and prompt building.
+
+Usage:
+    python -m benchmarks.parse_benchmark --limit 50 --output bench/parse.json
+    python -m benchmarks.parse_benchmark --baseline bench/parse.json --threshold 0.2
+    python -m benchmarks.parse_benchmark --synthetic 10,100,1000 --resolution 2560x1440
+    python -m benchmarks.parse_benchmark --scaling 10,100,1000,5000 --no-parse
+    python -m benchmarks.parse_benchmark --scales 1.0,0.75,0.5,adaptive --limit 30
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tempfile
+from datetime import datetime
+
+from benchmarks.synthetic_screens import generate_screen, load_ground_truth, parse_resolution, save_screen
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(BASE_DIR, "temp_screenshots")
+
+STAGES = ["decode", "yolo", "ocr", "overlap", "caption", "annotate", "total"]
+
+
+# ---------- Measurement helpers ----------
+def percentile(values, pct):
+    """Nearest-rank percentile of a list (0 for empty lists)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(values):
+    """p50/p95/p99/mean/max of a list of numbers"""
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "max": max(values) if values else 0.0,
+        "n": len(values),
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return 0.0
+
+
+class StageTimer:
+    """Collects per-stage latencies (ms) across a run"""
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+
+    def add(self, stage, seconds):
+        self.samples.setdefault(stage, []).append(seconds * 1000.0)
+
+    def summary(self):
+        return {stage: summarize(values) for stage, values in self.samples.items() if values}
+
+
+# ---------- Corpus ----------
+def load_corpus(path, limit=None):
+    """Sorted list of image paths in a corpus folder"""
+    images = sorted(glob.glob(os.path.join(path, "*.png")) + glob.glob(os.path.join(path, "*.jpg")))
+    return images[:limit] if limit else images
+
+
+# ---------- Pipeline stages ----------
+def elements_to_ratio_boxes(elements, width, height):
+    """Convert parse_screen elements into util/utils remove_overlap_new inputs"""
+    icons, texts = [], []
+    for elem in elements:
+        x1, y1, x2, y2 = elem["bbox"]
+        box = [x1 / width, y1 / height, x2 / width, y2 / height]
+        if elem.get("type") == "text":
+            texts.append({"type": "text", "bbox": box, "interactivity": False,
+                          "content": elem.get("label", "")[len("Text: "):]})
+        else:
+            icons.append({"type": "icon", "bbox": box, "interactivity": True, "content": None})
+    return icons, texts
+
+
+def run_util_stages(image, elements, timer, caption_model_processor=None, iou_threshold=0.7):
+    """Time the util/utils post-processing stages on an already parsed image"""
+    import numpy as np
+    import torch
+    from torchvision.ops import box_convert
+    from util.utils import remove_overlap_new, annotate, get_parsed_content_icon
+
+    width, height = image.size
+    icons, texts = elements_to_ratio_boxes(elements, width, height)
+
+    start = time.perf_counter()
+    filtered = remove_overlap_new(boxes=icons, iou_threshold=iou_threshold, ocr_bbox=texts)
+    timer.add("overlap", time.perf_counter() - start)
+
+    filtered = sorted(filtered, key=lambda b: b["content"] is None)
+    boxes = torch.tensor([b["bbox"] for b in filtered]) if filtered else torch.zeros((0, 4))
+    image_np = np.asarray(image)
+
+    if caption_model_processor is not None:
+        starting_idx = next((i for i, b in enumerate(filtered) if b["content"] is None), -1)
+        start = time.perf_counter()
+        if starting_idx >= 0:
+            get_parsed_content_icon(boxes, starting_idx, image_np, caption_model_processor)
+        timer.add("caption", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    if len(boxes):
+        annotate(
+            image_source=image_np,
+            boxes=box_convert(boxes=boxes, in_fmt="xyxy", out_fmt="cxcywh"),
+            logits=None,
+            phrases=list(range(len(boxes))),
+            text_scale=0.4,
+        )
+    timer.add("annotate", time.perf_counter() - start)
+    return len(filtered)
+
+
+def recall_at_iou(predicted, truth, iou_threshold=0.5):
+    """Fraction of ground-truth boxes matched by a predicted box with IoU >= threshold"""
+    from vision.element_tracker import box_iou
+
+    if not truth:
+        return None
+    matched = sum(
+        1 for t in truth
+        if any(box_iou(t["bbox"], p["bbox"]) >= iou_threshold for p in predicted)
+    )
+    return matched / len(truth)
+
+
+def run_scaling(counts, width=1920, height=1080, font_size=14, overlap=0.05, repeats=3, seed=0):
+    """
+    Time remove_overlap_new, the target matcher and prompt building against element count.
+
+    Uses synthetic ground truth as the element list, so no detection models are needed.
+
+    Returns:
+        {count: {stage: latency summary}}
+    """
+    import logging
+    from util.utils import remove_overlap_new
+    from vision.screen_analyzer import ScreenAnalyzer
+
+    # Matcher and prompt builder are pure methods; skip Gemini setup
+    analyzer = ScreenAnalyzer.__new__(ScreenAnalyzer)
+    analyzer.logger = logging.getLogger("ScreenAnalyzer")
+    analyzer.logger.setLevel(logging.WARNING)
+
+    rng = random.Random(seed)
+    scaling = {}
+    for count in counts:
+        image, elements = generate_screen(width, height, count, font_size, overlap, seed)
+        icons, texts = elements_to_ratio_boxes(elements, width, height)
+        timer = StageTimer()
+        for _ in range(repeats):
+            target = rng.choice(elements)["label"].replace("Text: ", "")
+            step = {"description": f"Click {target}"}
+
+            start = time.perf_counter()
+            remove_overlap_new(boxes=icons, iou_threshold=0.7, ocr_bbox=list(texts))
+            timer.add("overlap", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            analyzer._fuzzy_match_element(target, elements)
+            timer.add("match", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            analyzer._build_selection_prompt(elements, target, step)
+            timer.add("prompt", time.perf_counter() - start)
+
+        scaling[count] = timer.summary()
+        print(f"[scaling] {count:>6} elements: " + "  ".join(
+            f"{stage}={stats['p50']:.1f}ms" for stage, stats in scaling[count].items()))
+    return scaling
+
+
+def run_benchmark(images, omniparser, util_stages=False, caption_model_processor=None, warmup=1,
+                  reference=None, elements_out=None):
+    """
+    Benchmark a list of image paths.
+
+    Args:
+        reference: Optional {path: elements} used as ground truth for images without a .json
+        elements_out: Optional dict filled with {path: parsed elements}
+
+    Returns:
+        dict with per-stage latency summaries, element counts and peak RSS
+    """
+    from PIL import Image
+
+    timer = StageTimer()
+    element_counts, filtered_counts, recalls = [], [], []
+
+    for path in images[:warmup]:
+        omniparser.parse_batch([Image.open(path).convert("RGB")])
+
+    for index, path in enumerate(images, start=1):
+        total_start = time.perf_counter()
+
+        start = time.perf_counter()
+        image = Image.open(path).convert("RGB")
+        timer.add("decode", time.perf_counter() - start)
+
+        result = omniparser.parse_batch([image])[0]
+        for stage, seconds in result.get("timings", {}).items():
+            timer.add(stage, seconds)
+        element_counts.append(result["total"])
+
+        if elements_out is not None:
+            elements_out[path] = result["elements"]
+        truth = load_ground_truth(path) or (reference or {}).get(path)
+        recall = recall_at_iou(result["elements"], truth)
+        if recall is not None:
+            recalls.append(recall)
+
+        if util_stages:
+            filtered_counts.append(run_util_stages(image, result["elements"], timer, caption_model_processor))
+
+        timer.add("total", time.perf_counter() - total_start)
+        print(f"[{index}/{len(images)}] {os.path.basename(path)}: {result['total']} elements "
+              f"({timer.samples['total'][-1]:.0f}ms)")
+
+    report = {
+        "stages_ms": timer.summary(),
+        "elements": summarize(element_counts),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    if filtered_counts:
+        report["filtered_elements"] = summarize(filtered_counts)
+    if recalls:
+        report["recall_iou50"] = summarize(recalls)
+    return report
+
+
+def run_scale_sweep(images, omniparser, scales, warmup=1, target_text_px=11):
+    """
+    Quality/latency table across inference scales.
+
+    The first row is always the policy-free baseline (YOLO at its default 640,
+    OCR at full resolution). Recall is measured against synthetic ground truth
+    when present, else against the elements found by the baseline.
+
+    Returns:
+        list of rows {"scale", "total_p50", "yolo_p50", "ocr_p50", "elements_mean", "recall_mean"}
+    """
+    from vision.resolution_policy import ResolutionPolicy
+
+    rows, reference = [], {}
+    original_policy = omniparser.resolution_policy
+    scales = ["baseline"] + [scale for scale in scales if scale != "baseline"]
+    for index, scale in enumerate(scales):
+        if scale == "baseline":
+            omniparser.resolution_policy = None
+        elif scale == "adaptive":
+            omniparser.resolution_policy = ResolutionPolicy(target_text_px=target_text_px)
+        else:
+            omniparser.resolution_policy = ResolutionPolicy(fixed_scale=float(scale))
+        print(f"\n--- scale {scale} ---")
+        report = run_benchmark(images, omniparser, warmup=warmup,
+                               reference=reference if index else None,
+                               elements_out=reference if index == 0 else None)
+        stages = report["stages_ms"]
+        rows.append({
+            "scale": scale,
+            "total_p50": stages["total"]["p50"],
+            "yolo_p50": stages.get("yolo", {}).get("p50", 0.0),
+            "ocr_p50": stages.get("ocr", {}).get("p50", 0.0),
+            "elements_mean": report["elements"]["mean"],
+            "recall_mean": report.get("recall_iou50", {}).get("mean"),
+        })
+    omniparser.resolution_policy = original_policy
+
+    print("\n" + "=" * 80)
+    print(f"{'scale':<10}{'total p50':>12}{'yolo p50':>12}{'ocr p50':>12}{'elements':>12}{'recall':>10}")
+    print("-" * 80)
+    for row in rows:
+        recall = f"{row['recall_mean']:.2f}" if row["recall_mean"] is not None else "ref"
+        print(f"{row['scale']:<10}{row['total_p50']:>12.1f}{row['yolo_p50']:>12.1f}{row['ocr_p50']:>12.1f}"
+              f"{row['elements_mean']:>12.1f}{recall:>10}")
+    print("=" * 80)
+    return rows
+
+
+# ---------- Regression check ----------
+def find_regressions(results, baseline, threshold, metrics=("p50", "p95")):
+    """
+    Compare stage latencies against a baseline results file.
+
+    Returns:
+        list of human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    base_stages = baseline.get("stages_ms", {})
+    for stage, stats in results.get("stages_ms", {}).items():
+        if stage not in base_stages:
+            continue
+        for metric in metrics:
+            old, new = base_stages[stage].get(metric, 0), stats.get(metric, 0)
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append(f"{stage} {metric}: {old:.1f}ms -> {new:.1f}ms (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_report(report):
+    if "stages_ms" not in report:
+        return
+    print("\n" + "=" * 80)
+    print(f"{'stage':<10}{'p50':>10}{'p95':>10}{'p99':>10}{'mean':>10}{'n':>8}")
+    print("-" * 80)
+    for stage, stats in report["stages_ms"].items():
+        print(f"{stage:<10}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}"
+              f"{stats['mean']:>10.1f}{stats['n']:>8}")
+    print("-" * 80)
+    print(f"elements p50={report['elements']['p50']} max={report['elements']['max']}  "
+          f"peak RSS={report['peak_rss_mb']} MB")
+    if "recall_iou50" in report:
+        print(f"ground-truth recall@IoU0.5 mean={report['recall_iou50']['mean']:.2f}")
+    print("=" * 80)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parse_screen over a screenshot corpus")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Folder of screenshots")
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N images")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed warm-up parses")
+    parser.add_argument("--name", default="default", help="Config label stored with the results")
+    parser.add_argument("--util-stages", action="store_true", help="Also time overlap removal and annotation")
+    parser.add_argument("--caption-model", default=None, help="Caption model name (blip2/florence2) to time captioning")
+    parser.add_argument("--caption-model-path", default=None, help="Caption model weights path")
+    parser.add_argument("--synthetic", default=None, help="Benchmark synthetic screens with these element counts (e.g. 10,100,1000)")
+    parser.add_argument("--scaling", default=None, help="Time overlap removal/matching/prompt building at these element counts")
+    parser.add_argument("--no-parse", action="store_true", help="Skip the parse_screen benchmark (e.g. scaling only)")
+    parser.add_argument("--resolution", default="1920x1080", help="Synthetic screen resolution")
+    parser.add_argument("--font-size", type=int, default=14, help="Synthetic screen font size")
+    parser.add_argument("--overlap", type=float, default=0.05, help="Synthetic overlap density (0-1)")
+    parser.add_argument("--scales", default=None, help="Quality/latency sweep over inference scales (e.g. 1.0,0.75,0.5,adaptive)")
+    parser.add_argument("--target-text-px", type=int, default=11, help="Text height kept by the adaptive scale")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=None, help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown fraction vs baseline")
+    args = parser.parse_args(argv)
+
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    from vision.omniparser_executor import OmniParserExecutor
+
+    width, height = parse_resolution(args.resolution)
+    corpus = args.corpus
+    if args.synthetic:
+        corpus = tempfile.mkdtemp(prefix="eva_synthetic_")
+        for count in (int(c) for c in args.synthetic.split(",")):
+            image, elements = generate_screen(width, height, count, args.font_size, args.overlap)
+            save_screen(corpus, f"synthetic_{count:05d}", image, elements)
+
+    report = {
+        "name": args.name,
+        "platform": platform.platform(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+    if not args.no_parse:
+        images = load_corpus(corpus, args.limit)
+        if not images:
+            print(f"No images found in {corpus}")
+            return 2
+
+        caption_model_processor = None
+        if args.caption_model:
+            from util.utils import get_caption_model_processor
+            caption_model_processor = get_caption_model_processor(args.caption_model, args.caption_model_path)
+
+        omniparser = OmniParserExecutor()
+        report.update(run_benchmark(
+            images, omniparser,
+            util_stages=args.util_stages or caption_model_processor is not None,
+            caption_model_processor=caption_model_processor,
+            warmup=args.warmup,
+        ))
+        report.update({
+            "corpus": os.path.abspath(corpus),
+            "images": len(images),
+            "device": getattr(omniparser, "device", "unknown"),
+        })
+        print_report(report)
+
+        if args.scales:
+            report["scale_sweep"] = run_scale_sweep(
+                images, omniparser, args.scales.split(","), args.warmup, args.target_text_px
+            )
+
+    if args.scaling:
+        counts = [int(c) for c in args.scaling.split(",")]
+        report["scaling"] = run_scaling(counts, width, height, args.font_size, args.overlap)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.threshold)
+        if regressions:
+            print("\n❌ REGRESSIONS:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ No stage regressed more than {args.threshold * 100:.0f}% vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
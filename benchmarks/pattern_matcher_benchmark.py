@@ -0,0 +1,153 @@
+"""
+Model-1 pattern matcher benchmark for the terminal front end (EVA_TER.py)
+Grows MODEL1_TRAINING_DATA with synthetic patterns, classifies a query set
+with the linear calculate_tfidf_similarity scan and with PatternIndex, checks
+that both pick the same pattern with the same score and reports latency.
+
+Usage:
+    python -m benchmarks.pattern_matcher_benchmark
+    python -m benchmarks.pattern_matcher_benchmark --sizes 10000,100000 --queries 200 --output bench/patterns.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.parse_benchmark import summarize
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_patterns(base_data, size, vocabulary_size=5000, seed=0):
+    """base_data plus random 1-6 word patterns up to `size` entries"""
+    rng = random.Random(seed)
+    base_words = sorted({word for pattern, _ in base_data for word in pattern.lower().split()})
+    words = base_words + [f"term{i}" for i in range(vocabulary_size)]
+    labels = sorted({cmd_type for _, cmd_type in base_data})
+    data = list(base_data)[:size]
+    while len(data) < size:
+        # Bias towards real command words so common tokens get long posting lists
+        pattern = " ".join(
+            rng.choice(base_words) if rng.random() < 0.3 else rng.choice(words)
+            for _ in range(rng.randint(1, 6))
+        )
+        data.append((pattern, rng.choice(labels)))
+    return data
+
+
+def sample_queries(data, count, seed=1):
+    """Real patterns with a word dropped/added/shuffled, plus a few unknown-word queries"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        words = rng.choice(data)[0].split()
+        roll = rng.random()
+        if roll < 0.3 and len(words) > 1:
+            words.pop(rng.randrange(len(words)))
+        elif roll < 0.6:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(data)[0].split()[0])
+        elif roll < 0.7:
+            rng.shuffle(words)
+        elif roll < 0.75:
+            words = ["zzunknown", "qqword"]
+        queries.append(" ".join(words))
+    return queries
+
+
+def linear_best(data, input_text, similarity):
+    """The original process_command_model1 loop"""
+    best_id, highest = None, 0
+    for pattern_id, (pattern, _) in enumerate(data):
+        score = similarity(input_text, pattern)
+        if score > highest:
+            best_id, highest = pattern_id, score
+    return (best_id, highest) if best_id is not None else None
+
+
+def time_calls(func, queries):
+    results, timings = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(func(query))
+        timings.append((time.perf_counter() - start) * 1000)
+    return results, timings
+
+
+def run_size(size, queries_count, linear=True):
+    import EVA_TER
+
+    data = synthetic_patterns(EVA_TER.MODEL1_TRAINING_DATA, size)
+    queries = sample_queries(data, queries_count)
+
+    start = time.perf_counter()
+    index = EVA_TER.PatternIndex(data)
+    build_seconds = time.perf_counter() - start
+
+    indexed, index_times = time_calls(index.best, queries)
+    row = {
+        "patterns": size,
+        "queries": len(queries),
+        "tokens": len(index.postings),
+        "build_seconds": round(build_seconds, 3),
+        "indexed_ms": summarize(index_times),
+    }
+    if linear:
+        expected, linear_times = time_calls(
+            lambda q: linear_best(data, q, EVA_TER.calculate_tfidf_similarity), queries)
+        row["linear_ms"] = summarize(linear_times)
+        row["mismatches"] = [q for q, a, b in zip(queries, indexed, expected) if a != b]
+        row["speedup_p50"] = (round(row["linear_ms"]["p50"] / row["indexed_ms"]["p50"], 1)
+                              if row["indexed_ms"]["p50"] else None)
+    return row
+
+
+def print_report(rows):
+    print(f"{'patterns':>9} {'tokens':>7} {'build s':>8} {'index p50':>10} {'index p95':>10} "
+          f"{'linear p50':>11} {'speedup':>8} {'mismatch':>9}")
+    for row in rows:
+        linear = row.get("linear_ms")
+        linear_p50 = f"{linear['p50']:.3f}ms" if linear else "-"
+        speedup = f"{row['speedup_p50']}x" if linear else "-"
+        mismatches = len(row["mismatches"]) if linear else "-"
+        print(f"{row['patterns']:>9} {row['tokens']:>7} {row['build_seconds']:>8.2f} "
+              f"{row['indexed_ms']['p50']:>8.3f}ms {row['indexed_ms']['p95']:>8.3f}ms "
+              f"{linear_p50:>11} {speedup:>8} {mismatches:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark EVA_TER's model-1 pattern matcher")
+    parser.add_argument("--sizes", default="10000,100000", help="Pattern library sizes")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per size")
+    parser.add_argument("--no-linear", action="store_true", help="Skip the linear-scan reference (faster at large sizes)")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+
+    rows = [run_size(int(size), args.queries, linear=not args.no_linear) for size in args.sizes.split(",")]
+    print_report(rows)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "platform": platform.platform(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "results": rows,
+            }, f, indent=2)
+
+    mismatches = sum(len(row.get("mismatches", [])) for row in rows)
+    if mismatches:
+        print(f"\n❌ {mismatches} queries matched differently from calculate_tfidf_similarity")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
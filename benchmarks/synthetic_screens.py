@@ -0,0 +1,170 @@
+"""
+Synthetic high-density UI screens for vision scaling tests
+Renders spreadsheet / file-list / log-viewer style screens with PIL at a
+configurable resolution, element count, font size and overlap density, and
+returns ground-truth boxes and labels in parse_screen's element format.
+
+Usage:
+    python -m benchmarks.synthetic_screens --counts 10,100,1000,5000 --resolution 3840x2160 --out synthetic_screens
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+WORDS = [
+    "File", "Edit", "View", "Insert", "Format", "Tools", "Help", "Save", "Open", "Close",
+    "Settings", "Profile", "Search", "Send", "Cancel", "Apply", "Report", "Invoice", "Budget",
+    "Total", "Status", "Pending", "Done", "Error", "Warning", "Info", "Debug", "Chrome",
+    "Spotify", "WhatsApp", "Desktop", "Downloads", "Documents", "Pictures", "Music", "Video",
+    "Code", "Crusaders", "Meeting", "Notes", "Q3", "2024", "README.md", "main.py", "config.py",
+]
+
+FONT_CANDIDATES = ["arial.ttf", "segoeui.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf"]
+
+
+def load_font(font_size):
+    """First available TrueType font at font_size, PIL's bitmap font otherwise"""
+    from PIL import ImageFont
+
+    for name in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(name, font_size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=font_size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def random_label(rng):
+    words = rng.randint(1, 3)
+    label = " ".join(rng.choice(WORDS) for _ in range(words))
+    if rng.random() < 0.3:
+        label += f" {rng.randint(1, 9999)}"
+    return label
+
+
+def generate_screen(width=1920, height=1080, n_elements=100, font_size=14, overlap=0.0, seed=0):
+    """
+    Render one synthetic screen.
+
+    Args:
+        width, height: Screen resolution
+        n_elements: Number of UI elements to draw
+        font_size: Label font size in pixels
+        overlap: Fraction (0-1) of elements drawn on top of an earlier element
+        seed: RNG seed for reproducible screens
+
+    Returns:
+        (PIL.Image, elements) where elements use parse_screen's format:
+        {"id", "label", "x", "y", "bbox": [x1, y1, x2, y2], "type": "text"|"clickable", "confidence"}
+    """
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    font = load_font(font_size)
+    image = Image.new("RGB", (width, height), (248, 248, 248))
+    draw = ImageDraw.Draw(image)
+
+    pad = max(2, font_size // 3)
+    row_height = font_size + 2 * pad
+    gap = max(4, font_size // 2)
+    elements = []
+    cursor_x, cursor_y = gap, gap
+
+    for index in range(n_elements):
+        is_button = rng.random() < 0.25
+        label = random_label(rng)
+        text_box = draw.textbbox((0, 0), label, font=font)
+        text_w, text_h = text_box[2] - text_box[0], text_box[3] - text_box[1]
+        box_w = text_w + (4 * pad if is_button else 0)
+        box_h = row_height if is_button else text_h
+
+        if elements and rng.random() < overlap:
+            # Overlapping element: offset from a random earlier element
+            anchor = rng.choice(elements)["bbox"]
+            x1 = anchor[0] + rng.randint(-box_w // 3, max(1, (anchor[2] - anchor[0]) // 2))
+            y1 = anchor[1] + rng.randint(-row_height // 2, row_height // 2)
+        else:
+            if cursor_x + box_w + gap > width:
+                cursor_x = gap
+                cursor_y += row_height + gap
+            if cursor_y + row_height + gap > height:
+                # Screen full: wrap to the top with a small shift (dense screens overlap)
+                cursor_y = gap + (index % row_height)
+            x1, y1 = cursor_x, cursor_y
+            cursor_x += box_w + gap
+
+        x1 = max(0, min(width - box_w - 1, x1))
+        y1 = max(0, min(height - box_h - 1, y1))
+        x2, y2 = x1 + box_w, y1 + box_h
+
+        if is_button:
+            draw.rounded_rectangle([x1, y1, x2, y2], radius=pad, fill=(225, 232, 245), outline=(90, 110, 160))
+            draw.text((x1 + 2 * pad - text_box[0], y1 + (box_h - text_h) // 2 - text_box[1]), label,
+                      fill=(20, 20, 20), font=font)
+        else:
+            draw.text((x1 - text_box[0], y1 - text_box[1]), label, fill=(30, 30, 30), font=font)
+
+        elements.append({
+            "id": index + 1,
+            "label": label if is_button else f"Text: {label[:50]}",
+            "x": (x1 + x2) // 2,
+            "y": (y1 + y2) // 2,
+            "bbox": [x1, y1, x2, y2],
+            "type": "clickable" if is_button else "text",
+            "confidence": 1.0,
+        })
+
+    return image, elements
+
+
+def save_screen(out_dir, name, image, elements):
+    """Write <name>.png plus <name>.json ground truth; returns the image path"""
+    os.makedirs(out_dir, exist_ok=True)
+    image_path = os.path.join(out_dir, f"{name}.png")
+    image.save(image_path)
+    with open(os.path.join(out_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump({"resolution": f"{image.width}x{image.height}", "elements": elements}, f)
+    return image_path
+
+
+def load_ground_truth(image_path):
+    """Ground-truth elements saved next to a synthetic screen (None for real captures)"""
+    truth_path = os.path.splitext(image_path)[0] + ".json"
+    if not os.path.exists(truth_path):
+        return None
+    with open(truth_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("elements")
+
+
+def parse_resolution(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic high-density UI screens")
+    parser.add_argument("--out", default="synthetic_screens", help="Output folder")
+    parser.add_argument("--counts", default="10,100,1000,5000", help="Comma-separated element counts")
+    parser.add_argument("--resolution", default="1920x1080")
+    parser.add_argument("--font-size", type=int, default=14)
+    parser.add_argument("--overlap", type=float, default=0.05, help="Fraction of overlapping elements")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    width, height = parse_resolution(args.resolution)
+    for count in (int(c) for c in args.counts.split(",")):
+        image, elements = generate_screen(width, height, count, args.font_size, args.overlap, args.seed)
+        name = f"synthetic_{width}x{height}_{count}_f{args.font_size}_o{int(args.overlap * 100)}"
+        path = save_screen(args.out, name, image, elements)
+        print(f"✓ {path} ({len(elements)} elements)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
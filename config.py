@@ -3,10 +3,9 @@ from dotenv import load_dotenv
 import logging
 load_dotenv()
 
-# API Keys
+# API Keys (checked by the Gemini users, so dry-run/simulator backends work without one)
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in .env file. Please get a key from Google AI Studio and add it to your .env file.")
+GEMINI_API_KEY_MISSING = "GEMINI_API_KEY not found in .env file. Please get a key from Google AI Studio and add it to your .env file."
 
 
 # Wake Word
@@ -37,6 +36,76 @@ GEMINI_FALLBACK_MODELS = [
 GEMINI_TEMPERATURE = 0.3
 GEMINI_MAX_RETRIES = 3
 
+# Parse service (vision/parse_server.py); None keeps OmniParser in-process.
+# The client sends $EVA_PARSE_SERVICE_TOKEN, which a server bound off loopback requires.
+PARSE_SERVICE_URL = os.getenv('EVA_PARSE_SERVICE_URL')  # e.g. "http://127.0.0.1:8765"
+
+# Layout Memory (remembered click targets per app window)
+LAYOUT_MEMORY_ENABLED = True
+LAYOUT_MEMORY_DIR = os.path.join(BASE_DIR, 'layout_memory')
+LAYOUT_MATCH_THRESHOLD = 0.85  # TM_CCOEFF_NORMED score needed to trust a remembered target
+LAYOUT_ROI_MARGIN = 40  # pixels searched around the remembered bbox
+
+# Speculative parsing (overlap capture+parse with the WAIT before a vision step)
+SPECULATIVE_PARSE_ENABLED = True
+SPECULATIVE_PARSE_DEFAULT_LEAD = 1.5  # seconds before the WAIT ends to start parsing, until measured
+FRAME_CHANGE_TOLERANCE = 2.0  # mean gray-level difference that counts as a changed frame
+
+# Background screen indexer (optional daemon serving SCREEN_ANALYSIS from a live index)
+SCREEN_INDEXER_ENABLED = False
+SCREEN_INDEXER_FPS = 2
+SCREEN_INDEXER_IDLE_CPU = 50  # re-parse only while CPU usage (%) is below this
+SCREEN_INDEXER_MAX_REGION = 0.4  # changed regions above this screen fraction get a full re-parse
+SCREEN_INDEXER_SETTLE = 0.3  # seconds after an input event before a captured frame counts as fresh
+
+# Targeted text locate (OCR detection first, recognition only on candidate lines)
+TEXT_LOCATE_ENABLED = True
+TEXT_LOCATE_MIN_SCORE = 0.85  # text similarity needed to click a located line without a full parse
+TEXT_LOCATE_BATCH = 8  # candidate lines recognized per batch
+TEXT_LOCATE_MAX_CANDIDATES = 48  # give up (full parse) after recognizing this many lines
+
+# Adaptive inference resolution (downscale high-DPI frames for detection/OCR)
+RESOLUTION_POLICY_ENABLED = True
+RESOLUTION_TARGET_TEXT_PX = 11  # smallest text height (px) kept after downscaling
+RESOLUTION_MIN_SCALE = 0.4
+RESOLUTION_DETECTOR_IMGSZ = 640  # longest YOLO input side (the detector's native size)
+
+# Model registry (shared memory budget for Whisper/YOLO/OCR models)
+MODEL_MEMORY_BUDGET_MB = 4096  # evict least-recently-used idle models above this (0 = unlimited)
+MODEL_IDLE_UNLOAD_SECONDS = 600  # unload unpinned models unused for this long (0 = never)
+
+# Fast start: show the passcode prompt after importing only Qt, load heavy modules behind it
+FAST_START_ENABLED = True
+
+# Installed-application index (direct process launch instead of Win + type + Enter)
+APP_INDEX_ENABLED = True
+APP_INDEX_PATH = os.path.join(BASE_DIR, 'app_index.json')
+APP_INDEX_MIN_SCORE = 80  # fuzzy score (0-100) needed to launch an indexed app directly
+APP_INDEX_REFRESH_WAIT = 2.0  # seconds a lookup miss waits for a refresh already in progress
+APP_INDEX_RESCAN_AFTER = 60  # seconds before a lookup miss triggers another scan
+APP_LAUNCH_TIMEOUT = 15  # seconds to wait for a directly launched app's window
+APP_LAUNCH_FALLBACK_WAIT = 7  # sleep after a Start-menu launch (app not indexed or direct launch failed)
+
+# Deep links (search URLs, Chrome --profile-directory, spotify:/whatsapp: URIs instead of UI steps)
+DEEP_LINKS_ENABLED = True
+CONTACT_PHONE_NUMBERS = {}  # spoken name -> phone number with country code, e.g. {"mom": "+911234567890"}
+
+# Window waits (WAIT_FOR_WINDOW / FOCUS_WINDOW end as soon as the window exists)
+WINDOW_WAIT_TIMEOUT = 10  # seconds before a WAIT_FOR_WINDOW step gives up and aborts the plan
+WINDOW_FOCUS_TIMEOUT = 3  # FOCUS_WINDOW also waits briefly in case the window is still opening
+WINDOW_MATCH_SCORE = 80  # fuzzy title score (0-100) a window needs to count as a match
+
+# Text injection (TYPE_TEXT): paste long payloads through the clipboard instead of typing them
+TEXT_PASTE_THRESHOLD = 40  # characters; shorter text is typed, 0 disables pasting
+TEXT_PASTE_RESTORE_DELAY = 0.15  # seconds the target gets to read the clipboard before it is restored
+TEXT_PASTE_VERIFY = True  # re-read the focused control and retype if the paste did not land
+
+# Executor backend: "native" drives the desktop, "dry_run" records actions headlessly (benchmarks, CI),
+# "simulator" also renders simulated app windows that react to the actions (end-to-end flow tests)
+EXECUTOR_BACKEND = os.getenv("EVA_EXECUTOR_BACKEND", "native")
+DRY_RUN_TIME_SCALE = float(os.getenv("EVA_DRY_RUN_TIME_SCALE", "0"))  # fraction of simulated action cost actually slept
+SIMULATOR_OMNIPARSER = os.getenv("EVA_SIMULATOR_OMNIPARSER", "0") == "1"  # parse rendered frames with OmniParser (needs Pillow) instead of ground truth
+
 # Classification Settings
 CLASSIFICATION_CONFIDENCE_THRESHOLD = 0.6
 
@@ -1,27 +1,57 @@
 import logging
 import time
-from pynput.keyboard import Controller as PyKeyboardController, Key as PyKey
-import pyautogui
+import config
+from vision.element_tracker import ElementTracker
 
 logger = logging.getLogger("ActionRouter")
 
 class ActionRouter:
     """Action Router with integrated vision capabilities."""
     
-    def __init__(self, system_executor, screenshot_handler, screen_analyzer, omniparser):
+    VISION_ACTIONS = ("MOUSE_CLICK", "SCREEN_ANALYSIS")
+
+    def __init__(self, system_executor, screenshot_handler, screen_analyzer, omniparser, layout_memory=None,
+                 speculative_parser=None, screen_indexer=None, vision_ready=None, app_index=None):
         self.system_executor = system_executor
         self.screenshot_handler = screenshot_handler
         self.screen_analyzer = screen_analyzer
         self.omniparser = omniparser
-        self.py_keyboard = PyKeyboardController()
+        self.layout_memory = layout_memory
+        self.speculative_parser = speculative_parser
+        self.screen_indexer = screen_indexer
+        self.vision_ready = vision_ready  # threading.Event set once attach_vision() may have run
+        self.app_index = app_index  # execution.app_index.AppIndex for LAUNCH_DIRECT
+        self.last_input_time = 0.0  # index lookups must postdate the last input we sent
+        self.last_click_effect = None  # True/False once the parse after a click shows (no) change
+        self._awaiting_click_effect = False
+        self._memory_click = None  # (target_key, window_context) of a pending layout-memory click
+        self._py_keyboard = None
         logger.info("✓ Action Router initialized with Vision and C Executor Bridge.")
 
+    @property
+    def py_keyboard(self):
+        """pynput keyboard controller, imported on first use (headless backends never need it)"""
+        if self._py_keyboard is None:
+            from pynput.keyboard import Controller as PyKeyboardController
+            self._py_keyboard = PyKeyboardController()
+        return self._py_keyboard
+
+    def attach_vision(self, omniparser, speculative_parser=None, screen_indexer=None):
+        """Plug in the vision stack once it has finished loading"""
+        self.omniparser = omniparser
+        self.speculative_parser = speculative_parser
+        self.screen_indexer = screen_indexer
+
     def execute(self, category, steps, entities, raw_command, classification):
         logger.info(f"Executing {len(steps)} steps for command: '{raw_command}'")
         if not steps:
             logger.error("No execution plan (steps) provided for command.")
             return {"success": False, "error": "No execution plan generated for the command."}
         
+        # Vision steps ahead: reload any evicted parser models while the earlier steps run
+        if self.omniparser and any(step.get('action_type') in self.VISION_ACTIONS for step in steps):
+            self.omniparser.prefetch()
+        
         try:
             for i, step in enumerate(steps):
                 action_type = step.get('action_type')
@@ -43,73 +73,18 @@ class ActionRouter:
                         logger.info(f"  -> Action successful: Typed '{text_to_type}'")
                 
                 elif action_type == "WAIT":
-                    duration = params.get('duration', 0.5)
-                    time.sleep(float(duration))
-
-                elif action_type == "MOUSE_CLICK" or action_type == "SCREEN_ANALYSIS":
-                    # Vision-powered click with improved accuracy
-                    target_description = description  # Use the full description as the target
-                    logger.info(f"  -> Vision: Looking for '{target_description}'")
-                    
-                    # Capture screenshot
-                    screenshot_path = self.screenshot_handler.capture()
-                    if not screenshot_path:
-                        logger.error("  -> Vision: Failed to capture screenshot. Skipping step.")
-                        continue
-
-                    # Parse screen elements
-                    parse_result = self.omniparser.parse_screen(screenshot_path, raw_command)
-                    elements = parse_result.get('elements', []) if parse_result else []
-                    
-                    if not elements:
-                        logger.error("  -> Vision: OmniParser found no elements on screen.")
-                        logger.warning("  -> Skipping this step - no valid targets found")
-                        continue
-
-                    # Log found elements for debugging
-                    logger.info(f"  -> Vision: Found {len(elements)} elements on screen")
-                    
-                    # Extract profile name from entities
-                    profile_name = entities.get('profile_name') if entities else None
-                    
-                    # Use ScreenAnalyzer to select the best coordinate
-                    try:
-                        coordinate = self.screen_analyzer.select_coordinate(
-                            elements, 
-                            target_description, 
-                            step, 
-                            profile_name=profile_name
-                        )
-                    except Exception as e:
-                        logger.error(f"  -> Vision: Error in coordinate selection: {e}", exc_info=True)
-                        coordinate = None
-
-                    if coordinate and len(coordinate) == 2:
-                        x, y = coordinate
-                        
-                        # Validate coordinates are within screen bounds
-                        screen_width, screen_height = pyautogui.size()
-                        if 0 <= x <= screen_width and 0 <= y <= screen_height:
-                            logger.info(f"  -> Vision: Selected coordinate ({x}, {y}) for '{target_description}'")
-                            
-                            # Execute click at the selected coordinate
-                            click_result = self.system_executor.executor.execute_action(
-                                "MOUSE_CLICK", 
-                                {'x': int(x), 'y': int(y)}, 
-                                {"button": params.get('button', 'left')}
-                            )
-                            
-                            logger.info(f"  -> Action successful: Clicked at ({int(x)}, {int(y)})")
-                            
-                            # Small delay after click for UI response
-                            time.sleep(0.1)
-                        else:
-                            logger.error(f"  -> Vision: Invalid coordinates ({x}, {y}) - out of screen bounds ({screen_width}x{screen_height})")
-                            logger.warning("  -> Skipping click - coordinates out of bounds")
+                    duration = float(params.get('duration', 0.5))
+                    if self.speculative_parser and self._next_is_vision(steps, i):
+                        # Hide parse latency inside the idle wait before the vision step
+                        lead = min(duration, self.speculative_parser.lead_time)
+                        self.system_executor.executor.sleep(duration - lead)
+                        self.speculative_parser.start(raw_command)
+                        self.system_executor.executor.sleep(lead)
                     else:
-                        logger.warning(f"  -> Vision: Could not determine valid coordinate for '{target_description}'")
-                        logger.info(f"  -> Available elements: {[el.get('label', 'unknown') for el in elements[:5]]}")
-                        logger.warning("  -> Skipping this step - no matching target found")
+                        self.system_executor.executor.sleep(duration)
+
+                elif action_type in self.VISION_ACTIONS:
+                    self._execute_vision_step(step, params, description, entities, raw_command)
 
                 elif action_type == "SYSTEM_ACTION":
                     action = params.get('action', '')
@@ -130,15 +105,26 @@ class ActionRouter:
                     else:
                         logger.warning("  -> OPEN_APP: No app name specified")
 
+                elif action_type == "LAUNCH_DIRECT":
+                    app_name = params.get('app_name', '')
+                    if app_name:
+                        self._launch_direct(app_name)
+                    else:
+                        logger.warning("  -> LAUNCH_DIRECT: No app name specified")
+
+                elif action_type == "WAIT_FOR_WINDOW":
+                    self._wait_for_window(params, description)
+
                 elif action_type == "FOCUS_WINDOW":
                     title = params.get('title', '')
                     if title:
-                        try:
-                            self.system_executor.executor.focus_window_by_title(title)
-                            logger.info(f"  -> Action successful: Focused window with title '{title}'")
-                            time.sleep(0.2)  # Give window time to focus
-                        except Exception as e:
-                            logger.error(f"  -> Failedev to focus window '{title}': {e}")
+                        result = self.system_executor.executor.wait_for_window(
+                            title, timeout=float(params.get('timeout', config.WINDOW_FOCUS_TIMEOUT)),
+                            min_score=config.WINDOW_MATCH_SCORE)
+                        if result.get('success'):
+                            logger.info(f"  -> Action successful: Focused window '{result.get('window') or title}'")
+                        else:
+                            logger.error(f"  -> Failed to focus window '{title}': {result.get('error')}")
                     else:
                         logger.warning("  -> FOCUS_WINDOW: No title specified")
 
@@ -146,7 +132,8 @@ class ActionRouter:
                     url = params.get('url', '')
                     if url:
                         try:
-                            self.system_executor.executor.launch_application(url=url)
+                            self.system_executor.executor.launch_application(
+                                url=url, browser=params.get('browser'), browser_args=params.get('browser_args'))
                             logger.info(f"  -> Action successful: Opened URL '{url}'")
                         except Exception as e:
                             logger.error(f"  -> Failed to open URL '{url}': {e}")
@@ -155,9 +142,292 @@ class ActionRouter:
 
                 else:
                     logger.warning(f"  -> Unknown action_type: {action_type}. Skipping step.")
+
+                if action_type not in ("WAIT", "WAIT_FOR_WINDOW", "CONDITIONAL") and action_type not in self.VISION_ACTIONS:
+                    self.last_input_time = time.time()
             
             return {"success": True, "message": "All steps executed successfully."}
 
         except Exception as e:
             logger.error(f"❌ Execution error: {e}", exc_info=True)
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+
+    def _launch_direct(self, app_name):
+        """Spawn an indexed app and wait for its window; Start-menu typing + window wait otherwise"""
+        executor = self.system_executor.executor
+        entry = self.app_index.lookup(app_name) if self.app_index else None
+        if entry:
+            result = executor.launch_direct(entry, timeout=config.APP_LAUNCH_TIMEOUT)
+            if result.get('success'):
+                logger.info(f"  -> Action successful: Launched '{entry['name']}' "
+                            f"(window after {result['seconds']:.1f}s)")
+                return
+            if result.get('spawned'):
+                # Started but no recognisable window yet - don't launch a second copy
+                logger.warning(f"  -> {result.get('error')}; focusing by title instead")
+                executor.wait_for_window(app_name, timeout=config.WINDOW_FOCUS_TIMEOUT,
+                                         min_score=config.WINDOW_MATCH_SCORE)
+                return
+            logger.warning(f"  -> Direct launch failed ({result.get('error')}), using the Start menu")
+        else:
+            logger.info(f"  -> '{app_name}' not in the app index, using the Start menu")
+
+        executor.launch_application(app_name=app_name)
+        executor.wait_for_window(app_name, timeout=config.APP_LAUNCH_TIMEOUT, min_score=config.WINDOW_MATCH_SCORE,
+                                 fallback_wait=config.APP_LAUNCH_FALLBACK_WAIT)
+
+    def _wait_for_window(self, params, description):
+        """
+        WAIT_FOR_WINDOW: block until a window matching 'title' and/or 'class_name' exists, then focus it.
+        A missing window aborts the plan (unless 'required' is False) so later
+        vision steps never run against the wrong window.
+        """
+        title = params.get('title') or None
+        class_name = params.get('class_name') or None
+        if not title and not class_name and not params.get('foreground'):
+            logger.warning("  -> WAIT_FOR_WINDOW: No title or class_name specified")
+            return
+        result = self.system_executor.executor.wait_for_window(
+            title,
+            timeout=float(params.get('timeout', config.WINDOW_WAIT_TIMEOUT)),
+            class_name=class_name,
+            foreground=bool(params.get('foreground', False)),
+            min_score=config.WINDOW_MATCH_SCORE,
+        )
+        if result.get('success'):
+            logger.info(f"  -> Action successful: Window '{result.get('window') or title or class_name}' "
+                        f"ready after {result['seconds']:.2f}s")
+        elif params.get('required', True):
+            raise RuntimeError(f"{description}: {result.get('error')}")
+        else:
+            logger.warning(f"  -> {result.get('error')}; continuing")
+
+    def _next_is_vision(self, steps, index):
+        """True if the next executable step after `index` is a vision step"""
+        for step in steps[index + 1:]:
+            action_type = step.get('action_type')
+            if action_type == "CONDITIONAL":
+                continue
+            return action_type in self.VISION_ACTIONS
+        return False
+
+    def _execute_vision_step(self, step, params, description, entities, raw_command):
+        """Vision-powered click: layout memory first, then capture -> parse -> select"""
+        target_description = description  # Use the full description as the target
+        logger.info(f"  -> Vision: Looking for '{target_description}'")
+
+        if self.omniparser is None and self.vision_ready is not None:
+            logger.info("  -> Vision: Waiting for the vision models to finish loading...")
+            self.vision_ready.wait()
+        if self.omniparser is None:
+            logger.error("  -> Vision: Vision system unavailable. Skipping step.")
+            return
+
+        # Extract profile name from entities
+        profile_name = entities.get('profile_name') if entities else None
+
+        # Fast path: remembered target verified by template match
+        target_key = None
+        window_context = None
+        if self.layout_memory:
+            target_key = self.layout_memory.target_key(target_description, profile_name)
+            window_context = self.layout_memory.get_window_context()
+            if window_context:
+                remembered = self.layout_memory.lookup(
+                    target_key, self.screenshot_handler.capture_region, window_context
+                )
+                if remembered:
+                    if self.speculative_parser:
+                        self.speculative_parser.cancel()
+                    if self._click(remembered, params, target_description):
+                        self._memory_click = (target_key, window_context)
+                    return
+
+        # Text targets: locate the line directly before paying for a full parse
+        located = self._locate_text(step, params, window_context)
+        if located:
+            element, screenshot_path = located
+            if self.speculative_parser:
+                self.speculative_parser.cancel()
+            if self._click((element['x'], element['y']), params, target_description) \
+                    and self.layout_memory and window_context and screenshot_path:
+                self.layout_memory.remember(target_key, element['bbox'], screenshot_path, window_context)
+            return
+
+        screen = self._current_screen(raw_command)
+        if not screen:
+            return
+        screenshot_path, parse_result = screen
+
+        elements = parse_result.get('elements', []) if parse_result else []
+
+        if not elements:
+            logger.error("  -> Vision: OmniParser found no elements on screen.")
+            logger.warning("  -> Skipping this step - no valid targets found")
+            return
+
+        # Log found elements for debugging
+        logger.info(f"  -> Vision: Found {len(elements)} elements on screen")
+        self._check_click_effect(parse_result.get('changes'))
+
+        # Use ScreenAnalyzer to select the best coordinate
+        try:
+            coordinate = self.screen_analyzer.select_coordinate(
+                elements,
+                target_description,
+                step,
+                profile_name=profile_name
+            )
+        except Exception as e:
+            logger.error(f"  -> Vision: Error in coordinate selection: {e}", exc_info=True)
+            coordinate = None
+
+        if coordinate and len(coordinate) == 2:
+            if self._click(coordinate, params, target_description) and self.layout_memory and window_context:
+                element = self._element_at(elements, coordinate)
+                if element and element.get('bbox'):
+                    self.layout_memory.remember(
+                        target_key, element['bbox'], screenshot_path, window_context,
+                        extra={'track_id': element.get('track_id')}
+                    )
+        else:
+            logger.warning(f"  -> Vision: Could not determine valid coordinate for '{target_description}'")
+            logger.info(f"  -> Available elements: {[el.get('label', 'unknown') for el in elements[:5]]}")
+            logger.warning("  -> Skipping this step - no matching target found")
+
+    def _locate_text(self, step, params, window_context):
+        """
+        Targeted OCR lookup for steps that name the text to click (e.g. "Click: Send").
+
+        Steps whose description does not contain their target ("Click on first result")
+        need the full parse + selector, since the target text is usually also in the search box.
+
+        Returns:
+            (element, screenshot_path or None) or None to fall back to the full parse
+        """
+        target = (params.get('target') or '').strip()
+        if not config.TEXT_LOCATE_ENABLED or not target:
+            return None
+        if target.lower() not in step.get('description', '').lower():
+            return None
+
+        image = self.screenshot_handler.grab()
+        if image is None:
+            return None
+
+        roi = None
+        if window_context:
+            roi = [window_context['left'], window_context['top'],
+                   window_context['left'] + window_context['width'],
+                   window_context['top'] + window_context['height']]
+        try:
+            element = self.omniparser.locate(
+                image, target, roi=roi,
+                min_score=config.TEXT_LOCATE_MIN_SCORE,
+                batch_size=config.TEXT_LOCATE_BATCH,
+                max_candidates=config.TEXT_LOCATE_MAX_CANDIDATES,
+            )
+        except Exception as e:
+            logger.warning(f"  -> Vision: Text locate failed ({e}), using full parse")
+            return None
+        if not element:
+            logger.info(f"  -> Vision: '{target}' not located by OCR, using full parse")
+            return None
+
+        logger.info(f"  -> Vision: Located '{element['label']}' (score {element['match_score']:.2f})")
+        screenshot_path = self.screenshot_handler.save(image) if self.layout_memory and window_context else None
+        return element, screenshot_path
+
+    def _current_screen(self, raw_command):
+        """
+        Parsed view of the screen: fresh background index, else speculative parse, else synchronous parse.
+
+        Returns:
+            (screenshot_path, parse_result) or None if capture failed
+        """
+        indexed = self.screen_indexer.lookup(since=self.last_input_time) if self.screen_indexer else None
+        if indexed:
+            screenshot_path, parse_result, indexed_at = indexed
+            logger.info(f"  -> Vision: Using screen index ({time.time() - indexed_at:.2f}s old)")
+            if self.speculative_parser:
+                self.speculative_parser.cancel()
+            return screenshot_path, parse_result
+
+        speculative = self.speculative_parser.take() if self.speculative_parser else None
+        if speculative:
+            return speculative
+
+        # Capture screenshot
+        screenshot_path = self.screenshot_handler.capture()
+        if not screenshot_path:
+            logger.error("  -> Vision: Failed to capture screenshot. Skipping step.")
+            return None
+
+        # Parse screen elements
+        parse_start = time.perf_counter()
+        parse_result = self.omniparser.parse_screen(screenshot_path, raw_command)
+        if self.speculative_parser:
+            self.speculative_parser.record_parse_time(time.perf_counter() - parse_start)
+        return screenshot_path, parse_result
+
+    def _click(self, coordinate, params, target_description):
+        """Click a screen coordinate after bounds validation. Returns True if clicked."""
+        x, y = coordinate
+
+        # Validate coordinates are within screen bounds
+        screen_width, screen_height = self.system_executor.executor.screen_size()
+        if not (0 <= x <= screen_width and 0 <= y <= screen_height):
+            logger.error(f"  -> Vision: Invalid coordinates ({x}, {y}) - out of screen bounds ({screen_width}x{screen_height})")
+            logger.warning("  -> Skipping click - coordinates out of bounds")
+            return False
+
+        logger.info(f"  -> Vision: Selected coordinate ({x}, {y}) for '{target_description}'")
+
+        # Execute click at the selected coordinate
+        self.system_executor.executor.execute_action(
+            "MOUSE_CLICK",
+            {'x': int(x), 'y': int(y)},
+            {"button": params.get('button', 'left')}
+        )
+
+        logger.info(f"  -> Action successful: Clicked at ({int(x)}, {int(y)})")
+        self.last_input_time = time.time()
+
+        # Small delay after click for UI response
+        self.system_executor.executor.sleep(0.1)
+        self._awaiting_click_effect = True
+        self._memory_click = None
+        return True
+
+    def _check_click_effect(self, changes):
+        """Use the tracker diff of the parse following a click as a cheap 'did anything change' signal"""
+        if not self._awaiting_click_effect or changes is None:
+            return
+        self._awaiting_click_effect = False
+        self.last_click_effect = ElementTracker.has_changes(changes)
+        if self.last_click_effect:
+            logger.info(f"  -> Vision: Previous click changed the screen "
+                        f"(+{len(changes['added'])} -{len(changes['removed'])} ~{len(changes['moved'])})")
+        else:
+            logger.warning("  -> Vision: Previous click produced no visible change")
+            if self._memory_click and self.layout_memory:
+                # The remembered spot matched the template but did nothing: stale entry
+                target_key, window_context = self._memory_click
+                if self.layout_memory.forget(target_key, window_context):
+                    logger.info(f"  -> Vision: Forgot remembered target '{target_key}'")
+        self._memory_click = None
+
+    @staticmethod
+    def _element_at(elements, coordinate):
+        """Find the parsed element selected by coordinate (exact centre, else smallest containing bbox)"""
+        x, y = coordinate
+        for elem in elements:
+            if elem.get('x') == x and elem.get('y') == y:
+                return elem
+        containing = [
+            e for e in elements
+            if e.get('bbox') and e['bbox'][0] <= x <= e['bbox'][2] and e['bbox'][1] <= y <= e['bbox'][3]
+        ]
+        if not containing:
+            return None
+        return min(containing, key=lambda e: (e['bbox'][2] - e['bbox'][0]) * (e['bbox'][3] - e['bbox'][1]))
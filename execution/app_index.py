@@ -0,0 +1,344 @@
+"""
+App Index - installed applications for direct process launch
+Scans Start Menu shortcuts (Windows), .desktop files (Linux) and PATH
+executables, keeps the result in a JSON cache and refreshes it incrementally:
+only directories whose mtime changed are listed again and only changed
+.desktop files are re-parsed. Spoken names are resolved by fuzzy lookup.
+"""
+
+import json
+import logging
+import os
+import re
+import shlex
+import sys
+import threading
+import time
+
+import config
+
+logger = logging.getLogger("AppIndex")
+
+CACHE_VERSION = 1
+KIND_PRIORITY = {"shortcut": 0, "desktop": 1, "path": 2}  # preferred source when names tie
+NAME_NOISE = {"app", "application", "program", "the"}
+SKIP_SHORTCUT_WORDS = ("uninstall", "readme", "documentation", "release notes", "help", "website")
+DESKTOP_FIELD_CODES = re.compile(r"\s*%[fFuUdDnNickvm]")
+
+
+def normalize_name(name):
+    """'Visual Studio Code (User)' -> 'visual studio code user'"""
+    words = re.sub(r"[^\w]+", " ", (name or "").lower()).split()
+    return " ".join(w for w in words if w not in NAME_NOISE)
+
+
+def fuzzy_score(query, choice):
+    """0-100 similarity tolerant of partial names (rapidfuzz, thefuzz or difflib)"""
+    try:
+        from rapidfuzz import fuzz
+        return fuzz.WRatio(query, choice)
+    except ImportError:
+        pass
+    try:
+        from thefuzz import fuzz
+        return fuzz.WRatio(query, choice)
+    except ImportError:
+        pass
+    from difflib import SequenceMatcher
+    if query in choice:
+        return 90 if len(query) >= 3 else 60
+    return 100 * SequenceMatcher(None, query, choice).ratio()
+
+
+def default_roots():
+    """(directory, kind, recursive) sources for this platform"""
+    roots = []
+    if sys.platform == "win32":
+        for base in (os.environ.get("PROGRAMDATA"), os.environ.get("APPDATA")):
+            if base:
+                roots.append((os.path.join(base, "Microsoft", "Windows", "Start Menu", "Programs"), "shortcut", True))
+    else:
+        data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+        data_dirs += ["/var/lib/flatpak/exports/share", os.path.expanduser("~/.local/share/flatpak/exports/share")]
+        seen = set()
+        for base in [data_home] + data_dirs:
+            directory = os.path.join(base, "applications")
+            if base and directory not in seen:
+                seen.add(directory)
+                roots.append((directory, "desktop", True))
+    for directory in (os.environ.get("PATH") or "").split(os.pathsep):
+        if directory:
+            roots.append((directory, "path", False))
+    return roots
+
+
+# ---------- Per-source entry parsing ----------
+def _shortcut_entry(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    if any(word in name.lower() for word in SKIP_SHORTCUT_WORDS):
+        return None
+    return {"name": name, "target": path, "argv": None, "kind": "shortcut", "window_hint": name}
+
+
+def _desktop_entry(path):
+    fields, in_entry = {}, False
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line:
+                    key, value = line.split("=", 1)
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if fields.get("Type", "Application") != "Application" or not fields.get("Exec"):
+        return None
+    if fields.get("NoDisplay", "").lower() == "true" or fields.get("Hidden", "").lower() == "true":
+        return None
+    try:
+        argv = shlex.split(DESKTOP_FIELD_CODES.sub("", fields["Exec"]))
+    except ValueError:
+        return None
+    if not argv:
+        return None
+    name = fields.get("Name") or os.path.splitext(os.path.basename(path))[0]
+    return {
+        "name": name,
+        "aliases": [a for a in (fields.get("GenericName"),) if a],
+        "target": path,
+        "argv": argv,
+        "kind": "desktop",
+        "window_hint": fields.get("StartupWMClass") or name,
+    }
+
+
+def _path_entry(path):
+    name = os.path.basename(path)
+    if sys.platform == "win32":
+        stem, ext = os.path.splitext(name)
+        if ext.lower() != ".exe":
+            return None
+        name = stem
+    elif name.startswith(".") or not os.access(path, os.X_OK):
+        return None
+    return {"name": name, "target": path, "argv": [path], "kind": "path", "window_hint": name}
+
+
+SOURCE_SUFFIXES = {
+    "shortcut": (".lnk", ".exe", ".appref-ms"),
+    "desktop": (".desktop",),
+    "path": None,  # any executable file
+}
+PARSERS = {"shortcut": _shortcut_entry, "desktop": _desktop_entry, "path": _path_entry}
+
+
+class AppIndex:
+    """Cached, incrementally refreshed index of launchable applications"""
+
+    def __init__(self, cache_path=None, roots=None, min_score=None):
+        """
+        Args:
+            cache_path: JSON cache file (default: config.APP_INDEX_PATH)
+            roots: [(directory, kind, recursive), ...] (default: Start Menu / .desktop dirs + PATH)
+            min_score: Fuzzy score (0-100) needed for lookup() to return an entry
+        """
+        self.cache_path = cache_path or config.APP_INDEX_PATH
+        self.roots = roots if roots is not None else default_roots()
+        self.min_score = min_score if min_score is not None else config.APP_INDEX_MIN_SCORE
+        self._dirs = {}   # directory -> {"mtime", "subdirs", "files"}
+        self._files = {}  # file path -> {"mtime", "entry"}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()  # one scan (and one cache write) at a time
+        self._by_name = {}  # normalized name/alias -> best entry
+        self._names = []    # fuzzy-matchable names (PATH executables excluded)
+        self.refreshed_at = 0.0  # start time of the latest scan
+
+    # ---------- Cache ----------
+    def load(self):
+        """Load the JSON cache (no filesystem scan)"""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                with self._lock:
+                    self._dirs, self._files = data["dirs"], data["files"]
+                    self._rebuild()
+                logger.info(f"✓ App index loaded from cache ({len(self._by_name)} names)")
+        except (OSError, ValueError, KeyError):
+            pass
+        return self
+
+    def save(self):
+        tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+        with self._lock:
+            data = {"version": CACHE_VERSION, "dirs": self._dirs, "files": self._files}
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        os.replace(tmp, self.cache_path)
+
+    # ---------- Scanning ----------
+    def refresh(self):
+        """
+        Rescan changed directories and files.
+
+        Returns:
+            Number of files added, changed or removed
+        """
+        with self._refresh_lock:
+            self.refreshed_at = time.time()
+            return self._refresh()
+
+    def _refresh(self):
+        start = time.perf_counter()
+        with self._lock:
+            dirs, files = dict(self._dirs), dict(self._files)
+        seen_dirs, seen_files, changed = set(), set(), 0
+
+        for root, kind, recursive in self.roots:
+            pending = [root]
+            while pending:
+                directory = pending.pop()
+                if directory in seen_dirs:
+                    continue
+                seen_dirs.add(directory)
+                try:
+                    mtime = os.stat(directory).st_mtime
+                except OSError:
+                    continue
+                cached = dirs.get(directory)
+                if not cached or cached["mtime"] != mtime:
+                    cached = self._list_dir(directory, kind, mtime)
+                    dirs[directory] = cached
+                if recursive:
+                    pending.extend(cached["subdirs"])
+                for path in cached["files"]:
+                    seen_files.add(path)
+                    changed += self._refresh_file(files, path, kind)
+
+        for path in set(files) - seen_files:
+            del files[path]
+            changed += 1
+        for directory in set(dirs) - seen_dirs:
+            del dirs[directory]
+
+        with self._lock:
+            self._dirs, self._files = dirs, files
+            self._rebuild()
+        logger.info(f"✓ App index refreshed in {time.perf_counter() - start:.2f}s "
+                    f"({len(self._by_name)} names, {changed} files changed)")
+        if changed:
+            try:
+                self.save()
+            except OSError as e:
+                logger.warning(f"Could not save app index: {e}")
+        return changed
+
+    @property
+    def refreshing(self):
+        return self._refresh_lock.locked()
+
+    def refresh_async(self):
+        """Refresh on a daemon thread (lookups keep using the cached index meanwhile)"""
+        thread = threading.Thread(target=self._refresh_safely, daemon=True)
+        thread.start()
+        return thread
+
+    def _refresh_safely(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"App index refresh failed: {e}")
+
+    @staticmethod
+    def _list_dir(directory, kind, mtime):
+        suffixes = SOURCE_SUFFIXES[kind]
+        subdirs, file_paths = [], []
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    try:
+                        if item.is_dir():
+                            subdirs.append(item.path)
+                        elif item.is_file() and (suffixes is None or item.name.lower().endswith(suffixes)):
+                            file_paths.append(item.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return {"mtime": mtime, "kind": kind, "subdirs": subdirs, "files": file_paths}
+
+    @staticmethod
+    def _refresh_file(files, path, kind):
+        """Re-parse a file if new or modified; returns 1 when its entry changed"""
+        cached = files.get(path)
+        if kind != "desktop" and cached is not None:
+            return 0  # shortcut/executable entries only depend on the file name
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return 0
+        if cached is not None and cached["mtime"] == mtime:
+            return 0
+        files[path] = {"mtime": mtime, "entry": PARSERS[kind](path)}
+        return 1
+
+    def _rebuild(self):
+        by_name = {}
+        for record in self._files.values():
+            entry = record.get("entry")
+            if not entry:
+                continue
+            for name in [entry["name"]] + entry.get("aliases", []):
+                key = normalize_name(name)
+                current = by_name.get(key)
+                if key and (current is None or KIND_PRIORITY[entry["kind"]] < KIND_PRIORITY[current["kind"]]):
+                    by_name[key] = entry
+        self._by_name = by_name
+        # PATH executables (svchost, dllhost, wordpad...) only match exactly: fuzzy hits there
+        # launch the wrong program ("steam" -> teams scores 80)
+        self._names = [name for name, entry in by_name.items() if entry["kind"] != "path"]
+
+    # ---------- Lookup ----------
+    def __len__(self):
+        return len(self._by_name)
+
+    def candidates(self, spoken_name, limit=5):
+        """Best matches as [(score, entry), ...], preferring Start Menu/.desktop entries on ties; PATH entries match exactly"""
+        query = normalize_name(spoken_name)
+        if not query:
+            return []
+        by_name, names = self._by_name, self._names
+        exact = by_name.get(query)
+        if exact:
+            return [(100.0, exact)]
+
+        try:
+            from rapidfuzz import fuzz, process
+            scored = [(score, name) for name, score, _ in
+                      process.extract(query, names, scorer=fuzz.WRatio, limit=limit * 4)]
+        except ImportError:
+            scored = [(fuzzy_score(query, name), name) for name in names]
+        scored.sort(key=lambda s: (-s[0], KIND_PRIORITY[by_name[s[1]]["kind"]], len(s[1])))
+        return [(float(score), by_name[name]) for score, name in scored[:limit]]
+
+    def lookup(self, spoken_name, min_score=None):
+        """Entry for a spoken app name (with its 'score'), or None below min_score"""
+        min_score = self.min_score if min_score is None else min_score
+        best = self.candidates(spoken_name, limit=1)
+        if not best or best[0][0] < min_score:
+            if self.refreshing:
+                # e.g. the startup refresh_async: give it a moment instead of scanning twice
+                if self._refresh_lock.acquire(timeout=config.APP_INDEX_REFRESH_WAIT):
+                    self._refresh_lock.release()
+                best = self.candidates(spoken_name, limit=1)
+            elif time.time() - self.refreshed_at > config.APP_INDEX_RESCAN_AFTER:
+                self.refresh()  # maybe installed since the last scan
+                best = self.candidates(spoken_name, limit=1)
+        if not best or best[0][0] < min_score:
+            return None
+        score, entry = best[0]
+        return dict(entry, score=score)
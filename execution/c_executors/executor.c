@@ -65,4 +65,76 @@ int keyboard_type_string(const char* text) {
         Sleep(20);
     }
     return 0;
-}
\ No newline at end of file
+}
+
+/* Submit a list of events with as few SendInput calls as possible: events are
+   buffered until one carries a delay (or is a cursor move), then flushed together.
+   Returns the number of events sent, or -1 on bad arguments. */
+#define BATCH_CHUNK 64
+
+static int flush_inputs(INPUT* inputs, int* pending) {
+    int sent = 0;
+    if (*pending > 0) {
+        sent = (int)SendInput((UINT)*pending, inputs, sizeof(INPUT));
+        *pending = 0;
+    }
+    return sent;
+}
+
+int send_input_batch(const InputEvent* events, int count) {
+    INPUT inputs[BATCH_CHUNK];
+    int pending = 0;
+    int sent = 0;
+    if (!events || count < 0) return -1;
+
+    for (int i = 0; i < count; ++i) {
+        const InputEvent* ev = &events[i];
+        if (ev->type == EV_MOUSE_MOVE) {
+            sent += flush_inputs(inputs, &pending);
+            SetCursorPos(ev->x, ev->y);
+            sent += 1;
+        } else {
+            INPUT* input = &inputs[pending++];
+            ZeroMemory(input, sizeof(INPUT));
+            switch (ev->type) {
+            case EV_KEY_DOWN:
+            case EV_KEY_UP:
+                input->type = INPUT_KEYBOARD;
+                input->ki.wVk = (WORD)ev->code;
+                input->ki.dwFlags = ev->type == EV_KEY_UP ? KEYEVENTF_KEYUP : 0;
+                break;
+            case EV_UNICODE_DOWN:
+            case EV_UNICODE_UP:
+                input->type = INPUT_KEYBOARD;
+                input->ki.wScan = (WORD)ev->code;
+                input->ki.dwFlags = KEYEVENTF_UNICODE | (ev->type == EV_UNICODE_UP ? KEYEVENTF_KEYUP : 0);
+                break;
+            case EV_MOUSE_DOWN:
+                input->type = INPUT_MOUSE;
+                input->mi.dwFlags = ev->code == 1 ? MOUSEEVENTF_RIGHTDOWN : MOUSEEVENTF_LEFTDOWN;
+                break;
+            case EV_MOUSE_UP:
+                input->type = INPUT_MOUSE;
+                input->mi.dwFlags = ev->code == 1 ? MOUSEEVENTF_RIGHTUP : MOUSEEVENTF_LEFTUP;
+                break;
+            case EV_MOUSE_SCROLL:
+                input->type = INPUT_MOUSE;
+                input->mi.dwFlags = MOUSEEVENTF_WHEEL;
+                input->mi.mouseData = (DWORD)ev->code;
+                break;
+            default:
+                pending--;  /* unknown type: drop it */
+                break;
+            }
+            if (pending == BATCH_CHUNK) {
+                sent += flush_inputs(inputs, &pending);
+            }
+        }
+        if (ev->delay_ms > 0) {
+            sent += flush_inputs(inputs, &pending);
+            Sleep(ev->delay_ms);
+        }
+    }
+    sent += flush_inputs(inputs, &pending);
+    return sent;
+}
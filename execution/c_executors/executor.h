@@ -5,12 +5,31 @@
 extern "C" {
 #endif
 
+/* Event types for send_input_batch (mirrored in executor_bridge.py) */
+#define EV_KEY_DOWN      0  /* code = virtual key */
+#define EV_KEY_UP        1
+#define EV_UNICODE_DOWN  2  /* code = UTF-16 code unit */
+#define EV_UNICODE_UP    3
+#define EV_MOUSE_MOVE    4  /* x, y = screen coordinates */
+#define EV_MOUSE_DOWN    5  /* code = 0 left, 1 right */
+#define EV_MOUSE_UP      6
+#define EV_MOUSE_SCROLL  7  /* code = wheel delta */
+
+typedef struct {
+    int type;
+    int code;
+    int x;
+    int y;
+    int delay_ms;  /* sleep after this event; 0 = submit with the next events */
+} InputEvent;
+
 __declspec(dllexport) int mouse_move(int x, int y);
 __declspec(dllexport) int mouse_click(int button);
 __declspec(dllexport) int mouse_scroll(int amount);
 __declspec(dllexport) int keyboard_press_key(int vk_code);
 __declspec(dllexport) int keyboard_release_key(int vk_code);
 __declspec(dllexport) int keyboard_type_string(const char* text);
+__declspec(dllexport) int send_input_batch(const InputEvent* events, int count);
 
 #ifdef __cplusplus
 }
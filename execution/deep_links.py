@@ -0,0 +1,216 @@
+"""
+Deep Links - one-step plans for web, media and messaging commands
+When the extracted entities are enough, a command becomes a single OPEN_URL
+step (search URL, spotify:search: URI, whatsapp://send link), with Chrome
+started on the right --profile-directory resolved from its Local State file.
+plan() returns None whenever the UI template is still needed.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import threading
+from urllib.parse import quote, quote_plus
+
+logger = logging.getLogger("DeepLinks")
+
+# website (as extracted) -> search URL; {q} is form-encoded, {q_path} path-encoded
+SEARCH_URLS = {
+    'google.com': 'https://www.google.com/search?q={q}',
+    'youtube.com': 'https://www.youtube.com/results?search_query={q}',
+    'mail.google.com': 'https://mail.google.com/mail/u/0/#search/{q}',
+    'facebook.com': 'https://www.facebook.com/search/top?q={q}',
+    'twitter.com': 'https://twitter.com/search?q={q}',
+    'linkedin.com': 'https://www.linkedin.com/search/results/all/?keywords={q}',
+    'github.com': 'https://github.com/search?q={q}',
+    'reddit.com': 'https://www.reddit.com/search/?q={q}',
+    'amazon.com': 'https://www.amazon.com/s?k={q}',
+    'netflix.com': 'https://www.netflix.com/search?q={q}',
+    'open.spotify.com': 'https://open.spotify.com/search/{q_path}',
+}
+
+# media app -> URI/URL for a search inside it
+MEDIA_URLS = {
+    'spotify': 'spotify:search:{q_path}',
+    'youtube': 'https://www.youtube.com/results?search_query={q}',
+    'netflix': 'https://www.netflix.com/search?q={q}',
+}
+
+PHONE_RE = re.compile(r'^\+?[\d\s\-()]{7,}$')
+MEDIA_FILLER = re.compile(r'\s+(?:on|in|using|with|from)\s*$')
+
+
+def fill(template, query):
+    return template.format(q=quote_plus(query), q_path=quote(query, safe=''))
+
+
+def chrome_paths():
+    """(chrome executable or None, Local State path) for this platform"""
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA", "")
+        candidates = [
+            os.path.join(os.environ.get("PROGRAMFILES", ""), "Google", "Chrome", "Application", "chrome.exe"),
+            os.path.join(os.environ.get("PROGRAMFILES(X86)", ""), "Google", "Chrome", "Application", "chrome.exe"),
+            os.path.join(local, "Google", "Chrome", "Application", "chrome.exe"),
+        ]
+        local_state = os.path.join(local, "Google", "Chrome", "User Data", "Local State")
+    elif sys.platform == "darwin":
+        candidates = ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+        local_state = os.path.expanduser("~/Library/Application Support/Google/Chrome/Local State")
+    else:
+        candidates = [shutil.which(name) for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")]
+        local_state = os.path.expanduser("~/.config/google-chrome/Local State")
+        if not os.path.exists(local_state):
+            local_state = os.path.expanduser("~/.config/chromium/Local State")
+    executable = next((c for c in candidates if c and os.path.isfile(c)), None)
+    return executable, local_state
+
+
+class DeepLinkPlanner:
+    """Builds OPEN_URL plans; Chrome profiles are read from Local State (re-read when it changes)"""
+
+    def __init__(self, contacts=None, chrome_executable=None, local_state_path=None):
+        """
+        Args:
+            contacts: {spoken name: phone number} for whatsapp:// links
+            chrome_executable: chrome binary (default: discovered)
+            local_state_path: Chrome 'Local State' file (default: discovered)
+        """
+        found_executable, found_local_state = chrome_paths()
+        self.chrome = chrome_executable or found_executable
+        self.local_state_path = local_state_path or found_local_state
+        self.contacts = {name.lower(): number for name, number in (contacts or {}).items()}
+        self._profiles = {}  # display name (lowercase) -> profile directory
+        self._profiles_mtime = None
+        self._lock = threading.Lock()
+
+    # ---------- Chrome profiles ----------
+    def profiles(self):
+        """{lowercase profile name: profile directory}, e.g. {'work': 'Profile 1'}"""
+        try:
+            mtime = os.stat(self.local_state_path).st_mtime
+        except (OSError, TypeError):
+            return {}
+        with self._lock:
+            if mtime != self._profiles_mtime:
+                self._profiles = self._read_profiles()
+                self._profiles_mtime = mtime
+            return self._profiles
+
+    def _read_profiles(self):
+        try:
+            with open(self.local_state_path, "r", encoding="utf-8") as f:
+                info_cache = json.load(f).get("profile", {}).get("info_cache", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read Chrome profiles: {e}")
+            return {}
+        profiles = {}
+        for directory, info in info_cache.items():
+            for name in (info.get("name"), info.get("shortcut_name"), info.get("gaia_given_name"),
+                         info.get("gaia_name"), directory):
+                if name:
+                    profiles.setdefault(name.strip().lower(), directory)
+        return profiles
+
+    def profile_directory(self, profile_name):
+        """Profile directory for a spoken profile name, or None if it cannot be resolved"""
+        if not profile_name or profile_name.lower() == "default":
+            return "Default"
+        profiles = self.profiles()
+        name = profile_name.strip().lower()
+        if name in profiles:
+            return profiles[name]
+        from execution.app_index import fuzzy_score
+        scored = sorted(((fuzzy_score(name, known), directory) for known, directory in profiles.items()), reverse=True)
+        if scored and scored[0][0] >= 85:
+            return scored[0][1]
+        return None
+
+    # ---------- Plans ----------
+    def plan(self, command_type, extracted):
+        """Deep-link steps for a command, or None to use the UI template"""
+        try:
+            if command_type == "WEB_SEARCH":
+                return self._web_search(extracted)
+            if command_type == "MEDIA_CONTROL":
+                return self._media(extracted)
+            if command_type == "SEND_MESSAGE":
+                return self._message(extracted)
+        except Exception as e:
+            logger.warning(f"Deep-link planning failed for {command_type}: {e}")
+        return None
+
+    def _web_search(self, extracted):
+        website = extracted.get('website')
+        query = extracted.get('search_query')
+        if query:
+            template = SEARCH_URLS.get(website or 'google.com')
+            if not template:
+                return None
+            url = fill(template, query)
+        elif website:
+            url = f"https://{website}"
+        else:
+            return None
+
+        profile_name = extracted.get('profile_name') or "Default"
+        step = {"action_type": "OPEN_URL", "parameters": {"url": url}, "description": f"Open {url}"}
+        if self.chrome:
+            directory = self.profile_directory(profile_name)
+            if directory is None:
+                logger.info(f"Chrome profile '{profile_name}' not found - using the UI flow")
+                return None
+            step["parameters"].update(browser=self.chrome, browser_args=[f"--profile-directory={directory}"])
+            step["description"] += f" in Chrome ({profile_name})"
+        elif profile_name.lower() != "default":
+            return None  # no Chrome binary to pass the profile to
+        return [step]
+
+    def _media(self, extracted):
+        app = extracted.get('app_name')
+        query = (extracted.get('media_query') or '').strip()
+        template = MEDIA_URLS.get(app)
+        if not template or not query:
+            return None
+        # "despacito on spotify" -> "despacito"
+        query = ' '.join(w for w in query.split() if w.lower() != app)
+        query = MEDIA_FILLER.sub('', query).strip()
+        if not query:
+            return None
+        url = fill(template, query)
+        return [{"action_type": "OPEN_URL", "parameters": {"url": url}, "description": f"Search {app}: {query}"}]
+
+    def _message(self, extracted):
+        """Opens the chat only; SEND_MESSAGE_PHASE_2 still types and sends the message"""
+        if extracted.get('app_name') != 'whatsapp':
+            return None
+        recipient = (extracted.get('recipient') or '').strip()
+        number = self.contacts.get(recipient.lower())
+        if number is None and PHONE_RE.match(recipient):
+            number = recipient
+        if not number:
+            return None
+        phone = re.sub(r'[^\d]', '', number)
+        return [
+            {"action_type": "OPEN_URL", "parameters": {"url": f"whatsapp://send?phone={phone}"},
+             "description": f"Open WhatsApp chat with {recipient}"},
+            {"action_type": "WAIT_FOR_WINDOW", "parameters": {"title": "WhatsApp"}, "description": "Wait for WhatsApp window"},
+            {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for chat to open"},
+        ]
+
+
+_planner = None
+_planner_lock = threading.Lock()
+
+
+def get_planner():
+    """Process-wide planner using config.CONTACT_PHONE_NUMBERS"""
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            import config
+            _planner = DeepLinkPlanner(contacts=getattr(config, "CONTACT_PHONE_NUMBERS", {}))
+        return _planner
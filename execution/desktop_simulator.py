@@ -0,0 +1,706 @@
+"""
+Desktop Simulator - closed-loop virtual desktop for end-to-end plan tests
+Simulated apps (Start menu, Chrome with its profile picker, WhatsApp, File
+Explorer and a generic media/app window) keep their own state, react to the
+keys, text, clicks and launches the executor sends, and render the foreground
+window as an image with ground-truth elements. DesktopSimulator is the
+executor backend, SimulatedScreens the capture backend and SimulatedParser an
+optional stand-in for OmniParser that returns the rendered elements, so whole
+WEB_SEARCH / SEND_MESSAGE flows run headless on Linux.
+"""
+
+import logging
+import ntpath
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlparse
+
+from execution.dry_run_executor import DEFAULT_COSTS, DryRunExecutor
+from execution.window_registry import normalize_title, score_titles
+
+logger = logging.getLogger("DesktopSimulator")
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 1920, 1080
+TITLE_BAR = 40
+TASKBAR = 48
+
+DEFAULT_PROFILES = ("Default", "Work", "Personal")
+DEFAULT_CONTACTS = {"Mom": "+911234567890", "Dad": "+911234567891", "John": "+15550100"}
+DEFAULT_FILES = {
+    "Home": ["Desktop", "Documents", "Downloads", "Pictures", "Music"],
+    "Documents": ["report.docx", "budget.xlsx", "notes.txt", "resume.pdf"],
+    "Downloads": ["setup.exe", "photo.jpg", "invoice.pdf", "song.mp3"],
+    "Desktop": ["project", "todo.txt"],
+    "Pictures": ["holiday.png", "family.jpg"],
+    "Music": ["song.mp3", "playlist.m3u"],
+}
+
+
+def _element(key, label, left, top, width, height, element_type="text"):
+    """Ground-truth element in parse_screen's format; 'key' routes clicks back to the app"""
+    return {"key": key, "label": label, "type": element_type, "confidence": 1.0,
+            "x": left + width // 2, "y": top + height // 2,
+            "bbox": [left, top, left + width, top + height]}
+
+
+# ---------- Simulated apps ----------
+class SimApp:
+    """One top-level window; subclasses override the handlers they care about"""
+
+    class_name = "SimWindow"
+
+    def __init__(self, name):
+        self.name = name
+        self.focus = None   # focused input key
+        self.buffer = ""    # text typed into the focused input
+        self.events = []    # user-visible outcomes (navigations, sent messages, opened files)
+
+    @property
+    def title(self):
+        return self.name
+
+    def elements(self):
+        return []
+
+    def on_key(self, key):
+        if key == "enter" and self.focus:
+            self.submit(self.focus, self.buffer)
+        elif key == "backspace" and self.focus:
+            self.buffer = self.buffer[:-1]
+        elif key == "ctrl+a" and self.focus:
+            self.buffer = ""  # next typing replaces the field
+
+    def on_text(self, text):
+        if self.focus:
+            self.buffer += text
+
+    def on_click(self, key):
+        self.set_focus(key)
+
+    def set_focus(self, key, text=""):
+        self.focus, self.buffer = key, text
+
+    def submit(self, key, text):
+        self.events.append({"submit": key, "text": text})
+
+    def state(self):
+        return {"title": self.title, "focus": self.focus, "events": list(self.events)}
+
+
+class StartMenu(SimApp):
+    """Start search overlay: typing filters the known apps, Enter launches the best match"""
+
+    def __init__(self, desktop):
+        super().__init__("Start")
+        self.desktop = desktop
+        self.set_focus("start_search")
+
+    def best_match(self):
+        query = self.buffer.strip()
+        if not query:
+            return None
+        names = list(self.desktop.known_apps)
+        ranked = score_titles(normalize_title(query), [normalize_title(n) for n in names], limit=1, min_score=70)
+        return names[ranked[0][1]] if ranked else query
+
+    def elements(self):
+        top = SCREEN_HEIGHT - TASKBAR - 600
+        items = [_element("start_search", self.buffer or "Type here to search", 20, top + 540, 640, 44, "clickable")]
+        match = self.best_match()
+        if match:
+            items.append(_element(f"start_match:{match}", match, 20, top + 40, 640, 64, "clickable"))
+        return items
+
+    def submit(self, key, text):
+        match = self.best_match()
+        self.desktop.close_start_menu()
+        if match:
+            self.desktop.launch(match)
+
+    def on_click(self, key):
+        if key.startswith("start_match:"):
+            self.desktop.close_start_menu()
+            self.desktop.launch(key.split(":", 1)[1])
+        else:
+            super().on_click(key)
+
+
+class ChromeApp(SimApp):
+    """Profile picker -> new tab -> site / search results -> opened result"""
+
+    class_name = "Chrome_WidgetWin_1"
+
+    def __init__(self, profiles=DEFAULT_PROFILES, url=None, profile=None):
+        super().__init__("Google Chrome")
+        self.profiles = list(profiles)
+        self.profile = profile
+        self.page = "profiles" if profile is None and url is None else "newtab"
+        self.url = None
+        self.query = None
+        self.results = []
+        if url:
+            self.profile = profile or "Default"
+            self.navigate(url)
+
+    @property
+    def title(self):
+        if self.page == "profiles":
+            return "Google Chrome"
+        if self.page == "results":
+            return f"{self.query} - Search - Google Chrome"
+        if self.page in ("site", "opened"):
+            return f"{self.site_name()} - Google Chrome"
+        return "New Tab - Google Chrome"
+
+    def site_name(self):
+        host = urlparse(self.url or "").netloc or (self.url or "")
+        return host.replace("www.", "") or "New Tab"
+
+    def navigate(self, target):
+        target = target.strip()
+        if not re.match(r"^[a-z]+://", target):
+            target = f"https://{target}" if "." in target and " " not in target else \
+                f"https://www.google.com/search?q={target}"
+        self.url = target
+        parsed = urlparse(target)
+        params = parse_qs(parsed.query)
+        query = (params.get("q") or params.get("search_query") or params.get("k") or params.get("keywords") or [None])[0]
+        for tail in (parsed.path, parsed.fragment):  # /search/<q> paths and #search/<q> fragments (Gmail)
+            if query is None and "search/" in tail:
+                query = unquote(tail.rsplit("/", 1)[-1])
+        if query:
+            self.show_results(query)
+        else:
+            self.page = "site"
+        self.events.append({"navigate": target})
+
+    def show_results(self, query):
+        self.page, self.query = "results", query
+        self.results = [f"{query} - result {i + 1}" for i in range(5)]
+
+    def elements(self):
+        if self.page == "profiles":
+            count = len(self.profiles)
+            left = (SCREEN_WIDTH - count * 220) // 2
+            items = [_element("heading", "Who's using Chrome?", 660, 300, 600, 60)]
+            items += [_element(f"profile:{name}", name, left + i * 220 + 20, 460, 180, 200, "clickable")
+                      for i, name in enumerate(self.profiles)]
+            return items + [_element("profile_add", "Add", left + count * 220 + 20, 460, 180, 200, "clickable")]
+
+        address = self.buffer if self.focus == "address" else (self.url or "Search Google or type a URL")
+        items = [_element("address", address, 200, TITLE_BAR + 12, 1500, 36, "clickable")]
+        if self.page in ("site", "newtab"):
+            items.append(_element("heading", self.site_name(), 660, 180, 600, 60))
+            search = self.buffer if self.focus == "page_search" else "Search"
+            items.append(_element("page_search", search, 560, 280, 800, 44, "clickable"))
+        elif self.page == "results":
+            # The box shows a placeholder once submitted so selectors pick a result, not the box
+            search = self.buffer if self.focus == "page_search" else "Search"
+            items.append(_element("page_search", search, 560, 120, 800, 44, "clickable"))
+            items += [_element(f"result:{i}", label, 300, 220 + i * 100, 1200, 64, "clickable")
+                      for i, label in enumerate(self.results)]
+        elif self.page == "opened":
+            items.append(_element("heading", self.events[-1].get("open", ""), 300, 180, 1300, 60))
+        return items
+
+    def on_key(self, key):
+        if key == "ctrl+l":
+            self.set_focus("address")
+        elif key == "/" and self.page in ("site", "newtab", "results"):
+            self.set_focus("page_search")
+        elif key == "ctrl+t":
+            self.page, self.url = "newtab", None
+        else:
+            super().on_key(key)
+
+    def on_text(self, text):
+        if self.focus is None and self.page in ("site", "newtab"):
+            self.set_focus("page_search")  # typing on a page with a search box lands in it
+        super().on_text(text)
+
+    def on_click(self, key):
+        if key.startswith("profile:"):
+            self.profile = key.split(":", 1)[1]
+            self.page = "newtab"
+            self.events.append({"profile": self.profile})
+        elif key.startswith("result:"):
+            label = self.results[int(key.split(":", 1)[1])]
+            self.page = "opened"
+            self.events.append({"open": label})
+        elif key in ("address", "page_search"):
+            self.set_focus(key)
+
+    def submit(self, key, text):
+        self.focus = None
+        if key == "address":
+            self.navigate(text)
+        elif key == "page_search" and text:
+            self.show_results(text)
+            self.events.append({"search": text})
+
+    def state(self):
+        return dict(super().state(), page=self.page, url=self.url, profile=self.profile, query=self.query)
+
+
+class WhatsAppApp(SimApp):
+    """Chat list with search; Tab + Enter or a click opens a chat; Enter sends the draft"""
+
+    class_name = "WhatsAppDesktop"
+
+    def __init__(self, contacts=None):
+        super().__init__("WhatsApp")
+        self.contacts = dict(DEFAULT_CONTACTS if contacts is None else contacts)
+        self.chat = None
+        self.highlight = None
+        self.messages = {}  # contact -> [sent text]
+
+    def filtered(self):
+        query = self.buffer.lower() if self.focus == "search" else ""
+        return [name for name in self.contacts if query in name.lower()]
+
+    def open_chat(self, name):
+        self.chat = name
+        self.set_focus("message")
+        self.events.append({"chat": name})
+
+    def open_phone(self, phone):
+        digits = re.sub(r"[^\d]", "", phone)
+        name = next((n for n, p in self.contacts.items() if re.sub(r"[^\d]", "", p) == digits), f"+{digits}")
+        self.contacts.setdefault(name, f"+{digits}")
+        self.open_chat(name)
+
+    def elements(self):
+        search = self.buffer if self.focus == "search" else "Search or start new chat"
+        items = [_element("search", search, 20, TITLE_BAR + 60, 500, 40, "clickable")]
+        items += [_element(f"chat:{name}", name, 20, TITLE_BAR + 120 + i * 72, 500, 64, "clickable")
+                  for i, name in enumerate(self.filtered())]
+        if self.chat:
+            items.append(_element("chat_header", self.chat, 560, TITLE_BAR + 10, 1300, 56))
+            items += [_element(f"msg:{i}", text, 1200, TITLE_BAR + 100 + i * 56, 660, 44)
+                      for i, text in enumerate(self.messages.get(self.chat, [])[-12:])]
+            draft = self.buffer if self.focus == "message" and self.buffer else "Type a message"
+            items.append(_element("message", draft, 560, SCREEN_HEIGHT - TASKBAR - 70, 1220, 44, "clickable"))
+            items.append(_element("send", "Send", 1800, SCREEN_HEIGHT - TASKBAR - 70, 80, 44, "clickable"))
+        return items
+
+    def on_key(self, key):
+        if key in ("ctrl+f", "ctrl+n"):
+            self.set_focus("search")
+            self.highlight = None
+        elif key == "tab" and self.focus == "search":
+            matches = self.filtered()
+            self.highlight = matches[0] if matches else None
+        elif key == "enter" and self.focus == "search":
+            matches = self.filtered()
+            target = self.highlight or (matches[0] if matches else None)
+            if target:
+                self.open_chat(target)
+        else:
+            super().on_key(key)
+
+    def on_click(self, key):
+        if key.startswith("chat:"):
+            self.open_chat(key.split(":", 1)[1])
+        elif key == "send":
+            self.submit("message", self.buffer)
+        else:
+            super().on_click(key)
+
+    def submit(self, key, text):
+        if key == "message" and self.chat and text:
+            self.messages.setdefault(self.chat, []).append(text)
+            self.events.append({"sent": text, "to": self.chat})
+            self.buffer = ""
+
+    def state(self):
+        return dict(super().state(), chat=self.chat, messages=dict(self.messages))
+
+
+class ExplorerApp(SimApp):
+    """Folder listing with address bar (Ctrl+L) and search (Ctrl+F)"""
+
+    class_name = "CabinetWClass"
+
+    def __init__(self, files=None):
+        super().__init__("File Explorer")
+        self.files = DEFAULT_FILES if files is None else files
+        self.folder = "Home"
+        self.results = None
+
+    @property
+    def title(self):
+        return f"Search Results in {self.folder}" if self.results is not None else self.folder
+
+    def listing(self):
+        if self.results is not None:
+            return self.results
+        return self.files.get(self.folder, [])
+
+    def elements(self):
+        address = self.buffer if self.focus == "address" else self.folder
+        search = self.buffer if self.focus == "search" else f"Search {self.folder}"
+        items = [_element("address", address, 200, TITLE_BAR + 12, 1200, 36, "clickable"),
+                 _element("search", search, 1440, TITLE_BAR + 12, 440, 36, "clickable")]
+        items += [_element(f"file:{name}", name, 260, TITLE_BAR + 100 + i * 40, 900, 34, "clickable")
+                  for i, name in enumerate(self.listing())]
+        return items
+
+    def on_key(self, key):
+        if key == "ctrl+l":
+            self.set_focus("address")
+        elif key in ("ctrl+f", "ctrl+e"):
+            self.set_focus("search")
+        else:
+            super().on_key(key)
+
+    def on_click(self, key):
+        if key.startswith("file:"):
+            name = key.split(":", 1)[1]
+            if name in self.files:
+                self.open_folder(name)
+            else:
+                self.events.append({"open": name})
+        else:
+            super().on_click(key)
+
+    def open_folder(self, name):
+        known = {f.lower(): f for f in self.files}
+        self.folder = known.get(ntpath.basename(name.rstrip("\\/")).lower(), name)  # Windows paths on any OS
+        self.results = None
+        self.events.append({"folder": self.folder})
+
+    def submit(self, key, text):
+        self.focus = None
+        if key == "address":
+            self.open_folder(text)
+        elif key == "search":
+            needle = text.lower()
+            self.results = sorted({f for files in self.files.values() for f in files if needle in f.lower()})
+            self.events.append({"search": text, "results": len(self.results)})
+
+    def state(self):
+        return dict(super().state(), folder=self.folder, results=self.results)
+
+
+class MediaApp(SimApp):
+    """Generic app window; Ctrl+K/Ctrl+L focus its search box, Enter plays/opens the query"""
+
+    def elements(self):
+        search = self.buffer if self.focus == "search" else "Search"
+        items = [_element("search", search, 560, TITLE_BAR + 20, 800, 40, "clickable")]
+        if self.events:
+            items.append(_element("now_playing", f"Playing: {self.events[-1]['text']}", 560, 500, 800, 60))
+        return items
+
+    def on_key(self, key):
+        if key in ("ctrl+k", "ctrl+l", "ctrl+f"):
+            self.set_focus("search")
+        else:
+            super().on_key(key)
+
+    def on_text(self, text):
+        if self.focus is None:
+            self.set_focus("search")
+        super().on_text(text)
+
+
+# ---------- Executor + capture backends ----------
+class DesktopSimulator(DryRunExecutor):
+    """Executor backend whose actions change simulated app state"""
+
+    name = "simulator"
+
+    def __init__(self, time_scale=0.0, costs=None, profiles=DEFAULT_PROFILES, contacts=None, files=None):
+        super().__init__(time_scale=time_scale, costs=costs, auto_windows=False, windows=["Desktop"])
+        self.profiles = profiles
+        self.contacts = contacts
+        self.files = files
+        self.apps = []          # z-order, foreground last
+        self.start_menu = None
+        self.known_apps = OrderedDict((name, None) for name in
+                                      ("Google Chrome", "WhatsApp", "File Explorer", "Spotify", "Notepad"))
+        self._frame_lock = threading.RLock()
+        self._font = None
+
+    # ---------- State ----------
+    @property
+    def active(self):
+        if self.start_menu is not None:
+            return self.start_menu
+        return self.apps[-1] if self.apps else None
+
+    def _sync_windows(self):
+        self.windows = ["Desktop"] + [app.title for app in self.apps]
+        self.foreground = self.apps[-1].title if self.apps else "Desktop"
+
+    def bring_to_front(self, app):
+        self.apps.remove(app)
+        self.apps.append(app)
+        self._sync_windows()
+
+    def find_app(self, cls=None, name=None):
+        for app in reversed(self.apps):
+            if (cls is None or isinstance(app, cls)) and (name is None or app.name.lower() == name.lower()):
+                return app
+        return None
+
+    def launch(self, name, url=None):
+        """Open (or focus, for single-instance apps) an app by spoken/typed name"""
+        key = normalize_title(name)
+        if "chrome" in key or url:
+            app = ChromeApp(self.profiles, url=url)
+        elif "whatsapp" in key:
+            app = self.find_app(WhatsAppApp) or WhatsAppApp(self.contacts)
+        elif "explorer" in key or key in ("files", "file manager"):
+            app = ExplorerApp(self.files)
+        else:
+            app = self.find_app(MediaApp, name.title()) or MediaApp(name.title())
+        if app not in self.apps:
+            self.apps.append(app)
+        self.bring_to_front(app)
+        return app
+
+    def open_start_menu(self):
+        self.start_menu = StartMenu(self)
+
+    def close_start_menu(self):
+        self.start_menu = None
+
+    def reset(self):
+        """Clear the action log and close every app (fresh desktop for the next flow)"""
+        super().reset()
+        with self._frame_lock:
+            self.apps = []
+            self.start_menu = None
+            self._sync_windows()
+
+    def state(self):
+        """Snapshot of every open app (what a flow test asserts on)"""
+        with self._frame_lock:
+            return {"foreground": self.foreground, "apps": [app.state() for app in self.apps]}
+
+    # ---------- Input ----------
+    def press(self, key):
+        key = "+".join(part.strip().lower() for part in key.split("+"))
+        if key == "win":
+            if self.start_menu is None:
+                self.open_start_menu()
+            else:
+                self.close_start_menu()
+        elif key == "win+e":
+            self.close_start_menu()
+            self.launch("File Explorer")
+        elif key == "escape" and self.start_menu is not None:
+            self.close_start_menu()
+        elif key == "alt+f4" and self.start_menu is None and self.apps:
+            self.apps.pop()
+            self._sync_windows()
+        elif self.active is not None:
+            self.active.on_key(key)
+        self._sync_windows()
+
+    def type_text(self, text):
+        if self.active is not None:
+            self.active.on_text(text)
+        self._sync_windows()
+
+    def click(self, x, y):
+        target = None
+        for element in reversed(self.frame_elements()):
+            x1, y1, x2, y2 = element["bbox"]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                target = element
+                break
+        if target is not None and target["key"].startswith("start_"):
+            self.start_menu.on_click(target["key"])
+        else:
+            self.close_start_menu()  # clicking outside the overlay dismisses it
+            if target is not None and target["key"] != "title":
+                self.apps[-1].on_click(target["key"])
+        self._sync_windows()
+        return target
+
+    # ---------- ExecutorBackend ----------
+    def execute_action(self, action_type, coordinates, parameters):
+        result = super().execute_action(action_type, coordinates, parameters)
+        if not result.get("success"):
+            return result
+        with self._frame_lock:
+            if action_type == "PRESS_KEY":
+                self.press(parameters.get("key", ""))
+            elif action_type == "TYPE_TEXT":
+                self.type_text(parameters.get("text", ""))
+            elif action_type == "MOUSE_CLICK":
+                target = self.click(coordinates.get("x", 0), coordinates.get("y", 0))
+                self.actions[-1]["hit"] = target["label"] if target else None
+        return result
+
+    def launch_application(self, app_name=None, url=None, browser=None, browser_args=None):
+        result = super().launch_application(app_name=app_name, url=url, browser=browser, browser_args=browser_args)
+        with self._frame_lock:
+            if url and url.startswith("whatsapp://"):
+                app = self.launch("WhatsApp")
+                phone = parse_qs(urlparse(url).query).get("phone", [""])[0]
+                if phone:
+                    app.open_phone(phone)
+            elif url and url.startswith("spotify:"):
+                app = self.launch("Spotify")
+                app.events.append({"submit": "search", "text": unquote(url.rsplit(":", 1)[-1])})
+            elif url:
+                profile = None
+                for arg in browser_args or []:
+                    if arg.startswith("--profile-directory="):
+                        profile = arg.split("=", 1)[1]
+                app = ChromeApp(self.profiles, url=url, profile=profile)
+                self.apps.append(app)
+            elif app_name:
+                self.launch(app_name)
+            self._sync_windows()
+        return result
+
+    def launch_direct(self, entry, timeout=15):
+        result = super().launch_direct(entry, timeout)
+        with self._frame_lock:
+            app = self.launch(entry["name"])
+            result["window"] = app.title
+        return result
+
+    def wait_for_window(self, title=None, timeout=10, class_name=None, foreground=False,
+                        focus=True, min_score=80, new_since=None, fallback_wait=1.0):
+        with self._frame_lock:
+            candidates = [app for app in self.apps
+                          if (not class_name or app.class_name == class_name)
+                          and (not foreground or app is self.apps[-1])]
+            if title:
+                ranked = score_titles(normalize_title(title), [normalize_title(a.title) for a in candidates],
+                                      limit=1, min_score=min_score)
+                candidates = [candidates[ranked[0][1]]] if ranked else []
+            if not candidates:
+                self.record("WAIT_FOR_WINDOW", timeout, title=title or class_name, found=False)
+                return {"success": False, "window": None, "seconds": timeout,
+                        "error": f"Window like '{title or class_name}' did not appear within {timeout}s"}
+            app = candidates[-1]
+            if focus:
+                self.bring_to_front(app)
+        self.record("WAIT_FOR_WINDOW", 0.0, title=title or class_name, window=app.title, found=True)
+        return {"success": True, "window": app.title, "seconds": 0.0}
+
+    def focus_window_by_title(self, title):
+        result = self.wait_for_window(title, timeout=0)
+        self.record("FOCUS_WINDOW", self.costs["FOCUS_WINDOW"], title=title, window=result.get("window"))
+        return {"success": True} if result["success"] else {"success": False, "error": result["error"]}
+
+    # ---------- Rendering ----------
+    def frame_elements(self):
+        """Ground-truth elements of the current frame (foreground window plus Start overlay) in screen coordinates"""
+        with self._frame_lock:
+            elements = []
+            if self.apps:
+                app = self.apps[-1]
+                elements.append(_element("title", app.title, 0, 0, SCREEN_WIDTH, TITLE_BAR))
+                elements += app.elements()
+            if self.start_menu is not None:
+                elements += self.start_menu.elements()
+            return elements
+
+    def render(self):
+        """(PIL image or None without Pillow, elements) of the current frame"""
+        elements = self.frame_elements()
+        try:
+            from PIL import Image, ImageDraw
+            from benchmarks.synthetic_screens import load_font
+        except ImportError:
+            return None, elements
+        if self._font is None:
+            self._font = load_font(16)
+        font = self._font
+        image = Image.new("RGB", (SCREEN_WIDTH, SCREEN_HEIGHT), (236, 239, 244))
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([0, SCREEN_HEIGHT - TASKBAR, SCREEN_WIDTH, SCREEN_HEIGHT], fill=(32, 32, 40))
+        for element in elements:
+            x1, y1, x2, y2 = element["bbox"]
+            if element["key"] == "title":
+                draw.rectangle([x1, y1, x2, y2], fill=(255, 255, 255))
+            elif element["type"] == "clickable":
+                draw.rectangle([x1, y1, x2, y2], fill=(255, 255, 255), outline=(120, 130, 150), width=2)
+            draw.text((x1 + 10, (y1 + y2) // 2 - 9), element["label"], fill=(20, 20, 20), font=font)
+        return image, elements
+
+
+class SimulatedScreens:
+    """Capture backend: renders the simulator's current frame"""
+
+    def __init__(self, desktop, keep_frames=16, frame_dir=None):
+        self.desktop = desktop
+        self._owns_frame_dir = frame_dir is None
+        self.frame_dir = frame_dir or tempfile.mkdtemp(prefix="eva_sim_")
+        self.frames = OrderedDict()  # path -> elements at capture time
+        self.keep_frames = keep_frames
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _store(self, image, elements):
+        with self._lock:
+            self._counter += 1
+            path = os.path.join(self.frame_dir, f"frame_{self._counter:06d}.png")
+            self.frames[path] = elements
+            while len(self.frames) > self.keep_frames:
+                old, _ = self.frames.popitem(last=False)
+                if os.path.exists(old):
+                    os.remove(old)
+        if image is not None:
+            image.save(path)
+        return path
+
+    def elements_for(self, screenshot_path):
+        return self.frames.get(screenshot_path) or self.desktop.frame_elements()
+
+    def close(self):
+        """Delete the stored frames (and the frame directory when it was created here)"""
+        with self._lock:
+            for path in self.frames:
+                if os.path.exists(path):
+                    os.remove(path)
+            self.frames.clear()
+        if self._owns_frame_dir:
+            shutil.rmtree(self.frame_dir, ignore_errors=True)
+
+    def capture(self, monitor_number=1):
+        self.desktop.record("CAPTURE", self.desktop.costs["CAPTURE"])
+        image, elements = self.desktop.render()
+        return self._store(image, elements)
+
+    def grab(self):
+        image, _ = self.desktop.render()
+        return image
+
+    def save(self, image):
+        return self._store(image, self.desktop.frame_elements())
+
+    def capture_region(self, left, top, width, height):
+        image, _ = self.desktop.render()
+        return image.crop((left, top, left + width, top + height)) if image is not None else None
+
+
+class SimulatedParser:
+    """OmniParser stand-in returning the ground-truth elements of a captured frame"""
+
+    def __init__(self, screens, parse_cost=None):
+        self.screens = screens
+        self.parse_cost = DEFAULT_COSTS["PARSE"] if parse_cost is None else parse_cost
+
+    def prefetch(self):
+        pass
+
+    def parse_screen(self, screenshot_path, user_command, track=True):
+        self.screens.desktop.record("PARSE", self.parse_cost, screen=str(screenshot_path))
+        elements = [dict({k: v for k, v in e.items() if k != "key"}, id=i)
+                    for i, e in enumerate(self.screens.elements_for(screenshot_path))]
+        return {"elements": elements, "changes": None}
+
+    def locate(self, image, target, roi=None, **kwargs):
+        return None
@@ -0,0 +1,261 @@
+"""
+Dry-Run Executor - headless executor backend for benchmarks and load tests
+Records every action with wall-clock and simulated timestamps instead of
+sending input, charges each action a typical desktop cost (optionally sleeping
+for a scaled fraction of it) and serves canned screens to the vision steps, so
+planning and dispatch overhead can be measured on a Linux CI box.
+"""
+
+import logging
+import threading
+import time
+from difflib import SequenceMatcher
+
+from execution.executor_backend import ExecutorBackend
+from execution.window_registry import normalize_title, score_titles
+
+logger = logging.getLogger("DryRunExecutor")
+
+# Typical desktop cost (seconds) charged per recorded action
+DEFAULT_COSTS = {
+    "PRESS_KEY": 0.015,
+    "TYPE_TEXT": 0.01,          # plus TYPE_TEXT_PER_CHAR per character
+    "TYPE_TEXT_PER_CHAR": 0.002,
+    "MOUSE_CLICK": 0.05,
+    "MOUSE_SCROLL": 0.02,
+    "LAUNCH_APP": 1.5,          # Start-menu launch
+    "LAUNCH_DIRECT": 0.8,
+    "OPEN_URL": 0.6,
+    "WINDOW_APPEAR": 0.4,       # window that was not open yet
+    "FOCUS_WINDOW": 0.05,
+    "SYSTEM_ACTION": 0.1,
+    "CAPTURE": 0.03,
+    "PARSE": 0.9,
+}
+
+SCREEN_SIZE = (1920, 1080)
+
+
+def element(label, x, y, width=160, height=32, element_type="text"):
+    """Parsed-element dict in the shape OmniParserExecutor returns"""
+    left, top = x - width // 2, y - height // 2
+    return {"label": label, "type": element_type, "x": x, "y": y,
+            "bbox": [left, top, left + width, top + height]}
+
+
+DEFAULT_SCREEN = [
+    element("Search", 960, 120, 600, 40, "icon"),
+    element("First result", 700, 320, 800, 60),
+    element("Send", 1820, 1010, 80, 40, "icon"),
+    element("Default", 760, 540, 140, 160, "icon"),
+    element("Work", 960, 540, 140, 160, "icon"),
+    element("Personal", 1160, 540, 140, 160, "icon"),
+]
+
+
+class DryRunExecutor(ExecutorBackend):
+    """Records actions and simulates their cost; windows 'open' when launched or waited for"""
+
+    name = "dry_run"
+
+    def __init__(self, time_scale=0.0, costs=None, auto_windows=True, windows=None):
+        """
+        Args:
+            time_scale: Fraction of the simulated cost actually slept (0 = as fast as possible, 1 = real time)
+            costs: Overrides for DEFAULT_COSTS
+            auto_windows: wait_for_window succeeds for windows that were never launched
+                (e.g. opened through Start-menu keystrokes); False makes those waits fail
+            windows: Titles already open when the run starts
+        """
+        self.time_scale = time_scale
+        self.costs = dict(DEFAULT_COSTS, **(costs or {}))
+        self.auto_windows = auto_windows
+        self.windows = list(windows or ["Desktop"])
+        self.foreground = self.windows[-1]
+        self.actions = []
+        self.clock = 0.0  # simulated seconds since the run started
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    # ---------- Recording ----------
+    def record(self, action, cost=0.0, **details):
+        """Log one action, advance the simulated clock and sleep time_scale * cost"""
+        with self._lock:
+            self.clock += cost
+            entry = {"t": time.perf_counter() - self._started, "sim_t": self.clock,
+                     "action": action, "cost": cost, **details}
+            self.actions.append(entry)
+        if self.time_scale > 0 and cost > 0:
+            time.sleep(cost * self.time_scale)
+        return entry
+
+    def reset(self):
+        with self._lock:
+            self.actions = []
+            self.clock = 0.0
+            self._started = time.perf_counter()
+
+    def summary(self):
+        """{action: {'count', 'simulated_s'}} plus totals"""
+        with self._lock:
+            actions = list(self.actions)
+            clock = self.clock
+        by_action = {}
+        for entry in actions:
+            stats = by_action.setdefault(entry["action"], {"count": 0, "simulated_s": 0.0})
+            stats["count"] += 1
+            stats["simulated_s"] += entry["cost"]
+        return {"actions": len(actions), "simulated_s": clock, "by_action": by_action}
+
+    def latency_stats(self):
+        return {action: {"count": s["count"], "mean_ms": 1000 * s["simulated_s"] / s["count"]}
+                for action, s in self.summary()["by_action"].items()}
+
+    # ---------- Windows ----------
+    def _open_window(self, title):
+        with self._lock:
+            if title not in self.windows:
+                self.windows.append(title)
+            self.foreground = title
+
+    def _match_window(self, title, min_score):
+        with self._lock:
+            windows = list(self.windows)
+        ranked = score_titles(normalize_title(title), [normalize_title(w) for w in windows],
+                              limit=1, min_score=min_score)
+        return windows[ranked[0][1]] if ranked else None
+
+    # ---------- ExecutorBackend ----------
+    def execute_action(self, action_type, coordinates, parameters):
+        if action_type == "TYPE_TEXT":
+            text = parameters.get("text", "")
+            cost = self.costs["TYPE_TEXT"] + self.costs["TYPE_TEXT_PER_CHAR"] * len(text)
+            self.record(action_type, cost, text=text)
+        elif action_type == "PRESS_KEY":
+            self.record(action_type, self.costs["PRESS_KEY"], key=parameters.get("key", ""))
+        elif action_type in ("MOUSE_CLICK", "MOUSE_SCROLL"):
+            self.record(action_type, self.costs[action_type], coordinates=dict(coordinates), **parameters)
+        else:
+            return {"success": False, "error": f"Unknown action: {action_type}"}
+        return {"success": True}
+
+    def launch_application(self, app_name=None, url=None, browser=None, browser_args=None):
+        if url:
+            self.record("OPEN_URL", self.costs["OPEN_URL"], url=url, browser=browser, browser_args=browser_args)
+            self._open_window("Google Chrome" if browser or url.startswith("http") else url.split(":", 1)[0])
+        elif app_name:
+            self.record("LAUNCH_APP", self.costs["LAUNCH_APP"], app_name=app_name)
+            self._open_window(app_name)
+        else:
+            return {"success": False, "error": "No application name or URL provided"}
+        return {"success": True}
+
+    def launch_direct(self, entry, timeout=15):
+        cost = self.costs["LAUNCH_DIRECT"]
+        self.record("LAUNCH_DIRECT", cost, app_name=entry["name"], target=entry.get("target"))
+        title = entry.get("window_hint") or entry["name"]
+        self._open_window(title)
+        return {"success": True, "spawned": True, "window": title, "seconds": cost}
+
+    def wait_for_window(self, title=None, timeout=10, class_name=None, foreground=False,
+                        focus=True, min_score=80, new_since=None, fallback_wait=1.0):
+        hint = title or class_name or self.foreground
+        match = self._match_window(hint, min_score)
+        if match is None and self.auto_windows:
+            self.record("WINDOW_APPEAR", self.costs["WINDOW_APPEAR"], title=hint)
+            self._open_window(hint)
+            match = hint
+        if match is None:
+            self.record("WAIT_FOR_WINDOW", timeout, title=hint, found=False)
+            return {"success": False, "window": None, "seconds": timeout,
+                    "error": f"Window like '{hint}' did not appear within {timeout}s"}
+        if focus:
+            self._open_window(match)
+        self.record("WAIT_FOR_WINDOW", 0.0, title=hint, window=match, found=True)
+        return {"success": True, "window": match, "seconds": 0.0}
+
+    def focus_window_by_title(self, title):
+        match = self._match_window(title, 80)
+        self.record("FOCUS_WINDOW", self.costs["FOCUS_WINDOW"], title=title, window=match)
+        if match is None:
+            return {"success": False, "error": f"Window with title like '{title}' not found."}
+        self._open_window(match)
+        return {"success": True}
+
+    def screen_size(self):
+        return SCREEN_SIZE
+
+    def sleep(self, seconds):
+        self.record("WAIT", seconds)
+
+
+class DryRunSystemExecutor:
+    """SystemExecutor stand-in: records system actions instead of calling Windows tools"""
+
+    def __init__(self, executor):
+        self.executor = executor
+
+    def execute_system_command(self, action):
+        self.executor.record("SYSTEM_ACTION", self.executor.costs["SYSTEM_ACTION"], system_action=action)
+        return {"success": True, "message": f"Dry run: {action}"}
+
+
+class CannedScreens:
+    """ScreenshotHandler stand-in: 'captures' name the foreground window instead of holding pixels"""
+
+    def __init__(self, executor, screens=None):
+        """
+        Args:
+            executor: DryRunExecutor whose foreground window selects the screen
+            screens: {window title: [element, ...]}; other windows get DEFAULT_SCREEN
+        """
+        self.executor = executor
+        self.screens = {normalize_title(title): elements for title, elements in (screens or {}).items()}
+
+    def elements_for(self, screenshot_path):
+        title = normalize_title(str(screenshot_path).split("://", 1)[-1])
+        return self.screens.get(title, DEFAULT_SCREEN)
+
+    def capture(self, monitor_number=1):
+        self.executor.record("CAPTURE", self.executor.costs["CAPTURE"])
+        return f"canned://{self.executor.foreground}"
+
+    def grab(self):
+        return None  # no pixels: text-locate and layout-memory fast paths are skipped
+
+    def save(self, image):
+        return self.capture()
+
+    def capture_region(self, left, top, width, height):
+        return None
+
+
+class CannedParser:
+    """OmniParserExecutor stand-in returning the canned elements for a capture"""
+
+    def __init__(self, screens):
+        self.screens = screens
+
+    def prefetch(self):
+        pass
+
+    def parse_screen(self, screenshot_path, user_command, track=True):
+        self.screens.executor.record("PARSE", self.screens.executor.costs["PARSE"], screen=str(screenshot_path))
+        elements = [dict(e, id=i) for i, e in enumerate(self.screens.elements_for(screenshot_path))]
+        return {"elements": elements, "changes": None}
+
+    def locate(self, image, target, roi=None, **kwargs):
+        return None
+
+
+class CannedSelector:
+    """ScreenAnalyzer stand-in: picks the element whose label best matches the target"""
+
+    def select_coordinate(self, elements, target_label, step_context, profile_name=None):
+        if not elements:
+            return None
+        params = (step_context or {}).get("parameters", {})
+        # profile_name comes with every step of a profile command; only profile-selection steps target it
+        wanted = (params.get("target") or ("profile_name" in params and profile_name) or target_label).lower()
+        best = max(elements, key=lambda e: SequenceMatcher(None, wanted, e.get("label", "").lower()).ratio())
+        return best["x"], best["y"]
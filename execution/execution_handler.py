@@ -13,6 +13,8 @@ class ExecutionHandler:
         self.executor_bridge = ExecutorBridge()
         self.omniparser_executor = OmniParserExecutor()
         self.screenshot_handler = ScreenshotHandler()
+        if not config.GEMINI_API_KEY:
+            raise ValueError(config.GEMINI_API_KEY_MISSING)
         genai.configure(api_key=config.GEMINI_API_KEY)
 
     def execute_steps(self, steps):
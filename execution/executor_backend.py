@@ -0,0 +1,84 @@
+"""
+Executor Backend - the operations ActionRouter needs from an executor
+ExecutorBridge drives the real desktop through the C library; DryRunExecutor
+(execution/dry_run_executor.py) records actions and simulates their cost so
+the pipeline can run headless, and DesktopSimulator (execution/desktop_simulator.py)
+also renders simulated app windows that react to those actions. create_executor()
+picks one from config.
+"""
+
+import logging
+import time
+
+logger = logging.getLogger("ExecutorBackend")
+
+BACKENDS = ("native", "dry_run", "simulator")
+
+
+class ExecutorBackend:
+    """Interface implemented by ExecutorBridge and DryRunExecutor"""
+
+    name = "base"
+
+    def execute_action(self, action_type, coordinates, parameters):
+        """MOUSE_CLICK / TYPE_TEXT / PRESS_KEY / MOUSE_SCROLL -> {'success', ...}"""
+        raise NotImplementedError
+
+    def launch_application(self, app_name=None, url=None, browser=None, browser_args=None):
+        raise NotImplementedError
+
+    def launch_direct(self, entry, timeout=15):
+        """Spawn an indexed app and wait for its window -> {'success', 'spawned', 'window', 'seconds'}"""
+        raise NotImplementedError
+
+    def wait_for_window(self, title=None, timeout=10, class_name=None, foreground=False,
+                        focus=True, min_score=80, new_since=None, fallback_wait=1.0):
+        """-> {'success', 'window', 'seconds'}"""
+        raise NotImplementedError
+
+    def focus_window_by_title(self, title):
+        raise NotImplementedError
+
+    def screen_size(self):
+        """(width, height) of the primary screen"""
+        raise NotImplementedError
+
+    def sleep(self, seconds):
+        """Plan waits go through the backend so a dry run can simulate them"""
+        time.sleep(seconds)
+
+    def latency_stats(self):
+        return {}
+
+
+def create_executor(backend=None):
+    """
+    Build the execution stack for a backend name (default: config.EXECUTOR_BACKEND).
+
+    Returns:
+        (executor, system_executor, screenshot_handler)
+    """
+    import config
+    backend = backend or config.EXECUTOR_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown executor backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+
+    if backend == "dry_run":
+        from execution.dry_run_executor import CannedScreens, DryRunExecutor, DryRunSystemExecutor
+        executor = DryRunExecutor(time_scale=config.DRY_RUN_TIME_SCALE)
+        logger.info("✓ Using the dry-run executor (no real input is sent)")
+        return executor, DryRunSystemExecutor(executor), CannedScreens(executor)
+
+    if backend == "simulator":
+        from execution.desktop_simulator import DEFAULT_CONTACTS, DesktopSimulator, SimulatedScreens
+        from execution.dry_run_executor import DryRunSystemExecutor
+        contacts = dict(DEFAULT_CONTACTS, **{name.title(): phone for name, phone in config.CONTACT_PHONE_NUMBERS.items()})
+        executor = DesktopSimulator(time_scale=config.DRY_RUN_TIME_SCALE, contacts=contacts)
+        logger.info("✓ Using the desktop simulator (no real input is sent)")
+        return executor, DryRunSystemExecutor(executor), SimulatedScreens(executor)
+
+    from execution.executor_bridge import ExecutorBridge
+    from execution.system_executor import SystemExecutor
+    from vision.screenshot_handler import ScreenshotHandler
+    executor = ExecutorBridge()
+    return executor, SystemExecutor(executor), ScreenshotHandler()
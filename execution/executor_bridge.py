@@ -6,25 +6,117 @@ Bridges Python to C executors with full function support
 import ctypes
 import os
 import platform
+import threading
+import time
 from pathlib import Path
 from utils.logger import setup_logger
-import pygetwindow as gw
 import subprocess
+from execution.executor_backend import ExecutorBackend
+from execution.text_injector import TextInjector
+from execution.window_registry import get_window_registry
+from execution.window_watcher import get_window_watcher
 
+# Event types for send_input_batch (keep in sync with c_executors/executor.h)
+EV_KEY_DOWN = 0
+EV_KEY_UP = 1
+EV_UNICODE_DOWN = 2
+EV_UNICODE_UP = 3
+EV_MOUSE_MOVE = 4
+EV_MOUSE_DOWN = 5
+EV_MOUSE_UP = 6
+EV_MOUSE_SCROLL = 7
 
-class ExecutorBridge:
+KEY_HOLD_MS = 10  # between the presses and releases of a combo
+CLICK_HOLD_MS = 30  # between mouse down and up
+MOVE_SETTLE_MS = 15  # after moving the cursor, before clicking
+
+KEY_CODES = {
+    'enter': 0x0D,
+    'tab': 0x09,
+    'escape': 0x1B,
+    'space': 0x20,
+    'backspace': 0x08,
+    'delete': 0x2E,
+    'win': 0x5B,
+    'ctrl': 0x11,
+    'alt': 0x12,
+    'shift': 0x10,
+    'up': 0x26,
+    'down': 0x28,
+    'left': 0x25,
+    'right': 0x27,
+    'home': 0x24,
+    'end': 0x23,
+    'pageup': 0x21,
+    'pagedown': 0x22,
+    '/': 0xBF,
+    **{f'f{n}': 0x6F + n for n in range(1, 13)},
+    **{chr(c): c - 0x20 for c in range(ord('a'), ord('z') + 1)},
+    **{str(d): 0x30 + d for d in range(10)},
+}
+
+
+class InputEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("code", ctypes.c_int),
+        ("x", ctypes.c_int),
+        ("y", ctypes.c_int),
+        ("delay_ms", ctypes.c_int),
+    ]
+
+
+def key_combo_events(key_str, hold_ms=KEY_HOLD_MS):
+    """'ctrl+shift+t' -> press all, hold, release in reverse order"""
+    codes = [KEY_CODES.get(k.strip().lower(), 0x00) for k in key_str.split('+')]
+    codes = [code for code in codes if code != 0x00]
+    if not codes:
+        return []
+    events = [(EV_KEY_DOWN, code, 0, 0, 0) for code in codes]
+    events[-1] = (EV_KEY_DOWN, codes[-1], 0, 0, hold_ms)
+    events += [(EV_KEY_UP, code, 0, 0, 0) for code in reversed(codes)]
+    return events
+
+
+def text_events(text, delay_ms=0):
+    """Unicode key down/up per UTF-16 code unit (so characters outside the BMP arrive as surrogate pairs)"""
+    data = text.encode('utf-16-le')
+    events = []
+    for i in range(0, len(data), 2):
+        unit = data[i] | (data[i + 1] << 8)
+        events.append((EV_UNICODE_DOWN, unit, 0, 0, 0))
+        events.append((EV_UNICODE_UP, unit, 0, 0, delay_ms))
+    return events
+
+
+def click_events(x, y, button=0, hold_ms=CLICK_HOLD_MS, settle_ms=MOVE_SETTLE_MS):
+    return [
+        (EV_MOUSE_MOVE, 0, x, y, settle_ms),
+        (EV_MOUSE_DOWN, button, 0, 0, hold_ms),
+        (EV_MOUSE_UP, button, 0, 0, 0),
+    ]
+
+
+class ExecutorBridge(ExecutorBackend):
     """Bridge between Python and C executors"""
+
+    name = "native"
     
     def __init__(self):
         self.logger = setup_logger('ExecutorBridge')
         self.system_platform = platform.system()
         self.c_lib = None
+        self.batch_supported = False
+        self.latency = {}  # action -> {'count', 'total_ms', 'max_ms', 'last_ms'}
+        self._latency_lock = threading.Lock()
         
         # Load C library
         try:
             lib_path = self._get_library_path()
             self.c_lib = ctypes.CDLL(lib_path)
             self._setup_functions()
+            self.text_injector = TextInjector(type_text=lambda text: self.send_events(text_events(text)),
+                                              press_keys=self._press_key_combination)
             self.logger.info("C executor library loaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to load C library: {e}")
@@ -69,11 +161,85 @@ class ExecutorBridge:
         
         self.c_lib.keyboard_type_string.argtypes = [ctypes.c_char_p]
         self.c_lib.keyboard_type_string.restype = ctypes.c_int
+
+        # Batched input (libraries built before it existed fall back to per-event calls)
+        if hasattr(self.c_lib, 'send_input_batch'):
+            self.c_lib.send_input_batch.argtypes = [ctypes.POINTER(InputEvent), ctypes.c_int]
+            self.c_lib.send_input_batch.restype = ctypes.c_int
+            self.batch_supported = True
+        else:
+            self.logger.warning("send_input_batch not in the C library (rebuild c_executors) - using per-event calls")
+
+    def send_events(self, events):
+        """
+        Submit (type, code, x, y, delay_ms) events in one native call.
+
+        Returns:
+            {'success', 'sent'}
+        """
+        if not events:
+            return {'success': True, 'sent': 0}
+        if self.batch_supported:
+            array = (InputEvent * len(events))(*events)
+            sent = self.c_lib.send_input_batch(array, len(events))
+            return {'success': sent >= 0, 'sent': sent}
+
+        sent = 0
+        for ev_type, code, x, y, delay_ms in events:
+            if ev_type == EV_KEY_DOWN:
+                self.c_lib.keyboard_press_key(code)
+            elif ev_type == EV_KEY_UP:
+                self.c_lib.keyboard_release_key(code)
+            elif ev_type == EV_UNICODE_DOWN:
+                if code < 0x80:
+                    self.c_lib.keyboard_type_string(bytes([code]))  # sends down and up
+            elif ev_type == EV_MOUSE_MOVE:
+                self.c_lib.mouse_move(x, y)
+            elif ev_type == EV_MOUSE_DOWN:
+                self.c_lib.mouse_click(code)  # sends down and up
+            elif ev_type == EV_MOUSE_SCROLL:
+                self.c_lib.mouse_scroll(code)
+            sent += 1
+            if delay_ms:
+                time.sleep(delay_ms / 1000)
+        return {'success': True, 'sent': sent}
+
+    def screen_size(self):
+        """(width, height) of the primary screen"""
+        if self.system_platform == 'Windows':
+            user32 = ctypes.windll.user32
+            return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)  # SM_CXSCREEN, SM_CYSCREEN
+        import pyautogui
+        return tuple(pyautogui.size())
+
+    def _record_latency(self, action, start):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._latency_lock:
+            stats = self.latency.setdefault(action, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0})
+            stats['count'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['last_ms'] = elapsed_ms
+        self.logger.debug(f"{action} took {elapsed_ms:.1f}ms")
+
+    def latency_stats(self):
+        """{action: {'count', 'mean_ms', 'max_ms', 'last_ms'}} for the input actions sent so far"""
+        with self._latency_lock:
+            return {
+                action: {'count': s['count'], 'mean_ms': s['total_ms'] / s['count'],
+                         'max_ms': s['max_ms'], 'last_ms': s['last_ms']}
+                for action, s in self.latency.items()
+            }
     
-    def launch_application(self, app_name=None, url=None):
-        """Launch application or open URL"""
+    def launch_application(self, app_name=None, url=None, browser=None, browser_args=None):
+        """Launch application or open URL (in a specific browser binary when given)"""
         try:
-            if url:
+            if url and browser:
+                self.logger.info(f"Opening URL: {url} with {os.path.basename(browser)} {' '.join(browser_args or [])}")
+                subprocess.Popen([browser, *(browser_args or []), url],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                return {'success': True}
+            elif url:
                 self.logger.info(f"Opening URL: {url}")
                 if self.system_platform == 'Windows':
                     os.startfile(url)
@@ -82,18 +248,13 @@ class ExecutorBridge:
                 return {'success': True}
             elif app_name:
                 self.logger.info(f"Launching application: {app_name}")
-                # Press Windows key
-                self.c_lib.keyboard_press_key(0x5B)  # VK_LWIN
-                import time
-                time.sleep(0.5)
-                
-                # Type app name
-                app_bytes = app_name.encode('utf-8')
-                self.c_lib.keyboard_type_string(app_bytes)
-                time.sleep(0.5)
-                
-                # Press Enter
-                self.c_lib.keyboard_press_key(0x0D)  # VK_RETURN
+                # Win, type the name into Start search, Enter
+                events = key_combo_events('win')
+                events[-1] = events[-1][:4] + (500,)
+                events += text_events(app_name)
+                events[-1] = events[-1][:4] + (500,)
+                events += key_combo_events('enter')
+                self.send_events(events)
                 
                 return {'success': True}
             else:
@@ -102,24 +263,82 @@ class ExecutorBridge:
             self.logger.error(f"Launch error: {e}")
             return {'success': False, 'error': str(e)}
     
+    def launch_direct(self, entry, timeout=15):
+        """
+        Spawn an indexed application (see execution/app_index.py) and wait for its window.
+
+        Returns:
+            {'success', 'spawned', 'window', 'seconds'} - spawned without a window means the
+            process started but nothing matching appeared before the timeout
+        """
+        start = time.perf_counter()
+        watcher = get_window_watcher()
+        before = watcher.snapshot()
+        try:
+            self.logger.info(f"Launching {entry['name']} directly ({entry['kind']}: {entry['target']})")
+            if entry.get('argv'):
+                popen_args = {'cwd': os.path.expanduser('~'), 'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+                if self.system_platform == 'Windows':
+                    popen_args['creationflags'] = subprocess.DETACHED_PROCESS
+                else:
+                    popen_args['start_new_session'] = True
+                subprocess.Popen(entry['argv'], **popen_args)
+            elif self.system_platform == 'Windows':
+                os.startfile(entry['target'])
+            else:
+                subprocess.Popen(['xdg-open', entry['target']])
+        except Exception as e:
+            self.logger.error(f"Direct launch of {entry['name']} failed: {e}")
+            return {'success': False, 'spawned': False, 'error': str(e)}
+
+        # A new window titled like the app, or its existing window brought to the front (single-instance apps)
+        result = self.wait_for_window(entry.get('window_hint') or entry['name'], timeout=timeout,
+                                      new_since={w['hwnd'] for w in before} if before is not None else None)
+        result.update(spawned=True, seconds=time.perf_counter() - start)
+        if not result['success']:
+            result['error'] = f"No window for {entry['name']} within {timeout}s"
+        return result
+
+    def wait_for_window(self, title=None, timeout=10, class_name=None, foreground=False,
+                        focus=True, min_score=80, new_since=None, fallback_wait=1.0):
+        """
+        Wait until a window matching title/class_name exists (see execution/window_watcher.py),
+        then focus it. Returns as soon as the window appears instead of after a fixed sleep.
+
+        Returns:
+            {'success', 'window', 'seconds'} - when windows cannot be enumerated on this
+            platform, sleeps fallback_wait and reports success with window None
+        """
+        start = time.perf_counter()
+        watcher = get_window_watcher()
+        window, supported = watcher.wait_for(title=title, class_name=class_name, foreground=foreground,
+                                             timeout=timeout, min_score=min_score, new_since=new_since)
+        if not supported:
+            time.sleep(min(timeout, fallback_wait))
+            return {'success': True, 'window': None, 'seconds': time.perf_counter() - start}
+        seconds = time.perf_counter() - start
+        if window is None:
+            self.logger.warning(f"No window like '{title or class_name}' within {timeout}s")
+            return {'success': False, 'window': None, 'seconds': seconds,
+                    'error': f"Window like '{title or class_name}' did not appear within {timeout}s"}
+        self.logger.info(f"Window '{window['title']}' ready after {seconds:.2f}s (score {window['score']:.0f})")
+        if focus and not watcher.focus(window['hwnd']):
+            self.logger.debug(f"Could not bring '{window['title']}' to the foreground")
+        return {'success': True, 'window': window['title'], 'seconds': seconds}
+
     def execute_action(self, action_type, coordinates, parameters):
         """Execute generic action"""
+        start = time.perf_counter()
         try:
             if action_type == 'MOUSE_CLICK':
                 x = coordinates.get('x', 0)
                 y = coordinates.get('y', 0)
-                self.c_lib.mouse_move(x, y)
-                import time
-                time.sleep(0.1)
                 button = 0 if parameters.get('button') == 'left' else 1
-                result = self.c_lib.mouse_click(button)
-                return {'success': result == 0}
+                result = self.send_events(click_events(x, y, button))
             
             elif action_type == 'TYPE_TEXT':
                 text = parameters.get('text', '')
-                text_bytes = text.encode('utf-8')
-                result = self.c_lib.keyboard_type_string(text_bytes)
-                return {'success': result == 0}
+                result = self.text_injector.inject(text)
             
             elif action_type == 'PRESS_KEY':
                 key = parameters.get('key', '')
@@ -127,98 +346,50 @@ class ExecutorBridge:
             
             elif action_type == 'MOUSE_SCROLL':
                 amount = parameters.get('amount', 0)
-                result = self.c_lib.mouse_scroll(amount)
-                return {'success': result == 0}
+                result = self.send_events([(EV_MOUSE_SCROLL, amount, 0, 0, 0)])
             
             else:
                 return {'success': False, 'error': f'Unknown action: {action_type}'}
+            self._record_latency(action_type, start)
+            return result
         
         except Exception as e:
             self.logger.error(f"Action execution error: {e}")
             return {'success': False, 'error': str(e)}
 
     def _press_key_combination(self, key_str):
-        """Press a combination of keys"""
-        keys = [k.strip() for k in key_str.split('+')]
-        vk_codes = [self._key_to_vk(key) for key in keys]
-
-        # Press keys
-        for vk_code in vk_codes:
-            if vk_code != 0x00:
-                self.c_lib.keyboard_press_key(vk_code)
-
-        # Add a small delay
-        import time
-        time.sleep(0.1)
-
-        # Release keys in reverse order
-        for vk_code in reversed(vk_codes):
-            if vk_code != 0x00:
-                self.c_lib.keyboard_release_key(vk_code)
-
-        return {'success': True}
+        """Press a combination of keys (all presses, a short hold, releases in reverse) in one batch"""
+        start = time.perf_counter()
+        events = key_combo_events(key_str)
+        if not events:
+            return {'success': False, 'error': f"Unknown key(s): {key_str}"}
+        result = self.send_events(events)
+        self._record_latency('PRESS_KEY', start)
+        return result
     
     def _key_to_vk(self, key):
         """Convert key string to virtual key code"""
-        key_map = {
-            'enter': 0x0D,
-            'tab': 0x09,
-            'escape': 0x1B,
-            'space': 0x20,
-            'backspace': 0x08,
-            'delete': 0x2E,
-            'win': 0x5B,
-            'ctrl': 0x11,
-            'alt': 0x12,
-            'shift': 0x10,
-            'up': 0x26,
-            'down': 0x28,
-            'left': 0x25,
-            'right': 0x27,
-            'home': 0x24,
-            'end': 0x23,
-            'pageup': 0x21,
-            'pagedown': 0x22,
-            'f1': 0x70, 'f2': 0x71, 'f3': 0x72, 'f4': 0x73, 'f5': 0x74, 'f6': 0x75, 
-            'f7': 0x76, 'f8': 0x77, 'f9': 0x78, 'f10': 0x79, 'f11': 0x7A, 'f12': 0x7B,
-            'a': 0x41, 'b': 0x42, 'c': 0x43, 'd': 0x44, 'e': 0x45, 'f': 0x46, 'g': 0x47, 'h': 0x48, 'i': 0x49, 
-            'j': 0x4A, 'k': 0x4B, 'l': 0x4C, 'm': 0x4D, 'n': 0x4E, 'o': 0x4F, 'p': 0x50, 'q': 0x51, 'r': 0x52, 
-            's': 0x53, 't': 0x54, 'u': 0x55, 'v': 0x56, 'w': 0x57, 'x': 0x58, 'y': 0x59, 'z': 0x5A,
-            '0': 0x30, '1': 0x31, '2': 0x32, '3': 0x33, '4': 0x34, '5': 0x35, '6': 0x36, '7': 0x37, '8': 0x38, '9': 0x39,
-            '/': 0xBF,
-        }
-        return key_map.get(key.lower(), 0x00)
+        return KEY_CODES.get(key.lower(), 0x00)
 
     def focus_window_by_title(self, title):
-        """Focus a window by its title using fuzzy matching"""
+        """Focus a window by its title using fuzzy matching (see execution/window_registry.py)"""
         try:
-            from thefuzz import fuzz
-
             self.logger.info(f"Attempting to focus window with title: {title}")
-            windows = gw.getAllWindows()
-            
-            if not windows:
+            registry = get_window_registry()
+            ranked = registry.top(title, k=1)
+
+            if not ranked:
                 self.logger.warning("No open windows found.")
                 return {'success': False, 'error': "No open windows found."}
 
-            best_match = None
-            highest_score = 0
-
-            for window in windows:
-                score = fuzz.partial_ratio(title.lower(), window.title.lower())
-                if score > highest_score:
-                    highest_score = score
-                    best_match = window
-
-            if best_match and highest_score > 80:
-                self.logger.info(f"Best match: '{best_match.title}' with score {highest_score}")
-                if best_match.isMinimized:
-                    best_match.restore()
-                best_match.activate()
-                self.logger.info(f"Successfully focused window: {best_match.title}")
+            highest_score, best_match = ranked[0]
+            if highest_score > 80:
+                self.logger.info(f"Best match: '{best_match['title']}' with score {highest_score:.0f}")
+                registry.watcher.focus(best_match['hwnd'])
+                self.logger.info(f"Successfully focused window: {best_match['title']}")
                 return {'success': True}
             else:
-                self.logger.warning(f"No suitable window found for title '{title}'. Best match: '{best_match.title if best_match else 'None'}' with score {highest_score}")
+                self.logger.warning(f"No suitable window found for title '{title}'. Best match: '{best_match['title']}' with score {highest_score:.0f}")
                 return {'success': False, 'error': f"Window with title like '{title}' not found."}
         except Exception as e:
             self.logger.error(f"Failed to focus window: {e}")
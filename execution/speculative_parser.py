@@ -0,0 +1,106 @@
+"""
+Speculative Parser - overlaps screen capture + parse with idle WAIT steps
+Starts parsing shortly before a WAIT that precedes a vision step ends and
+hands the result to the vision step if the screen has not changed since.
+Speculative parses skip the element tracker; only an accepted result is
+tracked, so dropped runs never shift the click-effect baseline.
+"""
+
+import logging
+import threading
+import time
+
+import config
+from vision.screenshot_handler import frame_signature, frames_differ
+
+logger = logging.getLogger("SpeculativeParser")
+
+
+class SpeculativeParser:
+    """Background capture + parse whose result is reused when the frame is unchanged"""
+
+    def __init__(self, screenshot_handler, omniparser, default_lead=None, change_tolerance=None):
+        self.screenshot_handler = screenshot_handler
+        self.omniparser = omniparser
+        self.avg_parse_seconds = default_lead if default_lead is not None else config.SPECULATIVE_PARSE_DEFAULT_LEAD
+        self.change_tolerance = change_tolerance if change_tolerance is not None else config.FRAME_CHANGE_TOLERANCE
+
+        self._thread = None
+        self._thread_generation = 0
+        self._result = None  # (screenshot_path, parse_result, signature)
+        self._generation = 0  # bumps on start/cancel so late results from dropped runs are ignored
+        self._lock = threading.Lock()
+
+    @property
+    def lead_time(self):
+        """How long before a WAIT ends the speculative parse should start"""
+        return self.avg_parse_seconds
+
+    def record_parse_time(self, seconds):
+        """Update the parse-duration estimate (EMA) used to schedule speculation"""
+        self.avg_parse_seconds = 0.7 * self.avg_parse_seconds + 0.3 * seconds
+
+    def start(self, raw_command):
+        """Begin capture + parse in the background (no-op while a run, even a cancelled one, is still parsing)"""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            self._result = None
+            self._generation += 1
+            generation = self._generation
+        self._thread_generation = generation
+        self._thread = threading.Thread(target=self._work, args=(raw_command, generation), daemon=True)
+        self._thread.start()
+        logger.info("⚡ Speculative parse started")
+
+    def _work(self, raw_command, generation):
+        try:
+            image = self.screenshot_handler.grab()
+            if image is None:
+                return
+            signature = frame_signature(image)
+            screenshot_path = self.screenshot_handler.save(image)
+
+            start = time.perf_counter()
+            parse_result = self.omniparser.parse_screen(screenshot_path, raw_command, track=False)
+            self.record_parse_time(time.perf_counter() - start)
+
+            with self._lock:
+                if generation == self._generation:
+                    self._result = (screenshot_path, parse_result, signature)
+        except Exception as e:
+            logger.warning(f"Speculative parse failed: {e}")
+
+    def take(self):
+        """
+        Collect the speculative result if it still matches the screen.
+
+        Returns:
+            (screenshot_path, parse_result) or None if absent/stale (caller parses synchronously)
+        """
+        if not self._thread or self._thread_generation != self._generation:
+            return None  # nothing started, or the run was cancelled (don't wait for it)
+        self._thread.join()
+
+        with self._lock:
+            result, self._result = self._result, None
+        if not result:
+            return None
+
+        screenshot_path, parse_result, signature = result
+        current = self.screenshot_handler.grab()
+        if current is None or frames_differ(signature, frame_signature(current), self.change_tolerance):
+            logger.info("Speculative parse discarded - frame changed after capture")
+            return None
+
+        logger.info("⚡ Using speculative parse (frame unchanged)")
+        track = getattr(self.omniparser, "track", None)
+        if track:
+            track(parse_result)
+        return screenshot_path, parse_result
+
+    def cancel(self):
+        """Drop any pending speculative result (a running parse finishes in the background and is discarded)"""
+        with self._lock:
+            self._result = None
+            self._generation += 1
@@ -0,0 +1,234 @@
+"""
+Text Injector - chooses between typing and clipboard paste for TYPE_TEXT
+Short text is typed as Unicode key events. Longer text is put on the clipboard
+and pasted with Ctrl+V; the previous clipboard text is restored afterwards and,
+where the focused control exposes its text (standard edit controls), the paste
+is verified and retyped if it did not land.
+"""
+
+import ctypes
+import logging
+import sys
+import time
+
+import config
+
+logger = logging.getLogger("TextInjector")
+
+CF_UNICODETEXT = 13
+GMEM_MOVEABLE = 0x0002
+WM_GETTEXT = 0x000D
+WM_GETTEXTLENGTH = 0x000E
+SMTO_ABORTIFHUNG = 0x0002
+
+
+def _normalize_newlines(text):
+    """RichEdit controls report line breaks as CR or CRLF"""
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class _GUIThreadInfo(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("hwndActive", ctypes.c_void_p),
+        ("hwndFocus", ctypes.c_void_p),
+        ("hwndCapture", ctypes.c_void_p),
+        ("hwndMenuOwner", ctypes.c_void_p),
+        ("hwndMoveSize", ctypes.c_void_p),
+        ("hwndCaret", ctypes.c_void_p),
+        ("rcCaret", ctypes.c_long * 4),
+    ]
+
+
+class Win32Clipboard:
+    """Unicode text clipboard access through user32/kernel32"""
+
+    def __init__(self):
+        from ctypes import wintypes
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+        self.user32.OpenClipboard.argtypes = [wintypes.HWND]
+        self.user32.GetClipboardData.argtypes = [wintypes.UINT]
+        self.user32.GetClipboardData.restype = wintypes.HANDLE
+        self.user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+        self.user32.SetClipboardData.restype = wintypes.HANDLE
+        self.user32.IsClipboardFormatAvailable.argtypes = [wintypes.UINT]
+        self.user32.GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        self.user32.SendMessageTimeoutW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM,
+                                                    wintypes.UINT, wintypes.UINT, ctypes.POINTER(ctypes.c_size_t)]
+        self.kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+        self.kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+        self.kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+        self.kernel32.GlobalLock.restype = ctypes.c_void_p
+        self.kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+        self.kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+
+    def _open(self, attempts=10):
+        # Another process may hold the clipboard for a moment
+        for _ in range(attempts):
+            if self.user32.OpenClipboard(None):
+                return True
+            time.sleep(0.01)
+        return False
+
+    def read(self):
+        """
+        Returns:
+            (text or None, only_text) - only_text is False when the clipboard holds other
+            formats (images, files) that a text save/restore would lose
+        """
+        if not self._open():
+            raise OSError("Clipboard is busy")
+        try:
+            has_text = bool(self.user32.IsClipboardFormatAvailable(CF_UNICODETEXT))
+            if not has_text:
+                return None, self.user32.CountClipboardFormats() == 0
+            handle = self.user32.GetClipboardData(CF_UNICODETEXT)
+            pointer = self.kernel32.GlobalLock(handle) if handle else None
+            if not pointer:
+                return None, False
+            try:
+                return ctypes.wstring_at(pointer), True
+            finally:
+                self.kernel32.GlobalUnlock(handle)
+        finally:
+            self.user32.CloseClipboard()
+
+    def write(self, text):
+        data = ctypes.create_unicode_buffer(text)
+        size = ctypes.sizeof(data)
+        handle = self.kernel32.GlobalAlloc(GMEM_MOVEABLE, size)
+        if not handle:
+            raise OSError("GlobalAlloc failed")
+        pointer = self.kernel32.GlobalLock(handle)
+        ctypes.memmove(pointer, data, size)
+        self.kernel32.GlobalUnlock(handle)
+        if not self._open():
+            self.kernel32.GlobalFree(handle)
+            raise OSError("Clipboard is busy")
+        try:
+            self.user32.EmptyClipboard()
+            if not self.user32.SetClipboardData(CF_UNICODETEXT, handle):
+                self.kernel32.GlobalFree(handle)  # ownership only passes on success
+                raise OSError("SetClipboardData failed")
+        finally:
+            self.user32.CloseClipboard()
+
+    def clear(self):
+        if self._open():
+            try:
+                self.user32.EmptyClipboard()
+            finally:
+                self.user32.CloseClipboard()
+
+    def focused_text(self):
+        """Text of the focused edit control in the foreground window, or None if focus is not an edit control"""
+        info = _GUIThreadInfo(cbSize=ctypes.sizeof(_GUIThreadInfo))
+        if not self.user32.GetGUIThreadInfo(0, ctypes.byref(info)) or not info.hwndFocus:
+            return None
+        class_name = ctypes.create_unicode_buffer(256)
+        if not self.user32.GetClassNameW(info.hwndFocus, class_name, 256):
+            return None
+        # Only Edit / RichEdit* return the typed text; Chrome and WebView2 hosts return a fixed window name
+        name = class_name.value.lower()
+        if name != "edit" and not name.startswith("richedit"):  # RichEdit20W, RICHEDIT50W, ...
+            return None
+        length = ctypes.c_size_t()
+        if not self.user32.SendMessageTimeoutW(info.hwndFocus, WM_GETTEXTLENGTH, 0, 0,
+                                               SMTO_ABORTIFHUNG, 200, ctypes.byref(length)):
+            return None
+        buffer = ctypes.create_unicode_buffer(length.value + 1)
+        copied = ctypes.c_size_t()
+        if not self.user32.SendMessageTimeoutW(info.hwndFocus, WM_GETTEXT, length.value + 1,
+                                               ctypes.addressof(buffer), SMTO_ABORTIFHUNG, 200, ctypes.byref(copied)):
+            return None
+        return buffer.value
+
+
+class TextInjector:
+    """Picks typing or clipboard paste per payload"""
+
+    def __init__(self, type_text, press_keys, clipboard=None, paste_threshold=None,
+                 restore_delay=None, verify=None):
+        """
+        Args:
+            type_text: callable(text) that types text as key events
+            press_keys: callable(key_str) that presses a combination such as 'ctrl+v'
+            clipboard: Clipboard backend (default: Win32 clipboard on Windows, none elsewhere)
+            paste_threshold: Payloads at least this long are pasted (config.TEXT_PASTE_THRESHOLD)
+            restore_delay: Seconds to let the target read the clipboard before restoring it
+            verify: Check the focused control's text after pasting
+        """
+        self.type_text = type_text
+        self.press_keys = press_keys
+        if clipboard is None and sys.platform == "win32":
+            try:
+                clipboard = Win32Clipboard()
+            except Exception as e:
+                logger.warning(f"Clipboard unavailable, typing all text: {e}")
+        self.clipboard = clipboard
+        self.paste_threshold = config.TEXT_PASTE_THRESHOLD if paste_threshold is None else paste_threshold
+        self.restore_delay = config.TEXT_PASTE_RESTORE_DELAY if restore_delay is None else restore_delay
+        self.verify = config.TEXT_PASTE_VERIFY if verify is None else verify
+
+    def strategy(self, text):
+        """'paste' or 'type' for a payload"""
+        if self.clipboard is None or self.paste_threshold <= 0 or len(text) < self.paste_threshold:
+            return "type"
+        return "paste"
+
+    def inject(self, text):
+        """
+        Enter text into the focused control.
+
+        Returns:
+            {'success', 'method', 'verified', 'seconds'} - verified is None when the
+            focused control's text cannot be read
+        """
+        start = time.perf_counter()
+        result = None
+        if text and self.strategy(text) == "paste":
+            try:
+                result = self._paste(text)
+            except Exception as e:
+                logger.warning(f"⚠️ Clipboard paste failed ({e}), typing instead")
+        if result is None:
+            self.type_text(text)
+            result = {'success': True, 'method': 'type', 'verified': None}
+        result['seconds'] = time.perf_counter() - start
+        logger.info(f"Injected {len(text)} chars by {result['method']} in {result['seconds'] * 1000:.0f}ms")
+        return result
+
+    def _paste(self, text):
+        """Paste via the clipboard; None means the caller should type instead"""
+        saved, only_text = self.clipboard.read()
+        if not only_text:
+            logger.info("Clipboard holds non-text data - typing to avoid losing it")
+            return None
+
+        before = self.clipboard.focused_text() if self.verify else None
+        self.clipboard.write(text)
+        try:
+            self.press_keys("ctrl+v")
+            time.sleep(self.restore_delay)  # the target reads the clipboard while handling Ctrl+V
+        finally:
+            try:
+                if saved is None:
+                    self.clipboard.clear()
+                else:
+                    self.clipboard.write(saved)
+            except OSError as e:
+                logger.warning(f"Could not restore the clipboard: {e}")
+
+        if before is None:
+            return {'success': True, 'method': 'paste', 'verified': None}
+        after = self.clipboard.focused_text()
+        if after is None:
+            return {'success': True, 'method': 'paste', 'verified': None}
+        after, before = _normalize_newlines(after), _normalize_newlines(before)
+        if _normalize_newlines(text) in after and after != before:
+            return {'success': True, 'method': 'paste', 'verified': True}
+        logger.warning("⚠️ Pasted text not found in the focused control, typing it instead")
+        self.type_text(text)
+        return {'success': True, 'method': 'type', 'verified': False}
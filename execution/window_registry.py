@@ -0,0 +1,140 @@
+"""
+Window Registry - cached window list with batched fuzzy title ranking
+The window list is re-enumerated only when the window-event hooks report a
+change (Windows) or a short TTL expires (elsewhere). Titles are normalized once
+per enumeration and scored in a single rapidfuzz call (C implementation), with
+thefuzz/difflib per-title loops as fallbacks.
+"""
+
+import logging
+import re
+import threading
+import time
+
+from execution.window_watcher import get_window_watcher
+
+logger = logging.getLogger("WindowRegistry")
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+except ImportError:
+    _rf_fuzz = _rf_process = None
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_title(title):
+    """'  Inbox -  Gmail ' -> 'inbox - gmail'"""
+    return WHITESPACE.sub(" ", title or "").strip().lower()
+
+
+def _partial_ratio():
+    """Per-pair partial_ratio when rapidfuzz is unavailable"""
+    try:
+        from thefuzz import fuzz
+        return fuzz.partial_ratio
+    except ImportError:
+        from difflib import SequenceMatcher
+
+        def ratio(query, choice):
+            if query in choice:
+                return 100
+            return round(100 * SequenceMatcher(None, query, choice).ratio())
+        return ratio
+
+
+def score_titles(query, titles, limit=None, min_score=0):
+    """
+    Rank normalized titles against a normalized query (partial_ratio, 0-100).
+
+    Returns:
+        [(score, index), ...] best first, at most `limit` items
+    """
+    if not query or not titles:
+        return []
+    if _rf_process is not None:
+        matches = _rf_process.extract(query, titles, scorer=_rf_fuzz.partial_ratio, processor=None,
+                                      limit=limit, score_cutoff=min_score)
+        return [(score, index) for _, score, index in matches]
+    ratio = _partial_ratio()
+    scored = [(ratio(query, title), index) for index, title in enumerate(titles)]
+    scored = [s for s in scored if s[0] >= min_score]
+    scored.sort(key=lambda s: (-s[0], s[1]))
+    return scored[:limit] if limit else scored
+
+
+class WindowRegistry:
+    """Top-level windows, re-enumerated on change notification or TTL expiry"""
+
+    def __init__(self, watcher=None, ttl=0.25, max_age=2.0):
+        """
+        Args:
+            watcher: WindowWatcher providing enumeration and change events
+            ttl: Seconds a snapshot stays valid without change notifications
+            max_age: Upper bound on snapshot age even when hooks report no change
+        """
+        self.watcher = watcher or get_window_watcher()
+        self.ttl = ttl
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._windows = None
+        self._titles = []
+        self._taken_at = 0.0
+        self._generation = None
+
+    def invalidate(self):
+        with self._lock:
+            self._windows = None
+
+    def windows(self):
+        """[{'hwnd', 'title', 'class_name', 'norm'}, ...] (None if windows cannot be enumerated)"""
+        return self._current()[0]
+
+    def _current(self):
+        """(windows, normalized titles) from one snapshot"""
+        with self._lock:
+            age = time.monotonic() - self._taken_at
+            generation = self.watcher.generation
+            if self._windows is not None:
+                if self.watcher.hooked and generation == self._generation and age < self.max_age:
+                    return self._windows, self._titles
+                if not self.watcher.hooked and age < self.ttl:
+                    return self._windows, self._titles
+
+            snapshot = self.watcher.snapshot()
+            if snapshot is None:
+                return None, []
+            self._windows = [dict(w, norm=normalize_title(w["title"])) for w in snapshot]
+            self._titles = [w["norm"] for w in self._windows]
+            self._taken_at = time.monotonic()
+            self._generation = generation
+            return self._windows, self._titles
+
+    def top(self, title, k=5, min_score=0):
+        """Best k windows for a title as [(score, window), ...]"""
+        windows, titles = self._current()
+        if not windows:
+            return []
+        return [(float(score), windows[index])
+                for score, index in score_titles(normalize_title(title), titles, limit=k, min_score=min_score)]
+
+    def best(self, title, min_score=80):
+        """Best matching window (with its 'score'), or None below min_score"""
+        ranked = self.top(title, k=1, min_score=min_score)
+        if not ranked:
+            return None
+        score, window = ranked[0]
+        return dict(window, score=score)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_window_registry():
+    """Process-wide registry sharing the window watcher's hooks"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = WindowRegistry()
+        return _registry
@@ -0,0 +1,239 @@
+"""
+Window Watcher - event-driven waits for top-level windows
+On Windows, SetWinEventHook (window create/show/destroy, title change and
+foreground change) wakes waiters the moment something happens, and titles are
+re-read only for windows the hooks marked as changed. Elsewhere the window
+list comes from pygetwindow, polled at a short interval.
+"""
+
+import ctypes
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger("WindowWatcher")
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+SW_RESTORE = 9
+
+
+class WindowWatcher:
+    """Cached top-level window list plus change notification"""
+
+    def __init__(self, poll_interval=0.1):
+        """
+        Args:
+            poll_interval: Seconds between enumerations when no OS hook is available
+        """
+        self.poll_interval = poll_interval
+        self.hooked = False
+        self.generation = 0  # bumped on every hooked window event (see WindowRegistry)
+        self._changed = threading.Event()
+        self._lock = threading.Lock()
+        self._titles = {}       # hwnd -> title (Windows cache)
+        self._class_names = {}  # hwnd -> class name (never changes for a window)
+        self._dirty = set()     # hwnds whose title must be re-read
+        self._win32 = sys.platform == "win32"
+        if self._win32:
+            self._setup_win32()
+            threading.Thread(target=self._hook_loop, daemon=True, name="window-hooks").start()
+
+    # ---------- Win32 ----------
+    def _setup_win32(self):
+        from ctypes import wintypes
+        self._wintypes = wintypes
+        user32 = ctypes.windll.user32
+        self._enum_proc_type = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        user32.EnumWindows.argtypes = [self._enum_proc_type, wintypes.LPARAM]
+        user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+        user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        user32.GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        user32.IsWindowVisible.argtypes = [wintypes.HWND]
+        user32.IsIconic.argtypes = [wintypes.HWND]
+        user32.ShowWindow.argtypes = [wintypes.HWND, ctypes.c_int]
+        user32.SetForegroundWindow.argtypes = [wintypes.HWND]
+        user32.GetForegroundWindow.restype = wintypes.HWND
+        self._user32 = user32
+
+    def _hook_loop(self):
+        wintypes = self._wintypes
+        user32 = self._user32
+        proc_type = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                       wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread_id, time_ms):
+            if id_object == OBJID_WINDOW and hwnd:
+                with self._lock:
+                    self._dirty.add(hwnd)
+                    self.generation += 1
+                self._changed.set()
+
+        self._hook_proc = proc_type(on_event)  # must outlive the hooks
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        hooks = [
+            user32.SetWinEventHook(low, high, 0, self._hook_proc, 0, 0, flags)
+            for low, high in ((EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+                              (EVENT_OBJECT_CREATE, EVENT_OBJECT_SHOW),
+                              (EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE))
+        ]
+        if not any(hooks):
+            logger.warning("SetWinEventHook unavailable - polling the window list")
+            return
+        self.hooked = True
+        logger.info("✓ Window event hooks installed")
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+    def _read_text(self, func, hwnd, size=None):
+        size = size or 256
+        buffer = ctypes.create_unicode_buffer(size)
+        func(hwnd, buffer, size)
+        return buffer.value
+
+    def _win32_snapshot(self):
+        user32 = self._user32
+        handles = []
+        callback = self._enum_proc_type(lambda hwnd, _: handles.append(hwnd) or True)
+        user32.EnumWindows(callback, 0)
+
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        if not self.hooked:
+            dirty = None  # no change events: every title may have changed
+
+        windows, alive = [], set()
+        for hwnd in handles:
+            if not user32.IsWindowVisible(hwnd):
+                continue
+            alive.add(hwnd)
+            title = self._titles.get(hwnd)
+            if title is None or dirty is None or hwnd in dirty:
+                title = self._read_text(user32.GetWindowTextW, hwnd, user32.GetWindowTextLengthW(hwnd) + 1)
+                self._titles[hwnd] = title
+            if not title:
+                continue
+            class_name = self._class_names.get(hwnd)
+            if class_name is None:
+                class_name = self._class_names[hwnd] = self._read_text(user32.GetClassNameW, hwnd)
+            windows.append({"hwnd": hwnd, "title": title, "class_name": class_name})
+
+        for hwnd in set(self._titles) - alive:
+            self._titles.pop(hwnd, None)
+            self._class_names.pop(hwnd, None)
+        return windows
+
+    # ---------- Public API ----------
+    def snapshot(self):
+        """[{'hwnd', 'title', 'class_name'}, ...] for visible titled windows, or None if unsupported"""
+        if self._win32:
+            return self._win32_snapshot()
+        try:
+            import pygetwindow as gw
+            return [{"hwnd": w._hWnd, "title": w.title, "class_name": None} for w in gw.getAllWindows() if w.title]
+        except Exception:
+            return None
+
+    def foreground(self):
+        """Handle of the foreground window (None if unknown)"""
+        if self._win32:
+            return self._user32.GetForegroundWindow()
+        try:
+            import pygetwindow as gw
+            active = gw.getActiveWindow()
+            return active._hWnd if active is not None else None
+        except Exception:
+            return None
+
+    def wait_for(self, title=None, class_name=None, foreground=False, timeout=10.0, min_score=80, new_since=None):
+        """
+        Block until a matching window exists.
+
+        Args:
+            title: Fuzzy title to match (None = any title)
+            class_name: Exact window class, e.g. 'CabinetWClass' for File Explorer
+            foreground: Only accept the foreground window
+            new_since: Handles to ignore unless they are in the foreground (windows open before a launch)
+
+        Returns:
+            (window dict or None, supported) - supported is False when windows cannot be enumerated
+        """
+        from execution.window_registry import normalize_title, score_titles
+
+        hint = normalize_title(title) if title else None
+        deadline = time.time() + timeout
+        scores = {}  # (hwnd, title) -> score, so unchanged windows are scored once per wait
+        while True:
+            self._changed.clear()
+            windows = self.snapshot()
+            if windows is None:
+                return None, False
+            front = self.foreground()
+
+            candidates = [
+                w for w in windows
+                if not (foreground and w["hwnd"] != front)
+                and not (new_since is not None and w["hwnd"] in new_since and w["hwnd"] != front)
+                and not (class_name and w["class_name"] not in (None, class_name))  # None: class unknown here
+            ]
+            if hint is not None:
+                unscored = [w for w in candidates if (w["hwnd"], w["title"]) not in scores]
+                for score, index in score_titles(hint, [normalize_title(w["title"]) for w in unscored]):
+                    scores[(unscored[index]["hwnd"], unscored[index]["title"])] = score
+                for w in unscored:
+                    scores.setdefault((w["hwnd"], w["title"]), 0)
+
+            best, best_score = None, -1
+            for window in candidates:
+                score = 100 if hint is None else scores[(window["hwnd"], window["title"])]
+                if score > best_score or (score == best_score and window["hwnd"] == front):
+                    best, best_score = window, score
+            if best is not None and best_score >= min_score:
+                return dict(best, score=best_score), True
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None, True
+            # Hooks wake us on the next window event; the cap covers events we do not subscribe to
+            self._changed.wait(min(remaining, 0.5 if self.hooked else self.poll_interval))
+
+    def focus(self, hwnd):
+        """Restore (if minimized) and bring a window to the foreground"""
+        if self._win32:
+            user32 = self._user32
+            if user32.IsIconic(hwnd):
+                user32.ShowWindow(hwnd, SW_RESTORE)
+            return bool(user32.SetForegroundWindow(hwnd))
+        try:
+            import pygetwindow as gw
+            for window in gw.getAllWindows():
+                if window._hWnd == hwnd:
+                    if window.isMinimized:
+                        window.restore()
+                    window.activate()
+                    return True
+        except Exception as e:
+            logger.debug(f"Focus failed: {e}")
+        return False
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_window_watcher():
+    """Process-wide watcher (installs the Windows event hooks once)"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = WindowWatcher()
+        return _watcher
@@ -10,6 +10,7 @@ from groq import Groq
 import os
 from dotenv import load_dotenv
 from execution.execution_handler import ExecutionHandler
+from models.entity_extractor import get_extractor
 
 # Load environment variables from .env file
 load_dotenv()
@@ -148,78 +149,11 @@ MODEL2_STEP_RULES = {
     ],
 }
 
-def extract_profile_name(text):
-    patterns = [
-        r'with chrome profile ([\w\s]+?)(?:\s+(?:search|open|go|and))', r'chrome profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-        r'with profile ([\w\s]+?)(?:\s+(?:search|open|go|and))', r'use profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-        r'profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
-        if match:
-            return match.group(1).strip()
-    return "Default"
-
-def extract_website_and_action(text):
-    websites = {
-        'youtube': 'youtube.com', 'google': 'google.com', 'gmail': 'mail.google.com', 'facebook': 'facebook.com',
-        'twitter': 'twitter.com', 'instagram': 'instagram.com', 'linkedin': 'linkedin.com', 'github': 'github.com',
-        'reddit': 'reddit.com', 'amazon': 'amazon.com', 'netflix': 'netflix.com', 'spotify': 'open.spotify.com',
-    }
-    text_l = text.lower()
-    website = 'google.com'
-    for keyword, url in websites.items():
-        if keyword in text_l:
-            website = url
-            break
-    query_text = text_l
-    for pattern in [r'with chrome profile [\w\s]+', r'chrome profile [\w\s]+', r'profile [\w\s]+']:
-        query_text = re.sub(pattern, '', query_text)
-    skip_words = {'with', 'chrome', 'search', 'for', 'open', 'go', 'to', 'on', 'in', 'and', 'youtube', 'google', 'gmail', 'facebook', 'profile'}
-    query_words = [w for w in query_text.split() if w not in skip_words and w.strip()]
-    return website, ' '.join(query_words) if query_words else None
-
-def extract_app_name(words, trigger_words):
-    for trigger in trigger_words:
-        if trigger in words:
-            idx = words.index(trigger)
-            app_words = [w for w in words[idx+1:] if w not in ['app', 'application', 'program']]
-            if app_words:
-                return ' '.join(app_words)
-    return None
-
-def extract_text_after_keywords(words, keywords, skip_words):
-    for keyword in keywords:
-        if keyword in words:
-            idx = words.index(keyword)
-            text_words = [w for w in words[idx+1:] if w not in skip_words]
-            if text_words:
-                return ' '.join(text_words)
-    return None
-
-def extract_file_or_folder_path(words, raw_command):
-    file_indicators = ['file', 'document', 'doc', 'pdf', 'image', 'video', 'folder', 'directory']
-    common_folders = {
-        'documents': r'%USERPROFILE%\Documents', 'downloads': r'%USERPROFILE%\Downloads', 'desktop': r'%USERPROFILE%\Desktop',
-        'pictures': r'%USERPROFILE%\Pictures', 'videos': r'%USERPROFILE%\Videos', 'music': r'%USERPROFILE%\Music',
-    }
-    is_file_operation = any(indicator in words for indicator in file_indicators)
-    if not is_file_operation:
-        return False, None, None, False
-    for folder_keyword, folder_path in common_folders.items():
-        if folder_keyword in words:
-            return True, folder_path, 'folder', True
-    skip_words = {'open', 'file', 'folder', 'document', 'my', 'the', 'launch', 'show', 'browse', 'to'}
-    target_words = [w for w in words if w not in skip_words]
-    if target_words:
-        target_name = ' '.join(target_words)
-        target_type = 'folder' if 'folder' in words or 'directory' in words else 'file'
-        return True, target_name, target_type, False
-    return False, None, None, False
+EXTRACTOR = get_extractor()
 
 def extract_keywords_by_command_type(raw_command, command_type):
-    raw_command_lower = raw_command.lower().strip()
-    words = raw_command_lower.split()
+    parsed = EXTRACTOR.parse(raw_command)
+    words = parsed.words
     extracted = {
         'app_name': None, 'search_query': None, 'text_content': None, 'action_target': None, 'keyboard_shortcut': None,
         'system_action': None, 'window_action': None, 'profile_name': None, 'website': None, 'media_query': None,
@@ -228,12 +162,12 @@ def extract_keywords_by_command_type(raw_command, command_type):
     }
     if command_type == "OPEN_APP":
         trigger = ['open', 'launch', 'start', 'run']
-        extracted['app_name'] = extract_app_name(words, trigger) or ('chrome' if 'chrome' in words else 'current')
+        extracted['app_name'] = EXTRACTOR.app_name(parsed, trigger) or ('chrome' if parsed.has('chrome') else 'current')
     elif command_type == "CLOSE_APP":
         trigger = ['close', 'exit', 'quit']
-        extracted['app_name'] = extract_app_name(words, trigger) or 'current'
+        extracted['app_name'] = EXTRACTOR.app_name(parsed, trigger) or 'current'
     elif command_type == "FILE_FOLDER_OPERATION":
-        is_file_op, target_name, target_type, is_known = extract_file_or_folder_path(words, raw_command_lower)
+        is_file_op, target_name, target_type, is_known = EXTRACTOR.file_or_folder(parsed)
         extracted['is_file_operation'] = True
         extracted['is_known_folder'] = is_known
         extracted['needs_search'] = not is_known
@@ -243,45 +177,35 @@ def extract_keywords_by_command_type(raw_command, command_type):
         else:
             extracted['search_target'] = target_name
     elif command_type == "WEB_SEARCH":
-        extracted['profile_name'] = extract_profile_name(raw_command_lower)
-        website, query = extract_website_and_action(raw_command_lower)
+        extracted['profile_name'] = EXTRACTOR.profile_name(parsed.lower) or "Default"
+        website, query = EXTRACTOR.website_and_query(parsed, default='google.com')
         extracted['website'] = website
         extracted['search_query'] = query
     elif command_type == "TYPE_TEXT":
-        extracted['text_content'] = extract_text_after_keywords(words, ['type', 'write', 'enter'], {'text', 'message'})
+        extracted['text_content'] = EXTRACTOR.words_after(parsed, ['type', 'write', 'enter'], {'text', 'message'})
     elif command_type in ["MOUSE_CLICK", "MOUSE_RIGHTCLICK", "MOUSE_DOUBLECLICK"]:
         skip = {'click', 'on', 'here', 'it', 'this', 'right', 'double'}
         extracted['action_target'] = ' '.join([w for w in words if w not in skip]) or 'current'
     elif command_type == "WINDOW_ACTION":
-        extracted['window_action'] = 'maximize' if any(w in words for w in ['maximize', 'fullscreen']) else 'minimize'
+        extracted['window_action'] = 'maximize' if parsed.has('maximize') or parsed.has('fullscreen') else 'minimize'
     elif command_type == "KEYBOARD":
         shortcuts = {'copy': 'ctrl+c', 'paste': 'ctrl+v', 'save': 'ctrl+s', 'undo': 'ctrl+z'}
-        for word, shortcut in shortcuts.items():
-            if word in words:
-                extracted['keyboard_shortcut'] = shortcut
-                break
+        extracted['keyboard_shortcut'] = next((s for word, s in shortcuts.items() if parsed.has(word)), None)
     elif command_type == "SYSTEM":
-        extracted['system_action'] = 'screenshot' if 'screenshot' in words or 'capture' in words else 'lock'
+        extracted['system_action'] = 'screenshot' if parsed.has('screenshot') or parsed.has('capture') else 'lock'
     elif command_type == "APP_WITH_ACTION":
-        if 'and' in words:
-            and_idx = words.index('and')
-            extracted['app_name'] = extract_app_name(words[:and_idx], ['open', 'launch', 'start'])
+        and_idx = parsed.index('and')
+        if and_idx != -1:
+            extracted['app_name'] = EXTRACTOR.app_name(parsed, ['open', 'launch', 'start'], end=and_idx)
             extracted['action_content'] = ' '.join([w for w in words[and_idx+1:] if w not in ['search', 'type', 'play']])
     elif command_type == "MEDIA_CONTROL":
-        apps = ['spotify', 'netflix', 'youtube', 'vlc']
-        extracted['app_name'] = next((app for app in apps if app in words), 'spotify')
+        extracted['app_name'] = parsed.first('media_app', 'spotify')
         extracted['media_query'] = ' '.join([w for w in words if w not in ['play', 'stream', 'music', 'video', extracted['app_name']]])
     elif command_type == "SEND_MESSAGE":
-        apps_map = {
-            'whatsapp': 'whatsapp', 'email': 'outlook', 'social': 'facebook', 'twitter': 'twitter',
-            'instagram': 'instagram', 'telegram': 'telegram',
-        }
-        extracted['app_name'] = next((v for k, v in apps_map.items() if k in raw_command_lower), 'whatsapp')
-        if 'to' in words:
-            to_idx = words.index('to')
-            recipient_words = words[to_idx + 1:]
-            if recipient_words:
-                extracted['recipient'] = ' '.join(recipient_words)
+        extracted['app_name'] = parsed.first('messaging_app', 'whatsapp')
+        to_idx = parsed.index('to')
+        if to_idx != -1 and words[to_idx + 1:]:
+            extracted['recipient'] = parsed.first('contact', start=to_idx + 1) or ' '.join(words[to_idx + 1:])
     return extracted
 
 def generate_steps_model2(command_type, extracted_keywords):
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Headless batch runner - the EVA pipeline without a GUI
+Reads utterances from a JSONL file ({"id", "text" or "audio", "expected_type",
+"message"} objects or plain strings), runs transcription, classification,
+keyword extraction, step generation and execution (dry-run by default) on a
+thread pool, and writes one record per utterance with per-stage latency and
+outcome, followed by a p50/p95/p99 summary. The simulator backend runs each
+plan against a fresh simulated desktop and records its end state.
+
+Usage:
+    python headless.py utterances.jsonl --output results.jsonl
+    python headless.py utterances.jsonl --concurrency 8 --repeat 100 --summary bench/headless.json
+    python headless.py utterances.jsonl --no-execute --strict
+    python headless.py utterances.jsonl --backend simulator --output flows.jsonl
+    python headless.py utterances.jsonl --backend native --concurrency 1
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from benchmarks.parse_benchmark import summarize
+from models.command_pipeline import MODEL1_TRAINING_DATA, classify, extract_keywords, plan_command
+from models.entity_extractor import get_extractor
+
+logger = logging.getLogger("Headless")
+
+STAGES = ["transcribe", "classify", "extract", "plan", "execute", "total"]
+
+
+def load_utterances(path, repeat=1):
+    """[{'id', 'text' | 'audio', ...}, ...] from a JSONL file (plain JSON strings are texts)"""
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"text": item}
+            if not item.get("text") and not item.get("audio"):
+                raise ValueError(f"{path}:{line_number}: needs 'text' or 'audio'")
+            item.setdefault("id", str(line_number))
+            if item.get("audio") and not os.path.isabs(item["audio"]):
+                item["audio"] = os.path.join(os.path.dirname(os.path.abspath(path)), item["audio"])
+            items.append(item)
+    if repeat > 1:
+        items = [dict(item, id=f"{item['id']}#{n}") for n in range(repeat) for item in items]
+    return items
+
+
+class HeadlessEngine:
+    """Classification -> extraction -> steps -> execution for batches of utterances"""
+
+    def __init__(self, backend="dry_run", execute=True, deep_links=None):
+        """
+        Args:
+            backend: Executor backend for execution ("dry_run", "simulator" or "native")
+            execute: Run the generated steps (False stops after step generation)
+            deep_links: Use deep-link plans (default: config.DEEP_LINKS_ENABLED)
+        """
+        self.backend = backend
+        self.execute = execute
+        self.deep_links = deep_links
+        self.intent_model = None
+        self._local = threading.local()  # per-worker dry-run / simulator router
+        self._native_router = None
+        self._screens = []  # every worker's capture backend, closed by close()
+        self._screens_lock = threading.Lock()
+        self._parse_lock = threading.Lock()  # workers' OmniParser executors share the registry models
+        self._execute_lock = threading.Lock()  # one desktop: native plans run one at a time
+        self._transcriber = None
+        self._transcriber_lock = threading.Lock()
+
+    def setup(self):
+        """Load the classifier (and the native execution stack); returns {component: seconds}"""
+        timings = {}
+        start = time.perf_counter()
+        from models.intent_model_cache import IntentModelCache
+        self.intent_model = IntentModelCache(MODEL1_TRAINING_DATA)
+        self.intent_model.load_or_train(background=False)
+        get_extractor().add_many("contact", list(config.CONTACT_PHONE_NUMBERS))
+        timings["classifier"] = time.perf_counter() - start
+
+        if self.execute and self.backend == "native":
+            start = time.perf_counter()
+            self._native_router = self._build_native_router()
+            timings["executor"] = time.perf_counter() - start
+        return timings
+
+    # ---------- Execution stacks ----------
+    def _build_native_router(self):
+        from execution.action_router import ActionRouter
+        from execution.app_index import AppIndex
+        from execution.executor_backend import create_executor
+        from vision.omniparser_executor import OmniParserExecutor
+        from vision.screen_analyzer import ScreenAnalyzer
+        executor, system_executor, screenshot_handler = create_executor("native")
+        app_index = AppIndex().load() if config.APP_INDEX_ENABLED else None
+        if app_index:
+            app_index.refresh_async()
+        return ActionRouter(system_executor, screenshot_handler, ScreenAnalyzer(config.GEMINI_API_KEY),
+                            OmniParserExecutor(service_url=config.PARSE_SERVICE_URL), app_index=app_index)
+
+    def _headless_router(self):
+        """(router, executor) owned by the current worker thread"""
+        if getattr(self._local, "router", None) is None:
+            from execution.action_router import ActionRouter
+            from execution.dry_run_executor import CannedParser, CannedSelector
+            from execution.executor_backend import create_executor
+            executor, system_executor, screens = create_executor(self.backend)
+            if self.backend == "simulator" and config.SIMULATOR_OMNIPARSER:
+                parser = self._build_omniparser()
+            elif self.backend == "simulator":
+                from execution.desktop_simulator import SimulatedParser
+                parser = SimulatedParser(screens)
+            else:
+                parser = CannedParser(screens)
+            with self._screens_lock:
+                self._screens.append(screens)
+            self._local.executor = executor
+            self._local.router = ActionRouter(system_executor, screens, CannedSelector(), parser)
+        return self._local.router, self._local.executor
+
+    def _build_omniparser(self):
+        """OmniParser on the rendered simulator frames (per worker: the element tracker follows one desktop)"""
+        from vision.omniparser_executor import OmniParserExecutor
+        from vision.resolution_policy import ResolutionPolicy
+        resolution_policy = (
+            ResolutionPolicy(config.RESOLUTION_TARGET_TEXT_PX, config.RESOLUTION_MIN_SCALE,
+                             detector_imgsz=config.RESOLUTION_DETECTOR_IMGSZ)
+            if config.RESOLUTION_POLICY_ENABLED else None
+        )
+        return OmniParserExecutor(service_url=config.PARSE_SERVICE_URL, resolution_policy=resolution_policy,
+                                  parse_lock=self._parse_lock)
+
+    def close(self):
+        """Release the workers' capture backends (simulator frame directories)"""
+        with self._screens_lock:
+            screens, self._screens = self._screens, []
+        for backend in screens:
+            if hasattr(backend, "close"):
+                backend.close()
+
+    def _execute(self, model1, steps, extracted, record):
+        if self.backend == "native":
+            with self._execute_lock:
+                return self._native_router.execute(model1["command_type"], steps, extracted, model1["input"], model1)
+        router, executor = self._headless_router()
+        executor.reset()
+        result = router.execute(model1["command_type"], steps, extracted, model1["input"], model1)
+        summary = executor.summary()
+        record["actions"] = summary["actions"]
+        record["simulated_s"] = round(summary["simulated_s"], 4)
+        if self.backend == "simulator":
+            record["desktop"] = executor.state()
+        return result
+
+    def transcribe(self, audio_path):
+        # SpeechToText.transcribe_audio deletes its input file, so call the model directly
+        with self._transcriber_lock:
+            if self._transcriber is None:
+                from speech.speech_to_text import SpeechToText
+                self._transcriber = SpeechToText()
+            segments, _ = self._transcriber.model.transcribe(
+                audio_path, language="en", beam_size=5, temperature=0.0, condition_on_previous_text=False
+            )
+            return " ".join(segment.text for segment in segments).strip()
+
+    # ---------- Pipeline ----------
+    def run_one(self, item):
+        """Run one utterance; never raises (errors end up in the record)"""
+        record = {"id": item.get("id"), "text": item.get("text"), "stages_ms": {}}
+        stages = record["stages_ms"]
+        total_start = time.perf_counter()
+
+        def timed(stage, func, *args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                stages[stage] = round((time.perf_counter() - start) * 1000, 3)
+
+        try:
+            text = item.get("text")
+            if not text:
+                text = timed("transcribe", self.transcribe, item["audio"])
+                record["text"] = text
+                if not text:
+                    raise ValueError("No speech recognized")
+
+            model1 = timed("classify", classify, self.intent_model, text)
+            record["command_type"] = model1["command_type"]
+            record["confidence"] = round(float(model1["confidence"]), 4)
+            if item.get("expected_type"):
+                record["expected_type"] = item["expected_type"]
+                record["correct"] = model1["command_type"] == item["expected_type"]
+
+            extracted = timed("extract", extract_keywords, text, model1["command_type"])
+            if item.get("message") and not extracted.get("message_content"):
+                extracted["message_content"] = item["message"]  # the spoken follow-up in the GUI
+            record["extracted"] = {k: v for k, v in extracted.items() if v}
+
+            steps = timed("plan", plan_command, model1["command_type"], extracted, self.deep_links)
+            record["steps"] = [step["action_type"] for step in steps if step["action_type"] != "CONDITIONAL"]
+
+            if self.execute:
+                result = timed("execute", self._execute, model1, steps, extracted, record)
+                record["outcome"] = "ok" if result.get("success") else "failed"
+                if not result.get("success"):
+                    record["error"] = result.get("error")
+            else:
+                record["outcome"] = "planned"
+        except Exception as e:
+            record["outcome"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+        stages["total"] = round((time.perf_counter() - total_start) * 1000, 3)
+        return record
+
+    def run(self, items, concurrency=1, on_record=None):
+        """
+        Run a batch on `concurrency` worker threads.
+
+        Returns:
+            (records in input order, wall-clock seconds)
+        """
+        start = time.perf_counter()
+        records = []
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            for record in pool.map(self.run_one, items):
+                records.append(record)
+                if on_record:
+                    on_record(record)
+        return records, time.perf_counter() - start
+
+
+def summarize_run(records, wall_seconds, setup_timings, args):
+    outcomes = {}
+    for record in records:
+        outcomes[record["outcome"]] = outcomes.get(record["outcome"], 0) + 1
+    labelled = [r for r in records if "correct" in r]
+    return {
+        "utterances": len(records),
+        "backend": args.backend if args.execute else None,
+        "concurrency": args.concurrency,
+        "wall_s": round(wall_seconds, 3),
+        "throughput_per_s": round(len(records) / wall_seconds, 2) if wall_seconds else None,
+        "setup_s": {name: round(seconds, 3) for name, seconds in setup_timings.items()},
+        "outcomes": outcomes,
+        "accuracy": round(sum(r["correct"] for r in labelled) / len(labelled), 4) if labelled else None,
+        "stages_ms": {
+            stage: summarize([r["stages_ms"][stage] for r in records if stage in r["stages_ms"]])
+            for stage in STAGES
+        },
+    }
+
+
+def print_summary(summary):
+    print(f"\n{summary['utterances']} utterances in {summary['wall_s']:.2f}s "
+          f"({summary['throughput_per_s']}/s, concurrency {summary['concurrency']})")
+    print("Outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(summary["outcomes"].items())))
+    if summary["accuracy"] is not None:
+        print(f"Classification accuracy: {summary['accuracy'] * 100:.1f}%")
+    print(f"{'stage':<12}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage, stats in summary["stages_ms"].items():
+        if stats["n"]:
+            print(f"{stage:<12}{stats['n']:>8}{stats['p50']:>10.3f}{stats['p95']:>10.3f}"
+                  f"{stats['p99']:>10.3f}{stats['max']:>10.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a JSONL file of utterances through the EVA pipeline")
+    parser.add_argument("input", help="JSONL of utterances")
+    parser.add_argument("--output", default=None, help="Write per-utterance records (JSONL) here")
+    parser.add_argument("--summary", default=None, help="Write the summary JSON here")
+    parser.add_argument("--backend", default="dry_run", choices=["dry_run", "simulator", "native"], help="Executor backend")
+    parser.add_argument("--no-execute", dest="execute", action="store_false", help="Stop after step generation")
+    parser.add_argument("--no-deep-links", dest="deep_links", action="store_false", default=None,
+                        help="Always use the UI step templates")
+    parser.add_argument("--concurrency", type=int, default=4, help="Worker threads")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the input this many times (load tests)")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 on any error, failure or misclassification")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    items = load_utterances(args.input, args.repeat)
+    engine = HeadlessEngine(backend=args.backend, execute=args.execute, deep_links=args.deep_links)
+    setup_timings = engine.setup()
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    try:
+        def write(record):
+            if output:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        records, wall_seconds = engine.run(items, args.concurrency, on_record=write)
+    finally:
+        engine.close()
+        if output:
+            output.close()
+
+    summary = summarize_run(records, wall_seconds, setup_timings, args)
+    print_summary(summary)
+    if args.summary:
+        os.makedirs(os.path.dirname(os.path.abspath(args.summary)), exist_ok=True)
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    if args.strict:
+        bad = [r for r in records if r["outcome"] in ("error", "failed") or r.get("correct") is False]
+        if bad:
+            print(f"❌ {len(bad)} utterance(s) failed or were misclassified")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,11 @@
 import os
 import sys
+
+# Per-module import timings on demand: `main.py --profile-imports` or EVA_PROFILE_IMPORTS=1
+if "--profile-imports" in sys.argv or os.getenv("EVA_PROFILE_IMPORTS"):
+    from utils.lazy_imports import enable_import_profile
+    enable_import_profile()
+
 import re
 import threading
 import time
@@ -12,22 +18,44 @@ import smtplib
 import ssl
 from datetime import datetime
 from dotenv import load_dotenv
-import speech_recognition as sr
 from PySide6.QtGui import QTextCursor
 
 
 import config
-from execution.executor_bridge import ExecutorBridge
-from vision.face_auth import FaceAuthenticator
-from execution.action_router import ActionRouter
-from execution.system_executor import SystemExecutor
-from vision.screenshot_handler import ScreenshotHandler
-from vision.screen_analyzer import ScreenAnalyzer
-from vision.omniparser_executor import OmniParserExecutor
-from speech.wake_word_detector import WakeWordDetector
-
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from models.command_pipeline import MODEL1_TRAINING_DATA, classify, extract_keywords, generate_steps
+from models.entity_extractor import get_extractor
+from models.model_registry import get_registry
+from utils.startup_graph import StartupGraph
+from utils.lazy_imports import BackgroundImporter, import_profiler
+
+# Heavy modules are imported lazily (inside the functions that use them) so the
+# passcode dialog appears after only Qt has loaded; these are warmed up in the
+# background meanwhile. Keep in sync with hiddenimports in main.spec.
+# scikit-learn is left out: a warm start classifies through models.intent_predictor
+# and only a retrain imports it.
+BACKGROUND_IMPORTS = [
+    "numpy",
+    "models.intent_predictor",
+    "speech_recognition",
+    "vision.face_auth",
+    "execution.window_watcher",
+    "execution.window_registry",
+    "execution.text_injector",
+    "execution.executor_backend",
+    "execution.executor_bridge",
+    "execution.system_executor",
+    "execution.app_index",
+    "execution.deep_links",
+    "execution.action_router",
+    "execution.speculative_parser",
+    "vision.screenshot_handler",
+    "vision.screen_analyzer",
+    "vision.layout_memory",
+    "vision.resolution_policy",
+    "vision.screen_indexer",
+    "speech.wake_word_detector",
+    "vision.omniparser_executor",
+]
 
 # === Qt (PySide6) ===
 
@@ -45,152 +73,6 @@ warnings.filterwarnings("ignore", message="pkg_resources is deprecated as an API
 # Load environment variables from .env file
 load_dotenv()
 
-# ============================================================================ 
-# EVA_TER LOGIC (INTEGRATED) — unchanged datasets and step templates
-# ============================================================================ 
-
-MODEL1_TRAINING_DATA = [
-    ("open application", "OPEN_APP"), ("launch program", "OPEN_APP"), ("start software", "OPEN_APP"),
-    ("run app", "OPEN_APP"), ("open app", "OPEN_APP"), ("open chrome", "OPEN_APP"), ("launch spotify", "OPEN_APP"),
-    ("close application", "CLOSE_APP"), ("close this", "CLOSE_APP"), ("close window", "CLOSE_APP"),
-    ("exit application", "CLOSE_APP"), ("quit app", "CLOSE_APP"),
-    ("open file explorer", "OPEN_FILE_EXPLORER"), ("open file manager", "OPEN_FILE_EXPLORER"),
-    ("search for file", "SEARCH_FILE"), ("find document", "SEARCH_FILE"),
-    ("open documents", "OPEN_FOLDER"), ("open downloads", "OPEN_FOLDER"), ("open pictures", "OPEN_FOLDER"),
-    ("type text", "TYPE_TEXT"), ("write something", "TYPE_TEXT"), ("enter text", "TYPE_TEXT"),
-    ("click on something", "MOUSE_CLICK"), ("click here", "MOUSE_CLICK"),
-    ("right click", "MOUSE_RIGHTCLICK"), ("double click", "MOUSE_DOUBLECLICK"),
-    ("maximize window", "WINDOW_ACTION"), ("minimize window", "WINDOW_ACTION"), ("fullscreen mode", "WINDOW_ACTION"),
-    ("take screenshot", "SYSTEM"), ("lock screen", "SYSTEM"),
-    ("copy", "KEYBOARD"), ("paste", "KEYBOARD"), ("save", "KEYBOARD"), ("undo", "KEYBOARD"),
-    ("open app and search", "APP_WITH_ACTION"), ("launch app and type", "APP_WITH_ACTION"),
-    ("open app and play", "APP_WITH_ACTION"), ("start app and compose", "APP_WITH_ACTION"),
-    ("play music", "MEDIA_CONTROL"), ("play video", "MEDIA_CONTROL"), ("stream music", "MEDIA_CONTROL"), ("stream video", "MEDIA_CONTROL"),
-    ("open spotify and play", "MEDIA_CONTROL"), ("open youtube and play", "MEDIA_CONTROL"),
-    ("send whatsapp to", "SEND_MESSAGE"), ("send message to", "SEND_MESSAGE"), ("whatsapp to", "SEND_MESSAGE"),
-    ("email to", "SEND_MESSAGE"), ("post on social", "SEND_MESSAGE"), ("message to", "SEND_MESSAGE"),
-    ("whatsapp mom", "SEND_MESSAGE"), ("email john", "SEND_MESSAGE"),
-    ("search for something", "WEB_SEARCH"), ("google something", "WEB_SEARCH"), ("youtube search", "WEB_SEARCH"),
-    ("open youtube", "WEB_SEARCH"), ("profile work search python", "WEB_SEARCH"), ("with profile personal search", "WEB_SEARCH"),
-    ("chrome profile dev open youtube", "WEB_SEARCH"), ("open gmail", "WEB_SEARCH"), ("go to facebook", "WEB_SEARCH"),
-    ("search amazon", "WEB_SEARCH"),
-]
-
-STEP_TEMPLATES = {
-    "open_app_windows": [
-        {"action_type": "PRESS_KEY", "parameters": {"key": "win"}, "description": "Open Start Menu"},
-        {"action_type": "WAIT", "parameters": {"duration": 0.5}, "description": "Wait for menu"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{app_name}"}, "description": "Type: {app_name}"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Launch {app_name}"},
-        {"action_type": "WAIT", "parameters": {"duration": 5}, "description": "Wait for app to load"},
-        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait before focusing"},
-        {"action_type": "FOCUS_WINDOW", "parameters": {"title": "{app_name}"}, "description": "Focus {app_name} window"},
-    ],
-    "search_file_explorer": [
-        {"action_type": "PRESS_KEY", "parameters": {"key": "win+e"}, "description": "Open File Explorer"},
-        {"action_type": "WAIT", "parameters": {"duration": 1.5}, "description": "Wait for Explorer"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+f"}, "description": "Focus search box"},
-        {"action_type": "WAIT", "parameters": {"duration": 0.5}, "description": "Wait for search box"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{search_target}"}, "description": "Search for: {search_target}"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Execute search"},
-        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for search results"},
-        {"action_type": "SCREEN_ANALYSIS", "parameters": {"target": "{search_target}"}, "description": "Click on first result"},
-    ],
-    "chrome_with_profile": [
-        {"action_type": "PRESS_KEY", "parameters": {"key": "win"}, "description": "Open Start Menu"},
-        {"action_type": "WAIT", "parameters": {"duration": 0.5}, "description": "Wait for menu"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "chrome"}, "description": "Type Chrome"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Launch Chrome"},
-        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for Chrome"},
-        {"action_type": "FOCUS_WINDOW", "parameters": {"title": "Chrome"}, "description": "Focus Chrome window"},
-        {"action_type": "WAIT", "parameters": {"duration": 0.5}, "description": "Wait for focus"},
-        {"action_type": "SCREEN_ANALYSIS", "parameters": {"profile_name": "{profile_name}"}, "description": "Select profile: {profile_name}"},
-        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Profile loaded"},
-    ],
-    "navigate_to_website": [
-        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+l"}, "description": "Focus address bar"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{website}"}, "description": "Go to: {website}"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Navigate"},
-        {"action_type": "WAIT", "parameters": {"duration": 2.5}, "description": "Wait for page load"},
-    ],
-    "search_on_page": [
-        {"action_type": "PRESS_KEY", "parameters": {"key": "/"}, "description": "Focus search"},
-        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for results"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{search_query}"}, "description": "Type: {search_query}"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Search"},
-        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for results"},
-        {"action_type": "SCREEN_ANALYSIS", "parameters": {"target": "{search_query}"}, "description": "Click on result"},
-    ],
-    "whatsapp_open_chat": [
-        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+f"}, "description": "New chat"},
-        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for search"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{recipient}"}, "description": "Search: {recipient}"},
-        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for search results"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "tab"}, "description": "Press Tab"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Press Enter"},
-    ],
-    "type_and_send_message": [
-        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait before typing"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{message_content}"}, "description": "Type message"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Send message"},
-    ],
-}
-
-MODEL2_STEP_RULES = {
-    "OPEN_APP": STEP_TEMPLATES["open_app_windows"],
-    "CLOSE_APP": [{"action_type": "PRESS_KEY", "parameters": {"key": "alt+f4"}, "description": "Close window"}],
-    "OPEN_FILE_EXPLORER": [{"action_type": "PRESS_KEY", "parameters": {"key": "win+e"}, "description": "Open File Explorer"}],
-    "SEARCH_FILE": [*STEP_TEMPLATES["search_file_explorer"]],
-    "OPEN_FOLDER": [
-        {"action_type": "PRESS_KEY", "parameters": {"key": "win+e"}, "description": "Open File Explorer"},
-        {"action_type": "WAIT", "parameters": {"duration": 1.5}, "description": "Wait for Explorer"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+l"}, "description": "Focus address bar"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{file_path}"}, "description": "Navigate to folder"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Open folder"},
-    ],
-    "WEB_SEARCH": [
-        *STEP_TEMPLATES["chrome_with_profile"],
-        *STEP_TEMPLATES["navigate_to_website"],
-        {"action_type": "CONDITIONAL", "parameters": {"condition": "search_query_exists"}, "description": "Check search needed"},
-        *STEP_TEMPLATES["search_on_page"],
-    ],
-    "TYPE_TEXT": [{"action_type": "TYPE_TEXT", "parameters": {"text": "{text_content}"}, "description": "Type: {text_content}"}],
-    "FOCUS_WINDOW": [{"action_type": "FOCUS_WINDOW", "parameters": {"title": "{app_name}"}, "description": "Focus: {app_name}"}],
-    "MOUSE_CLICK": [{"action_type": "SCREEN_ANALYSIS", "parameters": {"target": "{action_target}"}, "description": "Click: {action_target}"}],
-    "MOUSE_RIGHTCLICK": [{"action_type": "MOUSE_RIGHTCLICK", "parameters": {}, "description": "Right click"}],
-    "MOUSE_DOUBLECLICK": [{"action_type": "MOUSE_DOUBLECLICK", "parameters": {}, "description": "Double click"}],
-    "WINDOW_ACTION": [{"action_type": "PRESS_KEY", "parameters": {"key": "win+up"}, "description": "Window action: {window_action}"}],
-    "KEYBOARD": [{"action_type": "PRESS_KEY", "parameters": {"key": "{keyboard_shortcut}"}, "description": "Press: {keyboard_shortcut}"}],
-    "SYSTEM": [{"action_type": "SYSTEM_ACTION", "parameters": {"action": "{system_action}"}, "description": "System: {system_action}"}],
-    "APP_WITH_ACTION": [
-        *STEP_TEMPLATES["open_app_windows"],
-        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for app ready"},
-        {"action_type": "CONDITIONAL", "parameters": {"condition": "has_search_query"}, "description": "Check action type"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+l"}, "description": "Focus search/input"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{action_content}"}, "description": "Enter: {action_content}"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Execute"},
-        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for results"},
-        {"action_type": "SCREEN_ANALYSIS", "parameters": {"target": "{action_content}"}, "description": "Click on result"},
-    ],
-    "MEDIA_CONTROL": [
-        *STEP_TEMPLATES["open_app_windows"],
-        {"action_type": "WAIT", "parameters": {"duration": 4}, "description": "Wait for media app"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+k"}, "description": "Focus search"},
-        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for search"},
-        {"action_type": "TYPE_TEXT", "parameters": {"text": "{media_query}"}, "description": "Search: {media_query}"},
-        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for search"},
-        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Play"},
-    ],
-    "SEND_MESSAGE": [
-        *STEP_TEMPLATES["open_app_windows"],
-        {"action_type": "WAIT", "parameters": {"duration": 3}, "description": "Wait for app to load"},
-        *STEP_TEMPLATES["whatsapp_open_chat"],
-    ],
-    "SEND_MESSAGE_PHASE_2": [
-        *STEP_TEMPLATES["type_and_send_message"],
-    ],
-}
-
 # ----------------- Utility: asset path helper -----------------
 def asset_path(name: str) -> str:
     base, ext = os.path.splitext(name)
@@ -441,6 +323,8 @@ class PasscodeDialog(QDialog):
     Full-screen passcode dialog. Default passcode is loaded from passcode_store.json (1304 if not present).
     Includes 'Forgot / Reset' flow that uses SMTP via config or a dev fallback showing OTP on screen.
     """
+    face_unlocked = Signal(str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.Window | Qt.FramelessWindowHint)
@@ -550,12 +434,36 @@ class PasscodeDialog(QDialog):
         else:
             QMessageBox.critical(self, "Error", "Failed to save new passcode. Try again.")
 
+    def start_background_face_unlock(self, timeout=6.0):
+        """
+        Try face unlock on a background thread while the passcode prompt is already usable.
+        cv2 and the LBPH model load off the UI thread; a match accepts the dialog.
+        """
+        def on_unlocked(name):
+            print(f"Face unlock success: {name}")
+            self.accept()
+
+        def work():
+            try:
+                from vision.face_auth import FaceAuthenticator
+                fa = FaceAuthenticator(known_faces_dir=os.path.join(os.getcwd(), "known_faces"))
+                res = fa.authenticate(camera_index=0, timeout=timeout, required_matches=2)
+                if res:
+                    self.face_unlocked.emit(res[0])
+            except Exception as e:
+                # silent fallback to passcode if camera fails or face_auth import fails
+                print(f"Face auth attempt failed: {e}")
+
+        self.face_unlocked.connect(on_unlocked)
+        threading.Thread(target=work, daemon=True).start()
+
     def _try_face_unlock(self):
         """
         Attempts local face unlock using vision.face_auth.FaceAuthenticator.
         Shows a message box on success/failure. This uses a short-lived FaceAuthenticator instance.
         """
         try:
+            from vision.face_auth import FaceAuthenticator
             fa = FaceAuthenticator(known_faces_dir=os.path.join(os.getcwd(), "known_faces"))
         except Exception as e:
             QMessageBox.warning(self, "Face Unlock", f"FaceAuth not available: {e}")
@@ -768,58 +676,150 @@ class EvaGui(QWidget):
 
     # ---------- Backend init ----------
     def _init_backend_async(self):
-        def work():
-            try:
-                self.bus.log.emit("Initializing backend components...\n")
-                self.executor_bridge = ExecutorBridge()
-                self.system_executor = SystemExecutor(self.executor_bridge)
-                self.screenshot_handler = ScreenshotHandler()
-                self.bus.log.emit("✓ Execution engine loaded.\n")
-
-                self.screen_analyzer = ScreenAnalyzer(config.GEMINI_API_KEY)
-                self.omniparser = OmniParserExecutor()
-                self.action_router = ActionRouter(
-                    self.system_executor, self.screenshot_handler, self.screen_analyzer, self.omniparser
-                )
-                self.vision_enabled = True
-                self.bus.log.emit("✓ Vision system loaded successfully.\n")
+        """
+        Build backend components as a dependency graph on a thread pool.
+
+        Each component becomes usable as soon as its own dependencies are ready:
+        the classifier and wake word detector do not wait for OmniParser, and
+        non-vision steps run before the vision models finish loading.
+        """
+        def loaded(name, status, seconds, error):
+            if status == "ok":
+                self.bus.log.emit(f"✓ {name} ready ({seconds:.1f}s)\n")
+            elif status == "failed":
+                self.bus.log.emit(f"❌ {name} failed: {error}\n")
+            else:
+                self.bus.log.emit(f"⚠️ {name} skipped: {error}\n")
 
-                self.wake_word_detector = WakeWordDetector()
-                self.bus.log.emit("✓ Wake word detector loaded successfully.\n")
+        def executor():
+            from execution.executor_backend import create_executor
+            self.executor_bridge, self.system_executor, self.screenshot_handler = create_executor()
 
-                # Face authentication (non-blocking load)
-                try:
-                    self.face_auth = FaceAuthenticator(
-                        known_faces_dir=os.path.join(os.getcwd(), "known_faces"),
-                    )
-                    self.bus.log.emit("✓ FaceAuthenticator loaded.\n")
-                except Exception as e:
-                    self.face_auth = None
-                    self.bus.log.emit(f"⚠️ FaceAuthenticator not available: {e}\n")
-
-
-                # Train classifier
-                self.vectorizer = TfidfVectorizer()
-                self.classifier = LogisticRegression()
-                X, y = zip(*MODEL1_TRAINING_DATA)
-                X_vectorized = self.vectorizer.fit_transform(X)
-                self.classifier.fit(X_vectorized, y)
-                self.bus.log.emit("✓ Command classifier trained.\n")
-                self.bus.log.emit("Ready to receive commands.\n")
-            except Exception as e:
-                msg = (
-                    "❌ CRITICAL ERROR: Could not initialize backend.\n"
-                    f"{e}\nVision features will be disabled.\n"
-                    "Check your .env for GEMINI_API_KEY and ensure all model weights are downloaded.\n"
+        def screen_analyzer():
+            if config.EXECUTOR_BACKEND in ("dry_run", "simulator"):
+                from execution.dry_run_executor import CannedSelector
+                self.screen_analyzer = CannedSelector()
+                return
+            from vision.screen_analyzer import ScreenAnalyzer
+            self.screen_analyzer = ScreenAnalyzer(config.GEMINI_API_KEY)
+
+        def layout_memory():
+            from vision.layout_memory import LayoutMemory
+            self.layout_memory = LayoutMemory() if config.LAYOUT_MEMORY_ENABLED else None
+
+        def app_index():
+            # Cached index serves lookups immediately; the incremental rescan runs behind it
+            from execution.app_index import AppIndex
+            self.app_index = AppIndex().load() if config.APP_INDEX_ENABLED else None
+            if self.app_index:
+                self.app_index.refresh_async()
+
+        def router():
+            # Vision steps inside the router wait on the "vision" event until OmniParser is up
+            from execution.action_router import ActionRouter
+            self.action_router = ActionRouter(
+                self.system_executor, self.screenshot_handler, self.screen_analyzer, None,
+                layout_memory=self.layout_memory, vision_ready=self.startup.event("vision"),
+                app_index=self.app_index,
+            )
+
+        def omniparser():
+            if config.EXECUTOR_BACKEND == "dry_run":
+                from execution.dry_run_executor import CannedParser
+                self.omniparser = CannedParser(self.screenshot_handler)
+                return
+            if config.EXECUTOR_BACKEND == "simulator" and not config.SIMULATOR_OMNIPARSER:
+                from execution.desktop_simulator import SimulatedParser
+                self.omniparser = SimulatedParser(self.screenshot_handler)
+                return
+            from vision.omniparser_executor import OmniParserExecutor
+            from vision.resolution_policy import ResolutionPolicy
+            resolution_policy = (
+                ResolutionPolicy(config.RESOLUTION_TARGET_TEXT_PX, config.RESOLUTION_MIN_SCALE,
+                                 detector_imgsz=config.RESOLUTION_DETECTOR_IMGSZ)
+                if config.RESOLUTION_POLICY_ENABLED else None
+            )
+            self.omniparser = OmniParserExecutor(
+                service_url=config.PARSE_SERVICE_URL, resolution_policy=resolution_policy
+            )
+
+        def vision():
+            from execution.speculative_parser import SpeculativeParser
+            from vision.screen_indexer import ScreenIndexer
+            self.speculative_parser = (
+                SpeculativeParser(self.screenshot_handler, self.omniparser)
+                if config.SPECULATIVE_PARSE_ENABLED else None
+            )
+            self.screen_indexer = None
+            if config.SCREEN_INDEXER_ENABLED:
+                self.screen_indexer = ScreenIndexer(self.screenshot_handler, self.omniparser)
+                self.screen_indexer.start()
+            self.action_router.attach_vision(self.omniparser, self.speculative_parser, self.screen_indexer)
+            self.vision_enabled = True
+
+        def wake_word():
+            from speech.wake_word_detector import WakeWordDetector
+            self.wake_word_detector = WakeWordDetector()
+
+        def face_auth():
+            try:
+                from vision.face_auth import FaceAuthenticator
+                self.face_auth = FaceAuthenticator(
+                    known_faces_dir=os.path.join(os.getcwd(), "known_faces"),
+                )
+            except Exception:
+                self.face_auth = None
+                raise
+
+        def classifier():
+            from models.intent_model_cache import IntentModelCache
+            self.intent_model = IntentModelCache(
+                MODEL1_TRAINING_DATA,
+                on_swap=lambda meta: self.bus.log.emit(
+                    f"✓ Command classifier retrained on {meta['examples']} examples ({meta['fit_seconds']:.2f}s).\n"
+                ),
+            )
+            self.intent_model.load_or_train()
+            get_extractor().add_many("contact", list(config.CONTACT_PHONE_NUMBERS))
+            self.bus.log.emit("Ready to receive commands.\n")
+
+        self.startup = StartupGraph(max_workers=4, listener=loaded)
+        self.startup.add("executor", executor)
+        self.startup.add("screen_analyzer", screen_analyzer)
+        self.startup.add("layout_memory", layout_memory)
+        # Headless parsers read the executor's canned/simulated screens
+        self.startup.add("omniparser", omniparser, deps=("executor",) if config.EXECUTOR_BACKEND != "native" else ())
+        self.startup.add("app_index", app_index)
+        self.startup.add("router", router, deps=("executor", "screen_analyzer", "layout_memory", "app_index"))
+        self.startup.add("vision", vision, deps=("router", "omniparser"))
+        self.startup.add("wake_word", wake_word)
+        self.startup.add("face_auth", face_auth)
+        self.startup.add("classifier", classifier)
+
+        def finished():
+            self.startup.done.wait()
+            self.bus.log.emit(self.startup.format_report() + "\n")
+            self.bus.log.emit(get_registry().format_status() + "\n")
+            profiler = import_profiler()
+            if profiler:
+                profiler.write(os.path.join(config.LOG_DIR, "import_profile.txt"))
+                self.bus.log.emit(profiler.format_report(top=15) + "\n")
+            if not self.startup.is_ready("vision"):
+                self.bus.log.emit(
+                    "Vision features are disabled. Check your .env for GEMINI_API_KEY "
+                    "and ensure all model weights are downloaded.\n"
                 )
-                self.bus.log.emit(msg)
-        threading.Thread(target=work, daemon=True).start()
+
+        self.bus.log.emit("Initializing backend components...\n")
+        self.startup.run()
+        threading.Thread(target=finished, daemon=True).start()
 
     def _start_wake_word_thread(self):
         def work():
-            # ensure backend wake_word_detector exists
-            while not hasattr(self, "wake_word_detector"):
-                time.sleep(0.2)
+            import speech_recognition as sr
+            if not self.startup.wait("wake_word"):
+                self.bus.status.emit("Wake word detector unavailable - type your commands.")
+                return
             self.wake_word_detector.start()
             while True:
                 if not self._is_awake:
@@ -880,6 +880,10 @@ class EvaGui(QWidget):
         self._clear_log()
         self.bus.log.emit(f"Processing command: \"{prompt}\"\n\n")
 
+        if not self.startup.wait("classifier"):
+            self.bus.log.emit("⚠️ Command classifier failed to load!")
+            return
+
         self.current_model1_result = self._analyze_query_with_model(prompt)
         if not self.current_model1_result:
             self.bus.log.emit("⚠️ Error analyzing command!")
@@ -916,6 +920,7 @@ class EvaGui(QWidget):
             self.current_steps = steps_phase1
             self._execute_steps()
 
+            import speech_recognition as sr
             self.bus.status.emit("What message do you want to send?")
             recognizer = sr.Recognizer()
             with sr.Microphone() as source:
@@ -938,10 +943,13 @@ class EvaGui(QWidget):
                     self.bus.status.emit(f"Could not request results; {e}. Cancelling.")
 
     def _execute_steps(self):
-        if not self.current_steps or not self.action_router:
+        if not self.current_steps:
             return
         self.bus.log.emit("\nEXECUTING STEPS...\n" + "-"*40 + "\n")
         def work():
+            if not self.startup.wait("router"):
+                self.bus.exec_done.emit({"success": False, "error": "Execution engine failed to initialize"})
+                return
             result = self.action_router.execute(
                 self.current_model1_result['command_type'],
                 self.current_steps,
@@ -995,220 +1003,16 @@ class EvaGui(QWidget):
     # ---------- Model & NLP ----------
     def _analyze_query_with_model(self, query):
         try:
-            query_vectorized = self.vectorizer.transform([query.lower()])
-            prediction = self.classifier.predict(query_vectorized)
-            confidence = self.classifier.predict_proba(query_vectorized).max()
-            return {
-                "input": query,
-                "command_type": prediction[0],
-                "confidence": confidence,
-                "training_pattern": "Local Model Analysis",
-            }
+            return classify(self.intent_model, query)
         except Exception as e:
             print(f"Error analyzing query with model: {e}")
             return None
 
     def _extract_keywords_by_command_type(self, raw_command, command_type):
-        raw_command_lower = raw_command.lower().strip()
-        words = raw_command_lower.split()
-        extracted = {
-            'app_name': None, 'search_query': None, 'text_content': None, 'action_target': None, 'keyboard_shortcut': None,
-            'system_action': None, 'window_action': None, 'profile_name': None, 'website': None, 'media_query': None,
-            'recipient': None, 'message_content': None, 'action_content': None, 'is_file_operation': False, 'file_path': None,
-            'target_type': None, 'is_known_folder': False, 'needs_search': False, 'search_target': None, 'has_message_content': False,
-        }
-        if command_type == "OPEN_APP":
-            trigger = ['open', 'launch', 'start', 'run']
-            extracted['app_name'] = self._extract_app_name(words, trigger)
-        elif command_type == "CLOSE_APP":
-            trigger = ['close', 'exit', 'quit']
-            extracted['app_name'] = self._extract_app_name(words, trigger) or 'current'
-        elif command_type == "OPEN_FOLDER":
-            is_file_op, target_name, target_type, is_known = self._extract_file_or_folder_path(words, raw_command_lower)
-            if is_known:
-                extracted['file_path'] = target_name
-            else:
-                extracted['search_target'] = target_name
-        elif command_type == "SEARCH_FILE":
-            is_file_op, target_name, target_type, is_known = self._extract_file_or_folder_path(words, raw_command_lower)
-            extracted['search_target'] = target_name
-        elif command_type == "WEB_SEARCH":
-            extracted['profile_name'] = self._extract_profile_name(raw_command_lower)
-            website, query = self._extract_website_and_action(raw_command_lower)
-            extracted['website'] = website
-            extracted['search_query'] = query
-        elif command_type == "TYPE_TEXT":
-            extracted['text_content'] = self._extract_text_after_keywords(raw_command.split(), ['type', 'write', 'enter'], {'text', 'message'})
-        elif command_type in ["MOUSE_CLICK", "MOUSE_RIGHTCLICK", "MOUSE_DOUBLECLICK"]:
-            skip = {'click', 'on', 'here', 'it', 'this', 'right', 'double'}
-            extracted['action_target'] = ' '.join([w for w in raw_command.split() if w.lower() not in skip]) or 'current'
-        elif command_type == "WINDOW_ACTION":
-            extracted['window_action'] = 'maximize' if any(w in raw_command.lower().split() for w in ['maximize', 'fullscreen']) else 'minimize'
-        elif command_type == "KEYBOARD":
-            shortcuts = {'copy': 'ctrl+c', 'paste': 'ctrl+v', 'save': 'ctrl+s', 'undo': 'ctrl+z'}
-            for word, shortcut in shortcuts.items():
-                if word in raw_command_lower:
-                    extracted['keyboard_shortcut'] = shortcut
-                    break
-        elif command_type == "SYSTEM":
-            extracted['system_action'] = 'screenshot' if 'screenshot' in raw_command_lower or 'capture' in raw_command_lower else 'lock'
-        elif command_type == "APP_WITH_ACTION":
-            if 'and' in raw_command_lower:
-                and_idx = raw_command_lower.split().index('and')
-                extracted['app_name'] = self._extract_app_name(raw_command.split()[:and_idx], ['open', 'launch', 'start'])
-                extracted['action_content'] = ' '.join([w for w in raw_command.split()[and_idx+1:] if w.lower() not in ['search', 'type', 'play']])
-        elif command_type == "MEDIA_CONTROL":
-            apps = ['spotify', 'netflix', 'youtube', 'vlc']
-            app_name = next((app for app in apps if app in raw_command_lower), 'spotify')
-            extracted['app_name'] = app_name
-            play_idx = -1
-            if 'play' in raw_command_lower:
-                play_idx = raw_command_lower.split().index('play')
-            elif 'stream' in raw_command_lower:
-                play_idx = raw_command_lower.split().index('stream')
-            if play_idx != -1:
-                extracted['media_query'] = ' '.join(raw_command.split()[play_idx+1:])
-        elif command_type == "SEND_MESSAGE":
-            apps_map = {
-                'whatsapp': 'whatsapp', 'email': 'outlook', 'social': 'facebook', 'twitter': 'twitter',
-                'instagram': 'instagram', 'telegram': 'telegram',
-            }
-            extracted['app_name'] = next((v for k, v in apps_map.items() if k in raw_command_lower), 'whatsapp')
-
-            match = re.search(r'send\s+(.*?)\s+to\s+(.*)', raw_command, re.IGNORECASE)
-            if match:
-                extracted['message_content'] = match.group(1)
-                extracted['recipient'] = match.group(2)
-                return extracted
-
-            match = re.search(r'to\s+(.*?)\s+(?:message|saying|that)\s+(.*)', raw_command, re.IGNORECASE)
-            if match:
-                extracted['recipient'] = match.group(1)
-                extracted['message_content'] = match.group(2)
-                return extracted
-
-            match = re.search(r'to\s+(\w+)\s+(.*)', raw_command, re.IGNORECASE)
-            if match:
-                extracted['recipient'] = match.group(1)
-                extracted['message_content'] = match.group(2)
-                return extracted
-
-            if 'to' in raw_command_lower:
-                to_idx = raw_command_lower.split().index('to')
-                extracted['recipient'] = ' '.join(raw_command.split()[to_idx + 1:])
-
-        return extracted
+        return extract_keywords(raw_command, command_type)
 
     def _generate_steps_model2(self, command_type, extracted_keywords):
-        if command_type not in MODEL2_STEP_RULES:
-            return [{"action_type": "EXECUTE", "parameters": {}, "description": f"Execute: {command_type}"}]
-        steps_template = MODEL2_STEP_RULES[command_type]
-        generated_steps = []
-        for step in steps_template:
-            if step.get("action_type") == "CONDITIONAL":
-                condition = step["parameters"].get("condition")
-                if condition == "search_query_exists":
-                    if not extracted_keywords.get('search_query'):
-                        break
-                    else:
-                        continue
-                if condition == "has_search_query":
-                    if not extracted_keywords.get('action_content'):
-                        break
-                    else:
-                        continue
-                if condition == "has_message_content":
-                    if not extracted_keywords.get('message_content'):
-                        break
-                    else:
-                        continue
-                continue
-            step_copy = {"action_type": step["action_type"], "parameters": dict(step["parameters"]), "description": step["description"]}
-            replacements = {
-                "{app_name}": extracted_keywords.get('app_name', 'app'), "{website}": extracted_keywords.get('website', ''),
-                "{profile_name}": extracted_keywords.get('profile_name', 'Default'), "{search_query}": extracted_keywords.get('search_query', ''),
-                "{text_content}": extracted_keywords.get('text_content', ''), "{action_target}": extracted_keywords.get('action_target', 'target'),
-                "{keyboard_shortcut}": extracted_keywords.get('keyboard_shortcut', ''), "{system_action}": extracted_keywords.get('system_action', ''),
-                "{window_action}": extracted_keywords.get('window_action', ''), "{media_query}": extracted_keywords.get('media_query', ''),
-                "{recipient}": extracted_keywords.get('recipient', ''), "{message_content}": extracted_keywords.get('message_content', ''),
-                "{action_content}": extracted_keywords.get('action_content', ''), "{file_path}": extracted_keywords.get('file_path', ''),
-            }
-            for key, value in step_copy["parameters"].items():
-                if isinstance(value, str):
-                    for placeholder, replacement in replacements.items():
-                        value = value.replace(placeholder, str(replacement or ''))
-                    step_copy["parameters"][key] = value
-            for placeholder, replacement in replacements.items():
-                step_copy["description"] = step_copy["description"].replace(placeholder, str(replacement or ''))
-            generated_steps.append(step_copy)
-        return generated_steps
-
-    # ---------- small helpers ----------
-    def _extract_profile_name(self, text):
-        patterns = [
-            r'with chrome profile ([\w\s]+?)(?:\s+(?:search|open|go|and))', r'chrome profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-            r'with profile ([\w\s]+?)(?:\s+(?:search|open|go|and))', r'use profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-            r'profile ([\w\s]+?)(?:\s+(?:search|open|go|and))',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return "Default"
-
-    def _extract_website_and_action(self, text):
-        websites = {
-            'youtube': 'youtube.com', 'google': 'google.com', 'gmail': 'mail.google.com', 'facebook': 'facebook.com',
-            'twitter': 'twitter.com', 'instagram': 'instagram.com', 'linkedin': 'linkedin.com', 'github': 'github.com',
-            'reddit': 'reddit.com', 'amazon': 'amazon.com', 'netflix': 'netflix.com', 'spotify': 'open.spotify.com',
-        }
-        text_l = text.lower()
-        website = None
-        for keyword, url in websites.items():
-            if keyword in text_l:
-                website = url
-                break
-        query_text = text_l
-        for pattern in [r'with chrome profile [\w\s]+', r'chrome profile [\w\s]+', r'profile [\w\s]+']:
-            query_text = re.sub(pattern, '', query_text)
-        skip_words = {'with', 'chrome', 'search', 'for', 'open', 'go', 'to', 'on', 'in', 'and', 'youtube', 'google', 'gmail', 'facebook', 'profile'}
-        query_words = [w for w in query_text.split() if w not in skip_words and w.strip()]
-        return website, ' '.join(query_words) if query_words else None
-
-    def _extract_app_name(self, words, trigger_words):
-        for trigger in trigger_words:
-            if trigger in words:
-                idx = words.index(trigger)
-                app_words = [w for w in words[idx+1:] if w not in ['app', 'application', 'program']]
-                if app_words:
-                    return ' '.join(app_words)
-        return None
-
-    def _extract_text_after_keywords(self, words, keywords, skip_words):
-        for keyword in keywords:
-            if keyword in words:
-                idx = words.index(keyword)
-                text_words = [w for w in words[idx+1:] if w not in skip_words]
-                if text_words:
-                    return ' '.join(text_words)
-        return None
-
-    def _extract_file_or_folder_path(self, words, raw_command):
-        common_folders = {
-            'documents': r'%USERPROFILE%\Documents', 'downloads': r'%USERPROFILE%\Downloads', 'desktop': r'%USERPROFILE%\Desktop',
-            'pictures': r'%USERPROFILE%\Pictures', 'videos': r'%USERPROFILE%\Videos', 'music': r'%USERPROFILE%\Music',
-        }
-        for folder_keyword, folder_path in common_folders.items():
-            if folder_keyword in words:
-                return True, folder_path, 'folder', True
-        skip_words = {'open', 'file', 'folder', 'document', 'my', 'the', 'launch', 'show', 'browse', 'to', 'for', 'find'}
-        target_words = [w for w in words if w not in skip_words]
-        if target_words:
-            target_name = ' '.join(target_words)
-            target_type = 'folder' if 'folder' in words or 'directory' in words else 'file'
-            return True, target_name, target_type, False
-        return False, None, None, False
-
+        return generate_steps(command_type, extracted_keywords)
 
 def main():
     # show passcode dialog first
@@ -1217,9 +1021,22 @@ def main():
     # Ensure passcode file exists (initializes default 1304 if not present)
     load_stored_passcode()
 
+    if config.FAST_START_ENABLED:
+        # Passcode prompt first; heavy modules and face unlock load behind it
+        BackgroundImporter(BACKGROUND_IMPORTS).start()
+        passcode_dialog = PasscodeDialog()
+        passcode_dialog.start_background_face_unlock()
+        if passcode_dialog.exec() != QDialog.Accepted:
+            sys.exit(0)
+
+        ui = EvaGui()
+        ui.show()
+        sys.exit(app.exec())
+
     # Quick face unlock attempt before showing passcode dialog
     unlocked_by_face = False
     try:
+        from vision.face_auth import FaceAuthenticator
         fa = FaceAuthenticator(known_faces_dir=os.path.join(os.getcwd(), "known_faces"))
         res = fa.authenticate(camera_index=0, timeout=6.0, required_matches=2)
         if res:
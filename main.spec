@@ -6,7 +6,33 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # Imported lazily at runtime (see BACKGROUND_IMPORTS in main.py)
+    hiddenimports=[
+        'sklearn.feature_extraction.text',
+        'sklearn.linear_model',
+        'joblib',
+        'models.intent_model_cache',
+        'models.intent_predictor',
+        'speech_recognition',
+        'vision.face_auth',
+        'execution.window_watcher',
+        'execution.window_registry',
+        'execution.text_injector',
+        'execution.executor_backend',
+        'execution.executor_bridge',
+        'execution.system_executor',
+        'execution.app_index',
+        'execution.deep_links',
+        'execution.action_router',
+        'execution.speculative_parser',
+        'vision.screenshot_handler',
+        'vision.screen_analyzer',
+        'vision.layout_memory',
+        'vision.resolution_policy',
+        'vision.screen_indexer',
+        'speech.wake_word_detector',
+        'vision.omniparser_executor',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
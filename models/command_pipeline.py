@@ -0,0 +1,311 @@
+"""
+Command Pipeline - classification data, entity extraction and step generation
+The non-UI half of the EVA pipeline (model 1 training data, model 2 step
+templates) shared by the Qt GUI and the headless batch runner (headless.py).
+"""
+
+import config
+from models.entity_extractor import FILE_SKIP_WORDS, TOKEN_PUNCTUATION, get_extractor
+
+MODEL1_TRAINING_DATA = [
+    ("open application", "OPEN_APP"), ("launch program", "OPEN_APP"), ("start software", "OPEN_APP"),
+    ("run app", "OPEN_APP"), ("open app", "OPEN_APP"), ("open chrome", "OPEN_APP"), ("launch spotify", "OPEN_APP"),
+    ("close application", "CLOSE_APP"), ("close this", "CLOSE_APP"), ("close window", "CLOSE_APP"),
+    ("exit application", "CLOSE_APP"), ("quit app", "CLOSE_APP"),
+    ("open file explorer", "OPEN_FILE_EXPLORER"), ("open file manager", "OPEN_FILE_EXPLORER"),
+    ("search for file", "SEARCH_FILE"), ("find document", "SEARCH_FILE"),
+    ("open documents", "OPEN_FOLDER"), ("open downloads", "OPEN_FOLDER"), ("open pictures", "OPEN_FOLDER"),
+    ("type text", "TYPE_TEXT"), ("write something", "TYPE_TEXT"), ("enter text", "TYPE_TEXT"),
+    ("click on something", "MOUSE_CLICK"), ("click here", "MOUSE_CLICK"),
+    ("right click", "MOUSE_RIGHTCLICK"), ("double click", "MOUSE_DOUBLECLICK"),
+    ("maximize window", "WINDOW_ACTION"), ("minimize window", "WINDOW_ACTION"), ("fullscreen mode", "WINDOW_ACTION"),
+    ("take screenshot", "SYSTEM"), ("lock screen", "SYSTEM"),
+    ("copy", "KEYBOARD"), ("paste", "KEYBOARD"), ("save", "KEYBOARD"), ("undo", "KEYBOARD"),
+    ("open app and search", "APP_WITH_ACTION"), ("launch app and type", "APP_WITH_ACTION"),
+    ("open app and play", "APP_WITH_ACTION"), ("start app and compose", "APP_WITH_ACTION"),
+    ("play music", "MEDIA_CONTROL"), ("play video", "MEDIA_CONTROL"), ("stream music", "MEDIA_CONTROL"), ("stream video", "MEDIA_CONTROL"),
+    ("open spotify and play", "MEDIA_CONTROL"), ("open youtube and play", "MEDIA_CONTROL"),
+    ("send whatsapp to", "SEND_MESSAGE"), ("send message to", "SEND_MESSAGE"), ("whatsapp to", "SEND_MESSAGE"),
+    ("email to", "SEND_MESSAGE"), ("post on social", "SEND_MESSAGE"), ("message to", "SEND_MESSAGE"),
+    ("whatsapp mom", "SEND_MESSAGE"), ("email john", "SEND_MESSAGE"),
+    ("search for something", "WEB_SEARCH"), ("google something", "WEB_SEARCH"), ("youtube search", "WEB_SEARCH"),
+    ("open youtube", "WEB_SEARCH"), ("profile work search python", "WEB_SEARCH"), ("with profile personal search", "WEB_SEARCH"),
+    ("chrome profile dev open youtube", "WEB_SEARCH"), ("open gmail", "WEB_SEARCH"), ("go to facebook", "WEB_SEARCH"),
+    ("search amazon", "WEB_SEARCH"),
+]
+
+STEP_TEMPLATES = {
+    "open_app_windows": [
+        # Spawns the indexed executable and returns once its window is up (Start menu + fixed wait if not indexed)
+        {"action_type": "LAUNCH_DIRECT", "parameters": {"app_name": "{app_name}"}, "description": "Launch {app_name}"},
+    ],
+    "search_file_explorer": [
+        {"action_type": "PRESS_KEY", "parameters": {"key": "win+e"}, "description": "Open File Explorer"},
+        {"action_type": "WAIT_FOR_WINDOW", "parameters": {"class_name": "CabinetWClass", "foreground": True, "timeout": 5}, "description": "Wait for Explorer"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+f"}, "description": "Focus search box"},
+        {"action_type": "WAIT", "parameters": {"duration": 0.5}, "description": "Wait for search box"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "{search_target}"}, "description": "Search for: {search_target}"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Execute search"},
+        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for search results"},
+        {"action_type": "SCREEN_ANALYSIS", "parameters": {"target": "{search_target}"}, "description": "Click on first result"},
+    ],
+    "chrome_with_profile": [
+        {"action_type": "PRESS_KEY", "parameters": {"key": "win"}, "description": "Open Start Menu"},
+        {"action_type": "WAIT", "parameters": {"duration": 0.5}, "description": "Wait for menu"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "chrome"}, "description": "Type Chrome"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Launch Chrome"},
+        {"action_type": "WAIT_FOR_WINDOW", "parameters": {"title": "Chrome"}, "description": "Wait for Chrome window"},
+        {"action_type": "SCREEN_ANALYSIS", "parameters": {"profile_name": "{profile_name}"}, "description": "Select profile: {profile_name}"},
+        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Profile loaded"},
+    ],
+    "navigate_to_website": [
+        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+l"}, "description": "Focus address bar"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "{website}"}, "description": "Go to: {website}"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Navigate"},
+        {"action_type": "WAIT", "parameters": {"duration": 2.5}, "description": "Wait for page load"},
+    ],
+    "search_on_page": [
+        {"action_type": "PRESS_KEY", "parameters": {"key": "/"}, "description": "Focus search"},
+        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for results"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "{search_query}"}, "description": "Type: {search_query}"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Search"},
+        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for results"},
+        {"action_type": "SCREEN_ANALYSIS", "parameters": {"target": "{search_query}"}, "description": "Click on result"},
+    ],
+    "whatsapp_open_chat": [
+        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+f"}, "description": "New chat"},
+        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for search"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "{recipient}"}, "description": "Search: {recipient}"},
+        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for search results"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "tab"}, "description": "Press Tab"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Press Enter"},
+    ],
+    "type_and_send_message": [
+        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait before typing"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "{message_content}"}, "description": "Type message"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Send message"},
+    ],
+}
+
+# OPEN_FOLDER / SEARCH_FILE commands also say "find ... for"
+FOLDER_SKIP_WORDS = FILE_SKIP_WORDS | {'for', 'find'}
+
+MODEL2_STEP_RULES = {
+    "OPEN_APP": STEP_TEMPLATES["open_app_windows"],
+    "CLOSE_APP": [{"action_type": "PRESS_KEY", "parameters": {"key": "alt+f4"}, "description": "Close window"}],
+    "OPEN_FILE_EXPLORER": [{"action_type": "PRESS_KEY", "parameters": {"key": "win+e"}, "description": "Open File Explorer"}],
+    "SEARCH_FILE": [*STEP_TEMPLATES["search_file_explorer"]],
+    "OPEN_FOLDER": [
+        {"action_type": "PRESS_KEY", "parameters": {"key": "win+e"}, "description": "Open File Explorer"},
+        {"action_type": "WAIT_FOR_WINDOW", "parameters": {"class_name": "CabinetWClass", "foreground": True, "timeout": 5}, "description": "Wait for Explorer"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+l"}, "description": "Focus address bar"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "{file_path}"}, "description": "Navigate to folder"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Open folder"},
+    ],
+    "WEB_SEARCH": [
+        *STEP_TEMPLATES["chrome_with_profile"],
+        *STEP_TEMPLATES["navigate_to_website"],
+        {"action_type": "CONDITIONAL", "parameters": {"condition": "search_query_exists"}, "description": "Check search needed"},
+        *STEP_TEMPLATES["search_on_page"],
+    ],
+    "TYPE_TEXT": [{"action_type": "TYPE_TEXT", "parameters": {"text": "{text_content}"}, "description": "Type: {text_content}"}],
+    "FOCUS_WINDOW": [{"action_type": "FOCUS_WINDOW", "parameters": {"title": "{app_name}"}, "description": "Focus: {app_name}"}],
+    "MOUSE_CLICK": [{"action_type": "SCREEN_ANALYSIS", "parameters": {"target": "{action_target}"}, "description": "Click: {action_target}"}],
+    "MOUSE_RIGHTCLICK": [{"action_type": "MOUSE_RIGHTCLICK", "parameters": {}, "description": "Right click"}],
+    "MOUSE_DOUBLECLICK": [{"action_type": "MOUSE_DOUBLECLICK", "parameters": {}, "description": "Double click"}],
+    "WINDOW_ACTION": [{"action_type": "PRESS_KEY", "parameters": {"key": "win+up"}, "description": "Window action: {window_action}"}],
+    "KEYBOARD": [{"action_type": "PRESS_KEY", "parameters": {"key": "{keyboard_shortcut}"}, "description": "Press: {keyboard_shortcut}"}],
+    "SYSTEM": [{"action_type": "SYSTEM_ACTION", "parameters": {"action": "{system_action}"}, "description": "System: {system_action}"}],
+    "APP_WITH_ACTION": [
+        *STEP_TEMPLATES["open_app_windows"],
+        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for app ready"},
+        {"action_type": "CONDITIONAL", "parameters": {"condition": "has_search_query"}, "description": "Check action type"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+l"}, "description": "Focus search/input"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "{action_content}"}, "description": "Enter: {action_content}"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Execute"},
+        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for results"},
+        {"action_type": "SCREEN_ANALYSIS", "parameters": {"target": "{action_content}"}, "description": "Click on result"},
+    ],
+    "MEDIA_CONTROL": [
+        *STEP_TEMPLATES["open_app_windows"],
+        {"action_type": "WAIT_FOR_WINDOW", "parameters": {"title": "{app_name}"}, "description": "Wait for {app_name} window"},
+        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for media app content"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "ctrl+k"}, "description": "Focus search"},
+        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for search"},
+        {"action_type": "TYPE_TEXT", "parameters": {"text": "{media_query}"}, "description": "Search: {media_query}"},
+        {"action_type": "WAIT", "parameters": {"duration": 2}, "description": "Wait for search"},
+        {"action_type": "PRESS_KEY", "parameters": {"key": "enter"}, "description": "Play"},
+    ],
+    "SEND_MESSAGE": [
+        *STEP_TEMPLATES["open_app_windows"],
+        {"action_type": "WAIT_FOR_WINDOW", "parameters": {"title": "{app_name}"}, "description": "Wait for {app_name} window"},
+        {"action_type": "WAIT", "parameters": {"duration": 1}, "description": "Wait for app content"},
+        *STEP_TEMPLATES["whatsapp_open_chat"],
+    ],
+    "SEND_MESSAGE_PHASE_2": [
+        *STEP_TEMPLATES["type_and_send_message"],
+    ],
+}
+
+
+def classify(intent_model, query):
+    """Model 1 result for an utterance: {'input', 'command_type', 'confidence', 'training_pattern'}"""
+    command_type, confidence = intent_model.predict(query.lower())
+    return {
+        "input": query,
+        "command_type": command_type,
+        "confidence": confidence,
+        "training_pattern": "Local Model Analysis",
+    }
+
+
+def extract_keywords(raw_command, command_type):
+    """Entities for a classified command (keys used by the MODEL2_STEP_RULES placeholders)"""
+    extractor = get_extractor()
+    parsed = extractor.parse(raw_command)
+    raw_command_lower = parsed.lower
+    extracted = {
+        'app_name': None, 'search_query': None, 'text_content': None, 'action_target': None, 'keyboard_shortcut': None,
+        'system_action': None, 'window_action': None, 'profile_name': None, 'website': None, 'media_query': None,
+        'recipient': None, 'message_content': None, 'action_content': None, 'is_file_operation': False, 'file_path': None,
+        'target_type': None, 'is_known_folder': False, 'needs_search': False, 'search_target': None, 'has_message_content': False,
+    }
+    if command_type == "OPEN_APP":
+        trigger = ['open', 'launch', 'start', 'run']
+        extracted['app_name'] = extractor.app_name(parsed, trigger)
+    elif command_type == "CLOSE_APP":
+        trigger = ['close', 'exit', 'quit']
+        extracted['app_name'] = extractor.app_name(parsed, trigger) or 'current'
+    elif command_type == "OPEN_FOLDER":
+        is_file_op, target_name, target_type, is_known = extractor.file_or_folder(
+            parsed, skip_words=FOLDER_SKIP_WORDS, require_indicator=False)
+        if is_known:
+            extracted['file_path'] = target_name
+        else:
+            extracted['search_target'] = target_name
+    elif command_type == "SEARCH_FILE":
+        is_file_op, target_name, target_type, is_known = extractor.file_or_folder(
+            parsed, skip_words=FOLDER_SKIP_WORDS, require_indicator=False)
+        extracted['search_target'] = target_name
+    elif command_type == "WEB_SEARCH":
+        extracted['profile_name'] = extractor.profile_name(raw_command_lower) or "Default"
+        website, query = extractor.website_and_query(parsed)
+        extracted['website'] = website
+        extracted['search_query'] = query
+    elif command_type == "TYPE_TEXT":
+        extracted['text_content'] = extractor.words_after(parsed, ['type', 'write', 'enter'], {'text', 'message'}, raw=True)
+    elif command_type in ["MOUSE_CLICK", "MOUSE_RIGHTCLICK", "MOUSE_DOUBLECLICK"]:
+        skip = {'click', 'on', 'here', 'it', 'this', 'right', 'double'}
+        extracted['action_target'] = ' '.join(
+            raw for raw, word in zip(parsed.raw_words, parsed.words) if word not in skip) or 'current'
+    elif command_type == "WINDOW_ACTION":
+        extracted['window_action'] = 'maximize' if parsed.has('maximize') or parsed.has('fullscreen') else 'minimize'
+    elif command_type == "KEYBOARD":
+        shortcuts = {'copy': 'ctrl+c', 'paste': 'ctrl+v', 'save': 'ctrl+s', 'undo': 'ctrl+z'}
+        for word, shortcut in shortcuts.items():
+            if word in raw_command_lower:
+                extracted['keyboard_shortcut'] = shortcut
+                break
+    elif command_type == "SYSTEM":
+        extracted['system_action'] = 'screenshot' if 'screenshot' in raw_command_lower or 'capture' in raw_command_lower else 'lock'
+    elif command_type == "APP_WITH_ACTION":
+        and_idx = parsed.index('and')
+        if and_idx != -1:
+            extracted['app_name'] = extractor.app_name(parsed, ['open', 'launch', 'start'], end=and_idx, raw=True)
+            extracted['action_content'] = ' '.join(
+                parsed.raw_words[i] for i in range(and_idx + 1, len(parsed.words))
+                if parsed.words[i] not in ('search', 'type', 'play'))
+    elif command_type == "MEDIA_CONTROL":
+        extracted['app_name'] = parsed.first('media_app', 'spotify')
+        play_idx = parsed.index('play')
+        if play_idx == -1:
+            play_idx = parsed.index('stream')
+        if play_idx != -1:
+            # "play X on spotify." -> "X": stop at the app named after the query
+            end = next((start for start, _, _ in parsed.entities.get('media_app', ()) if start > play_idx),
+                       len(parsed.words))
+            if end - 1 > play_idx and parsed.tokens[end - 1] in ('on', 'in', 'with'):
+                end -= 1
+            extracted['media_query'] = ' '.join(parsed.raw_words[play_idx+1:end]).strip(TOKEN_PUNCTUATION) or None
+    elif command_type == "SEND_MESSAGE":
+        extracted['app_name'] = parsed.first('messaging_app', 'whatsapp')
+
+        parts = extractor.message_parts(parsed)
+        if parts:
+            extracted['recipient'], extracted['message_content'] = parts
+            return extracted
+
+        to_idx = parsed.index('to')
+        if to_idx != -1:
+            extracted['recipient'] = (parsed.first('contact', start=to_idx + 1)
+                                      or ' '.join(parsed.raw_words[to_idx + 1:]))
+
+    return extracted
+
+
+def generate_steps(command_type, extracted_keywords, deep_links=None):
+    """
+    Executable steps for a command: a deep-link plan when one applies, else the
+    MODEL2_STEP_RULES template with placeholders filled and CONDITIONAL steps resolved.
+
+    Args:
+        deep_links: Try execution/deep_links.py plans first (default: config.DEEP_LINKS_ENABLED)
+    """
+    if config.DEEP_LINKS_ENABLED if deep_links is None else deep_links:
+        from execution.deep_links import get_planner
+        planned = get_planner().plan(command_type, extracted_keywords)
+        if planned:
+            return planned
+    if command_type not in MODEL2_STEP_RULES:
+        return [{"action_type": "EXECUTE", "parameters": {}, "description": f"Execute: {command_type}"}]
+    steps_template = MODEL2_STEP_RULES[command_type]
+    generated_steps = []
+    for step in steps_template:
+        if step.get("action_type") == "CONDITIONAL":
+            condition = step["parameters"].get("condition")
+            if condition == "search_query_exists":
+                if not extracted_keywords.get('search_query'):
+                    break
+                else:
+                    continue
+            if condition == "has_search_query":
+                if not extracted_keywords.get('action_content'):
+                    break
+                else:
+                    continue
+            if condition == "has_message_content":
+                if not extracted_keywords.get('message_content'):
+                    break
+                else:
+                    continue
+            continue
+        step_copy = {"action_type": step["action_type"], "parameters": dict(step["parameters"]), "description": step["description"]}
+        replacements = {
+            "{app_name}": extracted_keywords.get('app_name', 'app'), "{website}": extracted_keywords.get('website', ''),
+            "{profile_name}": extracted_keywords.get('profile_name', 'Default'), "{search_query}": extracted_keywords.get('search_query', ''),
+            "{text_content}": extracted_keywords.get('text_content', ''), "{action_target}": extracted_keywords.get('action_target', 'target'),
+            "{keyboard_shortcut}": extracted_keywords.get('keyboard_shortcut', ''), "{system_action}": extracted_keywords.get('system_action', ''),
+            "{window_action}": extracted_keywords.get('window_action', ''), "{media_query}": extracted_keywords.get('media_query', ''),
+            "{recipient}": extracted_keywords.get('recipient', ''), "{message_content}": extracted_keywords.get('message_content', ''),
+            "{action_content}": extracted_keywords.get('action_content', ''), "{file_path}": extracted_keywords.get('file_path', ''),
+        }
+        for key, value in step_copy["parameters"].items():
+            if isinstance(value, str):
+                for placeholder, replacement in replacements.items():
+                    value = value.replace(placeholder, str(replacement or ''))
+                step_copy["parameters"][key] = value
+        for placeholder, replacement in replacements.items():
+            step_copy["description"] = step_copy["description"].replace(placeholder, str(replacement or ''))
+        generated_steps.append(step_copy)
+    return generated_steps
+
+
+def plan_command(command_type, extracted_keywords, deep_links=None):
+    """
+    All steps for a command without user interaction: SEND_MESSAGE includes the
+    phase 2 (type and send) steps when the message content is already known.
+    """
+    steps = generate_steps(command_type, extracted_keywords, deep_links)
+    if command_type == "SEND_MESSAGE" and extracted_keywords.get('message_content'):
+        steps.extend(generate_steps("SEND_MESSAGE_PHASE_2", extracted_keywords, deep_links))
+    return steps
@@ -0,0 +1,278 @@
+"""
+Entity Extractor - compiled gazetteer for keyword extraction
+Websites, folders, media/messaging apps, installed apps and contacts live in
+one token-level Aho-Corasick automaton, so a command is tokenized once and
+every known entity is found in a single pass, however many entries are loaded.
+Tokens are matched without surrounding punctuation, and known domains
+("github.com", "www.youtube.com") match their site name.
+Shared by main.py, gui.py and EVA_TER.py.
+"""
+
+import logging
+import re
+import threading
+from collections import deque
+
+logger = logging.getLogger("EntityExtractor")
+
+WEBSITES = {
+    'youtube': 'youtube.com', 'google': 'google.com', 'gmail': 'mail.google.com', 'facebook': 'facebook.com',
+    'twitter': 'twitter.com', 'instagram': 'instagram.com', 'linkedin': 'linkedin.com', 'github': 'github.com',
+    'reddit': 'reddit.com', 'amazon': 'amazon.com', 'netflix': 'netflix.com', 'spotify': 'open.spotify.com',
+}
+
+COMMON_FOLDERS = {
+    'documents': r'%USERPROFILE%\Documents', 'downloads': r'%USERPROFILE%\Downloads', 'desktop': r'%USERPROFILE%\Desktop',
+    'pictures': r'%USERPROFILE%\Pictures', 'videos': r'%USERPROFILE%\Videos', 'music': r'%USERPROFILE%\Music',
+}
+
+MEDIA_APPS = {'spotify': 'spotify', 'netflix': 'netflix', 'youtube': 'youtube', 'vlc': 'vlc'}
+
+MESSAGING_APPS = {
+    'whatsapp': 'whatsapp', 'email': 'outlook', 'social': 'facebook', 'twitter': 'twitter',
+    'instagram': 'instagram', 'telegram': 'telegram',
+}
+
+FILE_INDICATORS = frozenset({'file', 'document', 'doc', 'pdf', 'image', 'video', 'folder', 'directory'})
+FILE_SKIP_WORDS = frozenset({'open', 'file', 'folder', 'document', 'my', 'the', 'launch', 'show', 'browse', 'to'})
+APP_SKIP_WORDS = frozenset({'app', 'application', 'program'})
+QUERY_SKIP_WORDS = frozenset({'with', 'chrome', 'search', 'for', 'open', 'go', 'to', 'on', 'in', 'and',
+                              'youtube', 'google', 'gmail', 'facebook', 'profile'})
+
+# Sentence punctuation dropped from token ends ("youtube." -> "youtube"); "c++" / "c#" keep theirs
+TOKEN_PUNCTUATION = '.,!?;:"\'()[]{}<>'
+DOMAIN_RE = re.compile(r'^(?:[a-z]+://)?(?:www\.)?([\w-]+(?:\.[\w-]+)+)/?$')
+
+# "[with] [chrome|use] profile <name> search|open|go|and ..." - every variant captures the same name
+PROFILE_RE = re.compile(r'profile ([\w\s]+?)(?:\s+(?:search|open|go|and))', re.IGNORECASE)
+PROFILE_STRIP_RE = re.compile(r'(?:with chrome |chrome )?profile [\w\s]+')
+
+# (recipient group, message group) - tried in order
+MESSAGE_PATTERNS = (
+    (re.compile(r'send\s+(.*?)\s+to\s+(.*)', re.IGNORECASE), 2, 1),
+    (re.compile(r'to\s+(.*?)\s+(?:message|saying|that)\s+(.*)', re.IGNORECASE), 1, 2),
+    (re.compile(r'to\s+(\w+)\s+(.*)', re.IGNORECASE), 1, 2),
+)
+
+
+class Gazetteer:
+    """Token-level Aho-Corasick automaton over multi-word phrases"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # node -> [(phrase length, category, value), ...]
+        self._compiled = True
+        self.size = 0
+
+    def add(self, phrase, category, value):
+        tokens = phrase.lower().split()
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            nxt = self._goto[node].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(tokens), category, value))
+        self._compiled = False
+        self.size += 1
+
+    def compile(self):
+        """Compute failure links (breadth-first) and merge suffix outputs"""
+        self._fail = [0] * len(self._goto)
+        outputs = [list({entry: None for entry in out}) for out in self._out]
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child].extend(e for e in outputs[self._fail[child]] if e not in outputs[child])
+        self._out = outputs
+        self._compiled = True
+
+    def find(self, tokens):
+        """All (start, end, category, value) matches, ordered by start then longest first"""
+        if not self._compiled:
+            self.compile()
+        matches = []
+        node = 0
+        for end, token in enumerate(tokens, start=1):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for length, category, value in self._out[node]:
+                matches.append((end - length, end, category, value))
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        return matches
+
+
+class ParsedCommand:
+    """A command tokenized once, with first-position lookup and gazetteer hits"""
+
+    __slots__ = ("raw", "lower", "words", "raw_words", "tokens", "positions", "entities")
+
+    def __init__(self, raw, words, raw_words, entities, tokens=None):
+        """
+        Args:
+            words / raw_words: Lowercased / original whitespace tokens (for slicing text back out)
+            tokens: Normalized match keys aligned with words (default: words)
+        """
+        self.raw = raw
+        self.lower = raw.lower().strip()
+        self.words = words
+        self.raw_words = raw_words
+        self.tokens = words if tokens is None else tokens
+        self.positions = {}
+        for i, token in enumerate(self.tokens):
+            self.positions.setdefault(token, i)
+        self.entities = {}  # category -> [(start, end, value), ...] in text order
+        for start, end, category, value in entities:
+            self.entities.setdefault(category, []).append((start, end, value))
+
+    def has(self, word):
+        return word in self.positions
+
+    def index(self, word, default=-1):
+        """First position of word (like list.index, without the scan)"""
+        return self.positions.get(word, default)
+
+    def first(self, category, default=None, start=0):
+        """Value of the leftmost (then longest) entity of a category beginning at or after `start`"""
+        for hit_start, _, value in self.entities.get(category, ()):
+            if hit_start >= start:
+                return value
+        return default
+
+
+class EntityExtractor:
+    """Gazetteer plus the shared keyword-extraction helpers"""
+
+    def __init__(self, websites=WEBSITES, folders=COMMON_FOLDERS, media_apps=MEDIA_APPS,
+                 messaging_apps=MESSAGING_APPS, apps=None, contacts=None):
+        self.gazetteer = Gazetteer()
+        self._lock = threading.Lock()
+        self.site_keys = {url: key for key, url in (websites or {}).items()}  # 'github.com' -> 'github'
+        for category, entries in (("website", websites), ("folder", folders), ("media_app", media_apps),
+                                  ("messaging_app", messaging_apps), ("app", apps), ("contact", contacts)):
+            if entries:
+                self.add_many(category, entries)
+        self.gazetteer.compile()
+
+    # ---------- Gazetteer ----------
+    def add(self, category, phrase, value=None):
+        """Add one entry; the automaton is recompiled on the next parse"""
+        with self._lock:
+            self.gazetteer.add(phrase, category, phrase if value is None else value)
+
+    def add_many(self, category, entries):
+        """Add a {phrase: value} mapping or an iterable of phrases"""
+        items = entries.items() if isinstance(entries, dict) else ((phrase, phrase) for phrase in entries)
+        with self._lock:
+            for phrase, value in items:
+                self.gazetteer.add(phrase, category, value)
+
+    def token(self, word):
+        """Match key of a lowercased word: punctuation stripped, known domains mapped to their site name"""
+        word = word.strip(TOKEN_PUNCTUATION)
+        domain = DOMAIN_RE.match(word)
+        if domain:
+            return self.site_keys.get(domain.group(1), word)
+        return word
+
+    def parse(self, raw_command):
+        words = raw_command.lower().split()
+        tokens = [self.token(word) for word in words]
+        with self._lock:
+            entities = self.gazetteer.find(tokens)
+        return ParsedCommand(raw_command, words, raw_command.split(), entities, tokens)
+
+    # ---------- Helpers ----------
+    @staticmethod
+    def profile_name(text):
+        """Chrome profile named in the command, or None"""
+        match = PROFILE_RE.search(text)
+        return match.group(1).strip().lower() if match else None
+
+    @staticmethod
+    def words_after(parsed, keywords, skip_words, end=None, raw=False):
+        """
+        Words following the first present keyword (keywords tried in order), minus skip_words.
+
+        Args:
+            end: Only consider words before this position
+            raw: Return the original casing (skip_words are still compared lowercased)
+        """
+        end = len(parsed.words) if end is None else end
+        source = parsed.raw_words if raw else parsed.words
+        for keyword in keywords:
+            idx = parsed.index(keyword)
+            if 0 <= idx < end:
+                kept = [source[i] for i in range(idx + 1, end) if parsed.tokens[i] not in skip_words]
+                if kept:
+                    return ' '.join(kept)
+        return None
+
+    def app_name(self, parsed, triggers, end=None, raw=False):
+        return self.words_after(parsed, triggers, APP_SKIP_WORDS, end=end, raw=raw)
+
+    def website_and_query(self, parsed, default=None):
+        """(url of the first site mentioned or default, search query without profile/site/command words)"""
+        website = parsed.first("website", default)
+        site_tokens = {parsed.tokens[i] for start, end, _ in parsed.entities.get("website", ()) for i in range(start, end)}
+        query_text = PROFILE_STRIP_RE.sub('', parsed.lower)
+        query_words = []
+        for word in query_text.split():
+            token = self.token(word)
+            if token and token not in QUERY_SKIP_WORDS and token not in site_tokens:
+                query_words.append(word.strip(TOKEN_PUNCTUATION))
+        return website, ' '.join(query_words) if query_words else None
+
+    @staticmethod
+    def message_parts(parsed):
+        """(recipient, message) from "send X to Y" / "to Y saying X" / "to Y X", or None"""
+        for pattern, recipient_group, message_group in MESSAGE_PATTERNS:
+            match = pattern.search(parsed.raw)
+            if match:
+                return match.group(recipient_group), match.group(message_group)
+        return None
+
+    def file_or_folder(self, parsed, skip_words=FILE_SKIP_WORDS, require_indicator=True):
+        """
+        Returns:
+            (is_file_operation, path or name, 'file' | 'folder', is_known_folder)
+        """
+        if require_indicator and not any(parsed.has(w) for w in FILE_INDICATORS):
+            return False, None, None, False
+        folder = parsed.first("folder")
+        if folder:
+            return True, folder, 'folder', True
+        target_words = [w for w in parsed.words if w not in skip_words]
+        if target_words:
+            target_type = 'folder' if parsed.has('folder') or parsed.has('directory') else 'file'
+            return True, ' '.join(target_words), target_type, False
+        return False, None, None, False
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_extractor():
+    """Process-wide extractor, compiled on first use"""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = EntityExtractor()
+            logger.info(f"✓ Entity gazetteer compiled ({_extractor.gazetteer.size} entries)")
+        return _extractor
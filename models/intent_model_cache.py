@@ -0,0 +1,237 @@
+"""
+Intent Model Cache - persisted TF-IDF + LogisticRegression command classifier
+The artifact is keyed by a hash of the training data and hyperparameters:
+a matching artifact is loaded instead of refitting, a stale one keeps serving
+while a retrain runs in the background and is swapped in atomically.
+Each fitted model is also exported for models.intent_predictor, so a warm
+start serves predictions from NumPy without importing scikit-learn at all.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger("IntentModelCache")
+
+DEFAULT_HYPERPARAMS = {
+    "vectorizer": {},
+    "classifier": {},
+}
+
+ARTIFACT_NAME = "intent_model.joblib"
+META_NAME = "intent_model.meta.json"
+PREDICTOR_DIR = "intent_predictor"
+
+
+def training_hash(training_data, hyperparams):
+    """Stable SHA-256 of (training examples, hyperparameters)"""
+    payload = json.dumps(
+        {"data": [list(example) for example in training_data], "hyperparams": hyperparams},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _sklearn_version():
+    try:
+        import sklearn
+        return sklearn.__version__
+    except ImportError:
+        return "unknown"
+
+
+class IntentModelCache:
+    """Loads, trains and hot-swaps the intent classifier"""
+
+    def __init__(self, training_data, hyperparams=None, cache_dir=None, on_swap=None, use_predictor=True):
+        """
+        Args:
+            training_data: [(text, label), ...]
+            hyperparams: {"vectorizer": {...TfidfVectorizer kwargs}, "classifier": {...LogisticRegression kwargs}}
+            cache_dir: Artifact folder (default: config.MODEL_WEIGHTS_DIR)
+            on_swap: Optional callable(meta) run after a background retrain is swapped in
+            use_predictor: Serve predictions from the exported NumPy predictor when it passes the parity check
+        """
+        if cache_dir is None:
+            import config
+            cache_dir = config.MODEL_WEIGHTS_DIR
+        self.training_data = list(training_data)
+        self.hyperparams = hyperparams or DEFAULT_HYPERPARAMS
+        self.cache_dir = cache_dir
+        self.artifact_path = os.path.join(cache_dir, ARTIFACT_NAME)
+        self.meta_path = os.path.join(cache_dir, META_NAME)
+        self.predictor_dir = os.path.join(cache_dir, PREDICTOR_DIR)
+        self.on_swap = on_swap
+        self.use_predictor = use_predictor
+        self.data_hash = training_hash(self.training_data, self.hyperparams)
+
+        self.model = None  # (vectorizer, classifier) - replaced as a whole, never mutated
+        self.predictor = None  # IntentPredictor for the same model, preferred by predict()
+        self.meta = None
+        self._retrain_thread = None
+
+    # ---------- Public API ----------
+    def load_or_train(self, background=True):
+        """
+        Make a model available.
+
+        - NumPy export matches the training hash: load it (scikit-learn is not imported).
+        - Artifact matches the training hash: load it.
+        - Artifact is stale: load it now, retrain in the background (or inline if background=False).
+        - No usable artifact: train inline.
+
+        Returns:
+            (vectorizer, classifier), or None when served by the NumPy predictor
+        """
+        meta = self._read_meta()
+        if self.use_predictor and meta and meta.get("data_hash") == self.data_hash:
+            predictor = self._load_predictor()
+            if predictor:
+                self.predictor, self.meta = predictor, meta
+                logger.info(f"✓ Intent model loaded from NumPy export ({meta['examples']} examples, "
+                            f"{len(predictor.vocabulary)} terms)")
+                return None
+
+        loaded = self._load_artifact() if meta else None
+        fresh = meta and meta.get("data_hash") == self.data_hash and meta.get("sklearn") == _sklearn_version()
+
+        if loaded and fresh:
+            self.model, self.meta = loaded, meta
+            logger.info(f"✓ Intent model loaded from cache ({meta['examples']} examples, "
+                        f"fit {meta['fit_seconds']:.2f}s on {meta['trained_at']})")
+            self._export_predictor()
+            return self.model
+
+        if loaded and background:
+            self.model, self.meta = loaded, meta
+            logger.info("Intent model cache is stale - serving it while retraining in the background")
+            self.retrain_async()
+            return self.model
+
+        self._train_and_swap()
+        return self.model
+
+    def retrain_async(self):
+        """Retrain on a daemon thread and swap the new model in when done"""
+        if self._retrain_thread and self._retrain_thread.is_alive():
+            return
+        self._retrain_thread = threading.Thread(target=self._retrain_background, daemon=True)
+        self._retrain_thread.start()
+
+    def predict(self, text):
+        """(label, confidence) for one utterance"""
+        predictor = self.predictor
+        if predictor is not None:
+            return predictor.predict(text)
+        vectorizer, classifier = self.model
+        probabilities = classifier.predict_proba(vectorizer.transform([text]))[0]
+        best = probabilities.argmax()
+        return classifier.classes_[best], float(probabilities[best])
+
+    # ---------- Training ----------
+    def _retrain_background(self):
+        try:
+            self._train_and_swap()
+            if self.on_swap:
+                self.on_swap(self.meta)
+        except Exception as e:
+            logger.error(f"Background intent model retrain failed: {e}", exc_info=True)
+
+    def _train_and_swap(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        texts, labels = zip(*self.training_data)
+        start = time.perf_counter()
+        vectorizer = TfidfVectorizer(**self.hyperparams.get("vectorizer", {}))
+        classifier = LogisticRegression(**self.hyperparams.get("classifier", {}))
+        classifier.fit(vectorizer.fit_transform(texts), labels)
+        fit_seconds = time.perf_counter() - start
+
+        meta = {
+            "data_hash": self.data_hash,
+            "examples": len(texts),
+            "labels": len(set(labels)),
+            "hyperparams": self.hyperparams,
+            "sklearn": _sklearn_version(),
+            "fit_seconds": round(fit_seconds, 4),
+            "trained_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.model, self.meta = (vectorizer, classifier), meta
+        self.predictor = None  # a stale predictor must not outlive the model it was exported from
+        logger.info(f"✓ Intent model trained on {len(texts)} examples in {fit_seconds:.2f}s")
+
+        try:
+            self._write_artifact(self.model, meta)
+        except Exception as e:
+            logger.warning(f"Could not persist intent model: {e}")
+        self._export_predictor()
+
+    # ---------- NumPy predictor ----------
+    def _load_predictor(self):
+        try:
+            from models.intent_predictor import IntentPredictor
+        except ImportError as e:
+            logger.debug(f"NumPy predictor unavailable: {e}")
+            return None
+        return IntentPredictor.load(self.predictor_dir, data_hash=self.data_hash)
+
+    def _export_predictor(self):
+        """Export self.model and switch predict() over if it matches scikit-learn on the training set"""
+        if not self.use_predictor or self.model is None:
+            return
+        try:
+            from models.intent_predictor import IntentPredictor, check_parity, export_model
+
+            vectorizer, classifier = self.model
+            export_model(vectorizer, classifier, self.predictor_dir, data_hash=self.meta["data_hash"])
+            predictor = IntentPredictor(self.predictor_dir)
+            texts = [text.lower() for text, _ in self.training_data]
+            parity = check_parity(vectorizer, classifier, predictor, texts)
+        except Exception as e:
+            logger.warning(f"Could not export NumPy intent predictor: {e}")
+            return
+
+        if not parity["ok"]:
+            logger.warning(f"NumPy intent predictor disagrees with scikit-learn "
+                           f"(max prob diff {parity['max_prob_diff']:.2e}, "
+                           f"{len(parity['label_mismatches'])} label mismatches) - keeping scikit-learn")
+            return
+        if self.meta["data_hash"] == self.data_hash:
+            self.predictor = predictor
+
+    # ---------- Persistence ----------
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_artifact(self):
+        try:
+            import joblib
+            model = joblib.load(self.artifact_path)
+            return model["vectorizer"], model["classifier"]
+        except Exception as e:
+            logger.warning(f"Intent model artifact unusable ({e})")
+            return None
+
+    def _write_artifact(self, model, meta):
+        """Write artifact then meta via temp file + os.replace; meta goes last, so a crash in between only forces a retrain"""
+        import joblib
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        vectorizer, classifier = model
+        tmp_artifact = f"{self.artifact_path}.{os.getpid()}.tmp"
+        joblib.dump({"vectorizer": vectorizer, "classifier": classifier}, tmp_artifact)
+        os.replace(tmp_artifact, self.artifact_path)
+
+        tmp_meta = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_meta, self.meta_path)
@@ -0,0 +1,196 @@
+"""
+Intent Predictor - scikit-learn-free inference for the TF-IDF intent classifier
+The fitted TfidfVectorizer + LogisticRegression is exported to a compact folder
+(vocabulary JSON, idf/coef/intercept .npy) that is memory-mapped at load time.
+Prediction is a sparse dot product plus softmax in NumPy, returning label and
+confidence in one pass.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+
+import numpy as np
+
+logger = logging.getLogger("IntentPredictor")
+
+FORMAT_VERSION = 1
+META_NAME = "predictor.json"
+
+
+def export_model(vectorizer, classifier, export_dir, data_hash=None):
+    """
+    Export a fitted TfidfVectorizer + LogisticRegression.
+
+    Raises:
+        ValueError: vectorizer options the NumPy predictor does not replicate
+    """
+    if vectorizer.analyzer != "word" or callable(vectorizer.tokenizer) or callable(vectorizer.preprocessor):
+        raise ValueError("Only the default word analyzer can be exported")
+    if vectorizer.strip_accents is not None:
+        raise ValueError("strip_accents is not supported by the NumPy predictor")
+
+    os.makedirs(export_dir, exist_ok=True)
+    vocabulary = {term: int(index) for term, index in vectorizer.vocabulary_.items()}
+    stop_words = vectorizer.get_stop_words()
+
+    classes = classifier.classes_.tolist()
+    if len(classes) == 2:
+        mode = "binary"
+    elif getattr(classifier, "multi_class", "auto") == "ovr" or classifier.solver == "liblinear":
+        mode = "ovr"
+    else:
+        mode = "multinomial"
+
+    np.save(os.path.join(export_dir, "idf.npy"), vectorizer.idf_.astype(np.float64))
+    np.save(os.path.join(export_dir, "coef.npy"), np.ascontiguousarray(classifier.coef_, dtype=np.float64))
+    np.save(os.path.join(export_dir, "intercept.npy"), classifier.intercept_.astype(np.float64))
+    with open(os.path.join(export_dir, "vocabulary.json"), "w", encoding="utf-8") as f:
+        json.dump(vocabulary, f, ensure_ascii=False)
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "data_hash": data_hash,
+        "classes": classes,
+        "mode": mode,
+        "lowercase": vectorizer.lowercase,
+        "token_pattern": vectorizer.token_pattern,
+        "ngram_range": list(vectorizer.ngram_range),
+        "stop_words": sorted(stop_words) if stop_words else [],
+        "binary": vectorizer.binary,
+        "sublinear_tf": vectorizer.sublinear_tf,
+        "use_idf": vectorizer.use_idf,
+        "norm": vectorizer.norm,
+    }
+    # Meta last: a folder without it is never loaded
+    tmp_meta = os.path.join(export_dir, f"{META_NAME}.tmp")
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_meta, os.path.join(export_dir, META_NAME))
+    logger.info(f"✓ Intent model exported ({len(vocabulary)} terms, {len(classes)} labels)")
+
+
+class IntentPredictor:
+    """NumPy replica of TfidfVectorizer.transform + LogisticRegression.predict_proba"""
+
+    def __init__(self, export_dir):
+        with open(os.path.join(export_dir, META_NAME), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported predictor format {meta.get('format_version')}")
+        with open(os.path.join(export_dir, "vocabulary.json"), "r", encoding="utf-8") as f:
+            self.vocabulary = json.load(f)
+
+        self.meta = meta
+        self.data_hash = meta.get("data_hash")
+        self.classes = meta["classes"]
+        self.mode = meta["mode"]
+        self.idf = np.load(os.path.join(export_dir, "idf.npy"), mmap_mode="r")
+        self.coef = np.load(os.path.join(export_dir, "coef.npy"), mmap_mode="r")
+        self.intercept = np.load(os.path.join(export_dir, "intercept.npy"))
+        self._token_re = re.compile(meta["token_pattern"])
+        self._stop_words = frozenset(meta["stop_words"])
+        self._min_n, self._max_n = meta["ngram_range"]
+
+    @classmethod
+    def load(cls, export_dir, data_hash=None):
+        """Load an export, or None if absent, unreadable or trained on different data"""
+        try:
+            predictor = cls(export_dir)
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"No usable intent predictor export: {e}")
+            return None
+        if data_hash is not None and predictor.data_hash != data_hash:
+            return None
+        return predictor
+
+    # ---------- Vectorizer ----------
+    def _terms(self, text):
+        if self.meta["lowercase"]:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        if self._stop_words:
+            tokens = [t for t in tokens if t not in self._stop_words]
+        if self._max_n == 1:
+            return tokens
+        terms = []
+        for n in range(self._min_n, self._max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                terms.append(" ".join(tokens[i:i + n]))
+        return terms
+
+    def transform(self, text):
+        """Sparse TF-IDF row as (feature indices, values)"""
+        counts = {}
+        for term in self._terms(text):
+            index = self.vocabulary.get(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+        if not counts:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.meta["binary"]:
+            values[:] = 1.0
+        elif self.meta["sublinear_tf"]:
+            values = 1.0 + np.log(values)
+        if self.meta["use_idf"]:
+            values = values * self.idf[indices]
+
+        norm = self.meta["norm"]
+        if norm == "l2":
+            length = math.sqrt(float(values @ values))
+        elif norm == "l1":
+            length = float(np.abs(values).sum())
+        else:
+            length = 0.0
+        if length > 0:
+            values = values / length
+        return indices, values
+
+    # ---------- Classifier ----------
+    def predict_proba(self, text):
+        """Class probabilities in self.classes order"""
+        indices, values = self.transform(text)
+        scores = self.coef[:, indices] @ values + self.intercept if len(indices) else np.array(self.intercept)
+
+        if self.mode == "binary":
+            positive = 1.0 / (1.0 + math.exp(-float(scores[0])))
+            return np.array([1.0 - positive, positive])
+        if self.mode == "ovr":
+            probabilities = 1.0 / (1.0 + np.exp(-scores))
+            return probabilities / probabilities.sum()
+        scores = scores - scores.max()
+        exp = np.exp(scores)
+        return exp / exp.sum()
+
+    def predict(self, text):
+        """(label, confidence) for one utterance"""
+        probabilities = self.predict_proba(text)
+        best = int(probabilities.argmax())
+        return self.classes[best], float(probabilities[best])
+
+
+def check_parity(vectorizer, classifier, predictor, texts, tolerance=1e-6):
+    """
+    Compare the NumPy predictor with scikit-learn on `texts`.
+
+    Returns:
+        {"texts": int, "label_mismatches": [text, ...], "max_prob_diff": float, "ok": bool}
+    """
+    expected = classifier.predict_proba(vectorizer.transform(list(texts)))
+    mismatches, max_diff = [], 0.0
+    for text, row in zip(texts, expected):
+        actual = predictor.predict_proba(text)
+        max_diff = max(max_diff, float(np.abs(actual - row).max()))
+        if predictor.classes[int(actual.argmax())] != classifier.classes_[int(row.argmax())]:
+            mismatches.append(text)
+    return {
+        "texts": len(texts),
+        "label_mismatches": mismatches,
+        "max_prob_diff": max_diff,
+        "ok": not mismatches and max_diff <= tolerance,
+    }
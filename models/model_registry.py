@@ -0,0 +1,256 @@
+"""
+Model Registry - one place that owns EVA's heavy ML models
+Tracks each model's load time and resident memory, keeps the total under a
+memory budget by unloading least-recently-used idle models, reloads them on
+demand and can prefetch a model in the background before it is needed.
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("ModelRegistry")
+
+DEFAULT_BUDGET_MB = 4096
+DEFAULT_IDLE_SECONDS = 600
+
+
+def process_rss_mb():
+    """Current resident set size of this process in MB (0 when unknown)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+
+class _Entry:
+    def __init__(self, name, loader, pinned, estimated_mb):
+        self.name = name
+        self.loader = loader
+        self.pinned = pinned
+        self.estimated_mb = estimated_mb
+        self.model = None
+        self.rss_mb = None  # measured on first load
+        self.load_seconds = None
+        self.last_used = 0.0
+        self.loads = 0
+        self.in_use = 0
+        self.lock = threading.Lock()  # serializes load/unload of this model
+
+    @property
+    def cost_mb(self):
+        return self.rss_mb if self.rss_mb is not None else self.estimated_mb
+
+
+class ModelRegistry:
+    """Lazy, budgeted model cache"""
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB, idle_seconds=DEFAULT_IDLE_SECONDS):
+        """
+        Args:
+            budget_mb: Total MB of loaded models before idle ones are evicted (0 = unlimited)
+            idle_seconds: Unload unpinned models unused for this long (0 = never)
+        """
+        self.budget_mb = budget_mb
+        self.idle_seconds = idle_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    # ---------- Registration ----------
+    def register(self, name, loader, pinned=False, estimated_mb=500):
+        """
+        Register a model loader (no loading happens here).
+
+        Args:
+            name: Unique model name, e.g. "omniparser.yolo"
+            loader: Zero-argument callable returning the loaded model
+            pinned: Never evict (e.g. the always-listening wake word model)
+            estimated_mb: Memory estimate used until the first load is measured
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry:
+                entry.loader, entry.pinned = loader, pinned
+                return
+            self._entries[name] = _Entry(name, loader, pinned, estimated_mb)
+        self._start_reaper()
+
+    def is_registered(self, name):
+        return name in self._entries
+
+    def is_loaded(self, name):
+        entry = self._entries.get(name)
+        return bool(entry and entry.model is not None)
+
+    # ---------- Access ----------
+    def get(self, name):
+        """Return the model, loading it (and evicting others to fit the budget) if needed"""
+        entry = self._entries[name]
+        entry.last_used = time.time()
+        if entry.model is not None:
+            return entry.model
+
+        with entry.lock:
+            if entry.model is None:
+                self._make_room(entry)
+                logger.info(f"Loading model '{name}'...")
+                rss_before = process_rss_mb()
+                start = time.perf_counter()
+                model = entry.loader()
+                entry.load_seconds = time.perf_counter() - start
+                measured = process_rss_mb() - rss_before
+                if measured > 0:
+                    entry.rss_mb = measured
+                entry.model = model
+                entry.loads += 1
+                logger.info(f"✓ Model '{name}' loaded in {entry.load_seconds:.1f}s (~{entry.cost_mb:.0f} MB)")
+            entry.last_used = time.time()
+            return entry.model
+
+    @contextmanager
+    def use(self, name):
+        """Context manager that keeps a model from being evicted while in use"""
+        entry = self._entries[name]
+        with self._lock:
+            entry.in_use += 1
+        try:
+            yield self.get(name)
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+            entry.last_used = time.time()
+
+    def prefetch(self, name):
+        """Load a model in the background if it is not resident"""
+        if name not in self._entries or self.is_loaded(name):
+            return
+        threading.Thread(target=self._prefetch, args=(name,), daemon=True).start()
+
+    def _prefetch(self, name):
+        try:
+            self.get(name)
+        except Exception as e:
+            logger.warning(f"Prefetch of '{name}' failed: {e}")
+
+    # ---------- Eviction ----------
+    def unload(self, name):
+        """Drop a model so its memory can be reclaimed"""
+        entry = self._entries.get(name)
+        if not entry or entry.model is None:
+            return False
+        with entry.lock:
+            entry.model = None
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        logger.info(f"Unloaded model '{name}' (~{entry.cost_mb:.0f} MB freed)")
+        return True
+
+    def _evictable(self, exclude=None):
+        """Loaded, unpinned, idle models, least recently used first"""
+        with self._lock:
+            candidates = [
+                e for e in self._entries.values()
+                if e.model is not None and not e.pinned and e.in_use == 0 and e is not exclude
+            ]
+        return sorted(candidates, key=lambda e: e.last_used)
+
+    def loaded_mb(self):
+        return sum(e.cost_mb for e in self._entries.values() if e.model is not None)
+
+    def _make_room(self, incoming):
+        if not self.budget_mb:
+            return
+        for entry in self._evictable(exclude=incoming):
+            if self.loaded_mb() + incoming.cost_mb <= self.budget_mb:
+                break
+            logger.info(f"Memory budget {self.budget_mb} MB reached - evicting '{entry.name}'")
+            self.unload(entry.name)
+        if self.loaded_mb() + incoming.cost_mb > self.budget_mb:
+            logger.warning(f"Loading '{incoming.name}' exceeds the {self.budget_mb} MB model budget "
+                           f"(remaining models are pinned or in use)")
+
+    def evict_idle(self):
+        """Unload unpinned models idle longer than idle_seconds"""
+        if not self.idle_seconds:
+            return
+        cutoff = time.time() - self.idle_seconds
+        for entry in self._evictable():
+            if entry.last_used < cutoff:
+                logger.info(f"Model '{entry.name}' idle for {self.idle_seconds}s")
+                self.unload(entry.name)
+
+    def _start_reaper(self):
+        if self._reaper or not self.idle_seconds:
+            return
+        self._reaper = threading.Thread(target=self._reap, daemon=True)
+        self._reaper.start()
+
+    def _reap(self):
+        interval = max(5.0, min(60.0, self.idle_seconds / 4))
+        while True:
+            time.sleep(interval)
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.warning(f"Idle eviction failed: {e}")
+
+    # ---------- Status ----------
+    def status(self):
+        """Per-model status rows"""
+        now = time.time()
+        return [
+            {
+                "name": e.name,
+                "loaded": e.model is not None,
+                "pinned": e.pinned,
+                "mb": round(e.cost_mb, 1),
+                "measured": e.rss_mb is not None,
+                "load_seconds": round(e.load_seconds, 2) if e.load_seconds is not None else None,
+                "loads": e.loads,
+                "idle_seconds": round(now - e.last_used, 1) if e.last_used else None,
+            }
+            for e in self._entries.values()
+        ]
+
+    def format_status(self):
+        """Human-readable status table"""
+        lines = [f"Models: {self.loaded_mb():.0f} / {self.budget_mb or '∞'} MB loaded"]
+        for row in self.status():
+            state = "loaded" if row["loaded"] else "unloaded"
+            flags = " [pinned]" if row["pinned"] else ""
+            estimate = "" if row["measured"] else "~"
+            lines.append(f"  {row['name']:<24} {state:<9} {estimate}{row['mb']:>7.0f} MB  loads={row['loads']}{flags}")
+        return "\n".join(lines)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Process-wide registry configured from config.py (defaults when config is unavailable)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            budget_mb, idle_seconds = DEFAULT_BUDGET_MB, DEFAULT_IDLE_SECONDS
+            try:
+                import config
+                budget_mb = getattr(config, "MODEL_MEMORY_BUDGET_MB", budget_mb)
+                idle_seconds = getattr(config, "MODEL_IDLE_UNLOAD_SECONDS", idle_seconds)
+            except Exception:
+                pass  # e.g. the parse server, which runs without EVA's .env
+            _registry = ModelRegistry(budget_mb, idle_seconds)
+        return _registry
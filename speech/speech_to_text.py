@@ -10,6 +10,7 @@ import tempfile
 import os
 import logging
 import config
+from models.model_registry import get_registry
 
 logger = logging.getLogger("SpeechToText")
 
@@ -18,19 +19,25 @@ class SpeechToText:
     
     def __init__(self):
         self.logger = logging.getLogger("SpeechToText")
+        self.registry = get_registry()
+        self.registry.register(
+            "speech.whisper_large",
+            lambda: WhisperModel("large", device="cpu", compute_type="int8"),
+            estimated_mb=1600
+        )
         
-        # Initialize Faster Whisper model
+        # Initialize Faster Whisper model (evictable when idle, reloaded on demand)
         try:
-            self.model = WhisperModel(
-                "large",
-                device="cpu",
-                compute_type="int8"
-            )
+            self.registry.get("speech.whisper_large")
             self.logger.info(f"Faster Whisper model loaded: large")
         except Exception as e:
             self.logger.error(f"Failed to load Whisper: {e}")
             raise
     
+    @property
+    def model(self):
+        return self.registry.get("speech.whisper_large")
+    
     def record_audio(self, duration=10):
         """
         ✅ SIMPLE RECORDING: Just record for fixed duration
@@ -42,6 +49,9 @@ class SpeechToText:
         Returns:
             str: Path to temporary WAV file
         """
+        # Reload an evicted Whisper model while the user speaks
+        self.registry.prefetch("speech.whisper_large")
+        
         CHUNK = 1024
         FORMAT = pyaudio.paInt16
         CHANNELS = 1
@@ -7,6 +7,7 @@ import pyaudio
 import numpy as np
 import time
 from faster_whisper import WhisperModel
+from models.model_registry import get_registry
 
 logger = logging.getLogger("WakeWordDetector")
 
@@ -21,7 +22,14 @@ class WakeWordDetector:
 
         try:
             logger.info(f"Initializing faster_whisper with model: '{self.model_size}'")
-            self.model = WhisperModel(self.model_size, device="cpu", compute_type="int8")
+            # Pinned: the wake word model is used continuously and must never be evicted
+            self.registry = get_registry()
+            self.registry.register(
+                f"speech.whisper_{self.model_size}",
+                lambda: WhisperModel(self.model_size, device="cpu", compute_type="int8"),
+                pinned=True, estimated_mb=150
+            )
+            self.model = self.registry.get(f"speech.whisper_{self.model_size}")
             logger.info(f"✓ faster_whisper initialized (model: '{self.model_size}')")
 
             self.pa = pyaudio.PyAudio()
@@ -21,13 +21,14 @@ from torchvision.transforms import ToPILImage
 import supervision as sv
 import torchvision.transforms as T
 from util.box_annotator import BoxAnnotator
-
-# Initialize OCR readers
-reader = easyocr.Reader(['en'])
-paddle_ocr = PaddleOCR(
-    lang='en',
-    use_angle_cls=False,
-    rec_batch_num=1024
+from models.model_registry import get_registry
+
+# OCR readers load on first use through the shared model registry
+get_registry().register("utils.easyocr", lambda: easyocr.Reader(['en']), estimated_mb=400)
+get_registry().register(
+    "utils.paddleocr",
+    lambda: PaddleOCR(lang='en', use_angle_cls=False, rec_batch_num=1024),
+    estimated_mb=600
 )
 
 
@@ -375,11 +376,15 @@ def get_som_labeled_img(
     prompt=None,
     scale_img=False,
     imgsz=None,
-    batch_size=64
+    batch_size=64,
+    resolution_policy=None
 ):
     """
     Main function to process image with YOLO + OCR and generate labeled output.
     Updated with latest OmniParser-v2 logic.
+
+    With a resolution_policy (vision/resolution_policy.py) and no explicit imgsz,
+    YOLO runs at the policy's adaptive input size instead of the full (h, w).
     """
     if isinstance(image_source, str):
         image_source = Image.open(image_source)
@@ -387,6 +392,9 @@ def get_som_labeled_img(
     image_source = image_source.convert("RGB")
     w, h = image_source.size
     
+    if not imgsz and resolution_policy is not None:
+        imgsz = resolution_policy.yolo_imgsz((w, h), resolution_policy.scale_for((w, h)))
+        scale_img = True
     if not imgsz:
         imgsz = (h, w)
     
@@ -546,14 +554,14 @@ def check_ocr_box(
         else:
             text_threshold = easyocr_args.get('text_threshold', 0.5)
         
-        result = paddle_ocr.ocr(image_np, cls=False)[0]
+        result = get_registry().get("utils.paddleocr").ocr(image_np, cls=False)[0]
         coord = [item[0] for item in result if item[1][1] > text_threshold]
         text = [item[1][0] for item in result if item[1][1] > text_threshold]
     else:  # EasyOCR
         if easyocr_args is None:
             easyocr_args = {}
         
-        result = reader.readtext(image_np, **easyocr_args)
+        result = get_registry().get("utils.easyocr").readtext(image_np, **easyocr_args)
         coord = [item[0] for item in result]
         text = [item[1] for item in result]
     
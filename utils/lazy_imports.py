@@ -0,0 +1,158 @@
+"""
+Lazy Imports - background module warm-up and an on-demand import-time profile
+Lets the GUI show its window after importing only Qt while heavy packages
+(sklearn, cv2, torch, faster_whisper, ...) load on a background thread.
+"""
+
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger("LazyImports")
+
+
+class BackgroundImporter:
+    """Imports a list of modules on a daemon thread, in order"""
+
+    def __init__(self, modules):
+        self.modules = list(modules)
+        self.timings = {}  # module -> seconds (None if the import failed)
+        self._events = {name: threading.Event() for name in self.modules}
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        total = time.perf_counter()
+        for name in self.modules:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+                self.timings[name] = time.perf_counter() - start
+            except Exception as e:
+                self.timings[name] = None
+                logger.warning(f"Background import of {name} failed: {e}")
+            self._events[name].set()
+        logger.info(f"✓ Background imports finished in {time.perf_counter() - total:.1f}s")
+
+    def wait(self, name, timeout=None):
+        """Block until `name` has been imported (or failed)"""
+        event = self._events.get(name)
+        return event.wait(timeout) if event else True
+
+
+# ---------- Import-time profile ----------
+class _TimingLoader:
+    """Wraps a loader to time exec_module; everything else is delegated"""
+
+    def __init__(self, loader, profiler, name):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name, time.perf_counter() - start)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class ImportProfiler:
+    """sys.meta_path hook recording inclusive and self import time per module"""
+
+    def __init__(self):
+        self.inclusive = {}
+        self.self_time = {}
+        self._local = threading.local()
+
+    # meta path finder protocol
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimingLoader(spec.loader, self, fullname)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _enter(self):
+        self._stack().append(0.0)  # accumulated child time
+
+    def _exit(self, name, elapsed):
+        stack = self._stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.inclusive[name] = elapsed
+        self.self_time[name] = elapsed - children
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def format_report(self, top=40):
+        """Slowest modules by self time, with inclusive time"""
+        rows = sorted(self.self_time.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        top_level = sum(t for name, t in self.inclusive.items() if "." not in name)
+        lines = [
+            f"Import profile: {len(self.inclusive)} modules, {top_level:.2f}s in top-level packages",
+            f"{'self ms':>10} {'incl ms':>10}  module",
+        ]
+        for name, seconds in rows:
+            lines.append(f"{seconds * 1000:>10.1f} {self.inclusive[name] * 1000:>10.1f}  {name}")
+        return "\n".join(lines)
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.format_report(top=200) + "\n")
+        logger.info(f"Import profile written to {path}")
+
+
+_profiler = None
+
+
+def enable_import_profile():
+    """Start recording import times for the rest of the process"""
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler().install()
+    return _profiler
+
+
+def import_profiler():
+    """Active ImportProfiler or None"""
+    return _profiler
@@ -0,0 +1,159 @@
+"""
+Startup Graph - parallel component initialisation with readiness events
+Each component is a node with dependencies; nodes run on a thread pool as soon
+as their dependencies succeed, and callers wait on a node's event instead of
+polling for attributes.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("StartupGraph")
+
+
+class _Node:
+    def __init__(self, name, func, deps):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.event = threading.Event()
+        self.status = "pending"  # pending | running | ok | failed | skipped
+        self.value = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def seconds(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class StartupGraph:
+    """Dependency graph of startup tasks executed on a thread pool"""
+
+    def __init__(self, max_workers=4, listener=None):
+        """
+        Args:
+            max_workers: Thread pool size
+            listener: Optional callable(node_name, status, seconds, error) invoked as nodes finish
+        """
+        self.max_workers = max_workers
+        self.listener = listener
+        self._nodes = {}
+        self._lock = threading.Lock()
+        self._pool = None
+        self._t0 = None
+        self.done = threading.Event()
+
+    def add(self, name, func, deps=()):
+        """Add a node; func() runs once every dependency finished successfully"""
+        for dep in deps:
+            if dep not in self._nodes:
+                raise ValueError(f"Unknown dependency '{dep}' for '{name}' (add dependencies first)")
+        self._nodes[name] = _Node(name, func, deps)
+
+    # ---------- Waiting ----------
+    def wait(self, name, timeout=None):
+        """Block until `name` finishes. Returns True if it succeeded."""
+        node = self._nodes[name]
+        if not node.event.wait(timeout):
+            return False
+        return node.status == "ok"
+
+    def is_ready(self, name):
+        node = self._nodes[name]
+        return node.event.is_set() and node.status == "ok"
+
+    def event(self, name):
+        """threading.Event set when `name` finishes (successfully or not)"""
+        return self._nodes[name].event
+
+    def result(self, name):
+        return self._nodes[name].value
+
+    def error(self, name):
+        return self._nodes[name].error
+
+    # ---------- Execution ----------
+    def run(self):
+        """Start every node whose dependencies allow it (returns immediately)"""
+        self._t0 = time.perf_counter()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="startup")
+        for node in list(self._nodes.values()):
+            if not node.deps:
+                self._submit(node)
+
+    def _submit(self, node):
+        node.status = "running"
+        self._pool.submit(self._execute, node)
+
+    def _execute(self, node):
+        node.started = time.perf_counter()
+        try:
+            node.value = node.func()
+            node.status = "ok"
+        except Exception as e:
+            node.error = e
+            node.status = "failed"
+            logger.error(f"Startup task '{node.name}' failed: {e}", exc_info=True)
+        node.finished = time.perf_counter()
+        self._finish(node)
+
+    def _finish(self, node):
+        node.event.set()
+        if self.listener:
+            try:
+                self.listener(node.name, node.status, node.seconds, node.error)
+            except Exception as e:
+                logger.debug(f"Startup listener failed: {e}")
+
+        ready, skipped = [], []
+        with self._lock:
+            for child in self._nodes.values():
+                if child.status != "pending" or node.name not in child.deps:
+                    continue
+                dep_states = [self._nodes[d].status for d in child.deps]
+                if any(s in ("failed", "skipped") for s in dep_states):
+                    child.status = "skipped"
+                    child.error = RuntimeError(f"dependency '{node.name}' did not start")
+                    skipped.append(child)
+                elif all(s == "ok" for s in dep_states):
+                    child.status = "running"
+                    ready.append(child)
+            all_done = all(n.status in ("ok", "failed", "skipped") for n in self._nodes.values())
+
+        for child in ready:
+            self._pool.submit(self._execute, child)
+        for child in skipped:
+            self._finish(child)
+        if all_done and not self.done.is_set():
+            self.done.set()
+            self._pool.shutdown(wait=False)
+            logger.info(self.format_report())
+
+    # ---------- Reporting ----------
+    def report(self):
+        """Per-node timing rows, ordered by start time"""
+        rows = []
+        for node in self._nodes.values():
+            rows.append({
+                "name": node.name,
+                "status": node.status,
+                "start": round(node.started - self._t0, 3) if node.started and self._t0 else None,
+                "seconds": round(node.seconds, 3),
+                "deps": list(node.deps),
+            })
+        return sorted(rows, key=lambda r: (r["start"] is None, r["start"] or 0))
+
+    def format_report(self):
+        """Human-readable startup timing table"""
+        total = max((n.finished - self._t0 for n in self._nodes.values() if n.finished), default=0.0)
+        lines = [f"Startup finished in {total:.2f}s:"]
+        for row in self.report():
+            start = f"+{row['start']:.2f}s" if row["start"] is not None else "     -"
+            lines.append(f"  {row['name']:<16} {row['status']:<8} {start:>8} {row['seconds']:>7.2f}s")
+        return "\n".join(lines)
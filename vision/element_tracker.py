@@ -0,0 +1,154 @@
+"""
+Element Tracker - stable element identities across successive screen parses
+Matches elements between parses by IoU (and text label for OCR elements)
+so the same button keeps the same track_id from one parse to the next.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger("ElementTracker")
+
+
+def box_iou(a, b):
+    """IoU of two [x1, y1, x2, y2] boxes"""
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    if inter == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / float(area_a + area_b - inter + 1e-6)
+
+
+class ElementTracker:
+    """IoU/label-based tracker assigning persistent track_id values"""
+
+    def __init__(self, iou_threshold=0.3, move_tolerance=4, cell_size=64):
+        """
+        Args:
+            iou_threshold: Minimum IoU for two boxes of the same type to be the same element
+            move_tolerance: Centre shift (px) above which a matched element counts as moved
+            cell_size: Spatial hash cell size used to limit candidate pairs
+        """
+        self.iou_threshold = iou_threshold
+        self.move_tolerance = move_tolerance
+        self.cell_size = cell_size
+        self.tracks = {}  # track_id -> last seen element
+        self.last_changes = None
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Forget all tracks (e.g. after the active window changed)"""
+        with self._lock:
+            self.tracks = {}
+            self.last_changes = None
+
+    @staticmethod
+    def _text_key(elem):
+        """Label used for matching; generic YOLO labels are detection-order based and ignored"""
+        if elem.get('type') == 'text':
+            return elem.get('label', '').strip().lower()
+        return None
+
+    def _cells(self, bbox):
+        cs = self.cell_size
+        for cx in range(int(bbox[0]) // cs, int(bbox[2]) // cs + 1):
+            for cy in range(int(bbox[1]) // cs, int(bbox[3]) // cs + 1):
+                yield (cx, cy)
+
+    def update(self, elements):
+        """
+        Match a new parse against the current tracks, tagging each element with 'track_id'.
+
+        Args:
+            elements: Element dicts from parse_screen (need 'bbox' and 'type')
+
+        Returns:
+            dict: {'added': [ids], 'removed': [ids], 'moved': [ids], 'unchanged': [ids]}
+        """
+        with self._lock:
+            # Spatial hash of previous tracks
+            grid = {}
+            for track_id, prev in self.tracks.items():
+                for cell in self._cells(prev['bbox']):
+                    grid.setdefault(cell, []).append(track_id)
+
+            # Candidate pairs scored by IoU, with a bonus for identical OCR text
+            candidates = []
+            for idx, elem in enumerate(elements):
+                bbox = elem.get('bbox')
+                if not bbox:
+                    continue
+                seen = set()
+                for cell in self._cells(bbox):
+                    for track_id in grid.get(cell, ()):
+                        if track_id in seen:
+                            continue
+                        seen.add(track_id)
+                        prev = self.tracks[track_id]
+                        if prev.get('type') != elem.get('type'):
+                            continue
+                        iou = box_iou(bbox, prev['bbox'])
+                        if iou < self.iou_threshold:
+                            continue
+                        text_key = self._text_key(elem)
+                        if text_key is not None and text_key != self._text_key(prev):
+                            iou *= 0.5
+                            if iou < self.iou_threshold:
+                                continue
+                        candidates.append((iou, idx, track_id))
+
+            # Greedy assignment, best overlap first
+            candidates.sort(reverse=True)
+            assigned_elems, assigned_tracks = {}, set()
+            for score, idx, track_id in candidates:
+                if idx in assigned_elems or track_id in assigned_tracks:
+                    continue
+                assigned_elems[idx] = track_id
+                assigned_tracks.add(track_id)
+
+            changes = {'added': [], 'removed': [], 'moved': [], 'unchanged': []}
+            new_tracks = {}
+            for idx, elem in enumerate(elements):
+                if not elem.get('bbox'):
+                    continue
+                track_id = assigned_elems.get(idx)
+                if track_id is None:
+                    track_id = self._next_id
+                    self._next_id += 1
+                    changes['added'].append(track_id)
+                else:
+                    prev = self.tracks[track_id]
+                    shift = max(abs(elem.get('x', 0) - prev.get('x', 0)), abs(elem.get('y', 0) - prev.get('y', 0)))
+                    changes['moved' if shift > self.move_tolerance else 'unchanged'].append(track_id)
+                elem['track_id'] = track_id
+                new_tracks[track_id] = {
+                    'bbox': list(elem['bbox']),
+                    'type': elem.get('type'),
+                    'label': elem.get('label', ''),
+                    'x': elem.get('x', 0),
+                    'y': elem.get('y', 0),
+                }
+
+            changes['removed'] = [tid for tid in self.tracks if tid not in assigned_tracks]
+            self.tracks = new_tracks
+            self.last_changes = changes
+
+        logger.debug(
+            f"Tracked {len(new_tracks)} elements: +{len(changes['added'])} "
+            f"-{len(changes['removed'])} ~{len(changes['moved'])}"
+        )
+        return changes
+
+    @staticmethod
+    def has_changes(changes):
+        """True if a diff from update() contains any added, removed or moved element"""
+        return bool(changes and (changes['added'] or changes['removed'] or changes['moved']))
+
+    def get(self, track_id):
+        """Last known state of a tracked element, or None"""
+        with self._lock:
+            return self.tracks.get(track_id)
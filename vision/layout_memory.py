@@ -0,0 +1,274 @@
+"""
+Layout Memory - per-application UI target cache
+Remembers where resolved click targets live inside each app window and
+re-verifies them with a cheap template match before clicking again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import config
+
+logger = logging.getLogger("LayoutMemory")
+
+
+class LayoutMemory:
+    """Persistent store of resolved click targets keyed by window layout"""
+
+    INDEX_FILE = "layouts.json"
+    TEMPLATE_DIR = "templates"
+
+    def __init__(self, store_dir=None, match_threshold=None, roi_margin=None, template_padding=4):
+        """
+        Args:
+            store_dir: Folder holding layouts.json and template crops
+            match_threshold: Minimum TM_CCOEFF_NORMED score to accept a remembered target
+            roi_margin: Pixels searched around the remembered bbox
+            template_padding: Pixels of context kept around the target when cropping
+        """
+        self.store_dir = store_dir or config.LAYOUT_MEMORY_DIR
+        self.match_threshold = match_threshold if match_threshold is not None else config.LAYOUT_MATCH_THRESHOLD
+        self.roi_margin = roi_margin if roi_margin is not None else config.LAYOUT_ROI_MARGIN
+        self.template_padding = template_padding
+
+        self.index_path = os.path.join(self.store_dir, self.INDEX_FILE)
+        self.template_dir = os.path.join(self.store_dir, self.TEMPLATE_DIR)
+        os.makedirs(self.template_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._templates = {}  # template file -> grayscale ndarray
+        self.layouts = self._load_index()
+        logger.info(f"✓ Layout memory loaded ({sum(len(t) for t in self.layouts.values())} targets)")
+
+    # ---------- Window context ----------
+    @staticmethod
+    def normalize_title(title):
+        """Reduce a window title to the stable application part ('YouTube - Google Chrome' -> 'google chrome')"""
+        title = (title or "").strip().lower()
+        if " - " in title:
+            title = title.rsplit(" - ", 1)[-1]
+        title = re.sub(r"\d+", "", title)
+        return re.sub(r"\s+", " ", title).strip()
+
+    def get_window_context(self):
+        """
+        Describe the active window: class, title pattern, size, DPI and origin.
+
+        Returns:
+            dict or None if no active window can be determined
+        """
+        try:
+            import pygetwindow as gw
+            window = gw.getActiveWindow()
+        except Exception as e:
+            logger.debug(f"Active window lookup failed: {e}")
+            return None
+
+        if not window:
+            return None
+
+        hwnd = getattr(window, "_hWnd", None)
+        window_class = ""
+        dpi = 96
+        if hwnd:
+            try:
+                import win32gui
+                window_class = win32gui.GetClassName(hwnd)
+            except Exception:
+                pass
+            try:
+                import ctypes
+                dpi = ctypes.windll.user32.GetDpiForWindow(hwnd) or 96
+            except Exception:
+                pass
+
+        return {
+            "window_class": window_class,
+            "title_pattern": self.normalize_title(window.title),
+            "left": int(window.left),
+            "top": int(window.top),
+            "width": int(window.width),
+            "height": int(window.height),
+            "dpi": int(dpi),
+        }
+
+    @staticmethod
+    def layout_key(context):
+        """Key identifying one application layout (class | title pattern | size | DPI)"""
+        return (f"{context['window_class']}|{context['title_pattern']}|"
+                f"{context['width']}x{context['height']}|{context['dpi']}")
+
+    @staticmethod
+    def target_key(target_description, profile_name=None):
+        """Normalize a step target into a stable lookup key"""
+        key = re.sub(r"\s+", " ", (target_description or "").strip().lower())
+        if profile_name:
+            key = f"{key}|profile:{profile_name.strip().lower()}"
+        return key
+
+    # ---------- Lookup ----------
+    def lookup(self, target_key, grab_region, context=None):
+        """
+        Verify a remembered target on screen.
+
+        Args:
+            target_key: Key from target_key()
+            grab_region: Callable (left, top, width, height) -> PIL image of that screen region
+            context: Window context (fetched when omitted)
+
+        Returns:
+            (x, y) screen coordinate of the verified target, or None on miss/mismatch
+        """
+        context = context or self.get_window_context()
+        if not context:
+            return None
+
+        with self._lock:
+            record = self.layouts.get(self.layout_key(context), {}).get(target_key)
+        if not record:
+            return None
+
+        template = self._load_template(record["template"])
+        if template is None:
+            return None
+
+        # Remembered bbox is window-relative; translate to current screen position
+        rx1, ry1, rx2, ry2 = record["bbox"]
+        tx1, ty1 = record["template_origin"]
+        left = context["left"] + rx1 - self.roi_margin
+        top = context["top"] + ry1 - self.roi_margin
+        width = (rx2 - rx1) + 2 * self.roi_margin
+        height = (ry2 - ry1) + 2 * self.roi_margin
+        left, top = max(0, left), max(0, top)
+
+        start = time.perf_counter()
+        try:
+            roi_image = grab_region(left, top, width, height)
+        except Exception as e:
+            logger.debug(f"ROI capture failed: {e}")
+            return None
+        if roi_image is None:
+            return None
+
+        roi = cv2.cvtColor(np.asarray(roi_image.convert("RGB")), cv2.COLOR_RGB2GRAY)
+        if roi.shape[0] < template.shape[0] or roi.shape[1] < template.shape[1]:
+            return None
+
+        result = cv2.matchTemplate(roi, template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if max_val < self.match_threshold:
+            logger.info(f"Layout miss for '{target_key}' (score {max_val:.2f} < {self.match_threshold}, {elapsed_ms:.0f}ms)")
+            return None
+
+        # Template origin relative to bbox tells us where the target centre sits inside the match
+        center_x = left + max_loc[0] + (rx1 - tx1) + (rx2 - rx1) // 2
+        center_y = top + max_loc[1] + (ry1 - ty1) + (ry2 - ry1) // 2
+
+        with self._lock:
+            record["hits"] = record.get("hits", 0) + 1
+            record["last_hit"] = time.time()
+        logger.info(f"✓ Layout hit for '{target_key}' at ({center_x}, {center_y}) score {max_val:.2f} ({elapsed_ms:.0f}ms)")
+        return (center_x, center_y)
+
+    # ---------- Remember / forget ----------
+    def remember(self, target_key, bbox, screenshot_path, context=None, extra=None):
+        """
+        Store a resolved target and a small template crop around it.
+
+        Args:
+            target_key: Key from target_key()
+            bbox: [x1, y1, x2, y2] in screen coordinates
+            screenshot_path: Full screenshot the bbox was resolved on
+            context: Window context (fetched when omitted)
+            extra: Optional dict merged into the record (e.g. tracked element id)
+        """
+        context = context or self.get_window_context()
+        if not context or not bbox:
+            return False
+
+        image = cv2.imread(screenshot_path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            logger.warning(f"Cannot read screenshot for layout memory: {screenshot_path}")
+            return False
+
+        h, w = image.shape[:2]
+        x1, y1, x2, y2 = [int(v) for v in bbox]
+        pad = self.template_padding
+        cx1, cy1 = max(0, x1 - pad), max(0, y1 - pad)
+        cx2, cy2 = min(w, x2 + pad), min(h, y2 + pad)
+        if cx2 - cx1 < 4 or cy2 - cy1 < 4:
+            return False
+
+        layout_key = self.layout_key(context)
+        digest = hashlib.sha1(f"{layout_key}|{target_key}".encode("utf-8")).hexdigest()[:16]
+        template_file = f"{digest}.png"
+        cv2.imwrite(os.path.join(self.template_dir, template_file), image[cy1:cy2, cx1:cx2])
+
+        ox, oy = context["left"], context["top"]
+        record = {
+            "bbox": [x1 - ox, y1 - oy, x2 - ox, y2 - oy],
+            "template_origin": [cx1 - ox, cy1 - oy],
+            "template": template_file,
+            "hits": 0,
+            "updated_at": time.time(),
+        }
+        if extra:
+            record.update(extra)
+
+        with self._lock:
+            self.layouts.setdefault(layout_key, {})[target_key] = record
+            self._templates.pop(template_file, None)
+        self._save_index()
+        logger.info(f"Remembered '{target_key}' for layout '{layout_key}'")
+        return True
+
+    def forget(self, target_key, context=None):
+        """Drop a remembered target for the given (or active) layout"""
+        context = context or self.get_window_context()
+        if not context:
+            return False
+        with self._lock:
+            removed = self.layouts.get(self.layout_key(context), {}).pop(target_key, None)
+        if removed:
+            self._save_index()
+        return removed is not None
+
+    # ---------- Persistence ----------
+    def _load_template(self, template_file):
+        template = self._templates.get(template_file)
+        if template is None:
+            template = cv2.imread(os.path.join(self.template_dir, template_file), cv2.IMREAD_GRAYSCALE)
+            if template is not None:
+                self._templates[template_file] = template
+        return template
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Layout memory index unreadable, starting fresh: {e}")
+            return {}
+
+    def _save_index(self):
+        with self._lock:
+            data = json.dumps(self.layouts, indent=2)
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logger.error(f"Failed to save layout memory: {e}")
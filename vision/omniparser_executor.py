@@ -2,16 +2,54 @@
 OmniParser Executor - STRICT MODE (imports from util/utils.py)
 """
 import logging
+import math
 import sys
+import threading
+import time
+from difflib import SequenceMatcher
 from pathlib import Path
+from models.model_registry import get_registry
+from vision.element_tracker import ElementTracker
+from vision.parse_client import ParseServiceClient
+from vision.resolution_policy import ResolutionPolicy
 
 logger = logging.getLogger("OmniParserExecutor")
 
 class OmniParserExecutor:
     """OmniParser executor - MUST work or crash"""
     
-    def __init__(self):
-        """Initialize OmniParser - MUST succeed"""
+    def __init__(self, service_url=None, resolution_policy=None, parse_lock=None):
+        """
+        Initialize OmniParser - MUST succeed
+
+        Args:
+            service_url: Optional parse server URL (vision/parse_server.py). When reachable, parsing is
+                delegated to it and local models are only loaded as a fallback.
+            resolution_policy: Optional ResolutionPolicy; frames are then detected/OCR'd at a
+                reduced scale and coordinates mapped back to full resolution.
+            parse_lock: Lock shared by executors that run on the same registry models
+                (one executor per simulated desktop in headless runs)
+        """
+        self.tracker = ElementTracker()
+        self._last_resolution = None
+        self._parse_lock = parse_lock or threading.Lock()  # YOLO/Paddle are not safe to run concurrently
+        self.models_loaded = False
+        self.service = None
+        self.resolution_policy = resolution_policy
+        self._registry = get_registry()
+
+        if service_url:
+            client = ParseServiceClient(service_url)
+            if client.is_available():
+                self.service = client
+                logger.info(f"✅ OmniParser using parse service at {service_url} (local models on fallback only)")
+                return
+            logger.warning(f"Parse service at {service_url} unreachable - loading local models")
+
+        self._load_local_models()
+
+    def _load_local_models(self):
+        """Load YOLO + PaddleOCR in this process - MUST succeed"""
         try:
             logger.info("Loading OmniParser (STRICT MODE)...")
             
@@ -73,18 +111,25 @@ class OmniParserExecutor:
             if not icon_model_path.exists():
                 raise FileNotFoundError(f"CRITICAL: YOLO model not found. Checked:\n  - {weights_path / 'icon_detect' / 'best.pt'}\n  - {weights_path / 'icon_detect' / 'model.pt'}\nPlease download from OmniParser repository")
             
+            # Models live in the shared registry: evictable when idle, reloaded on demand
+            self._registry.register(
+                "omniparser.yolo", lambda: get_yolo_model(model_path=str(icon_model_path)), estimated_mb=150
+            )
+            self._registry.register(
+                "omniparser.paddleocr", lambda: PaddleOCR(use_angle_cls=False, lang='en'), estimated_mb=600
+            )
+
             logger.info(f"Loading YOLO model from {icon_model_path}...")
-            self.som_model = get_yolo_model(model_path=str(icon_model_path))
+            self._registry.get("omniparser.yolo")
             logger.info(f"✓ YOLO model loaded successfully on {device}")
             
-                        # Load OCR
+            # Load OCR
             logger.info("Loading PaddleOCR...")
-            self.ocr_model = PaddleOCR(use_angle_cls=False, lang='en')
-            logger.info("✓ PaddleOCR loaded successfully")
-
+            self._registry.get("omniparser.paddleocr")
             logger.info("✓ PaddleOCR loaded successfully")
             
             self.device = device
+            self.models_loaded = True
             logger.info("✅ OmniParser fully initialized - READY")
             
         except Exception as e:
@@ -92,133 +137,387 @@ class OmniParserExecutor:
             logger.critical(f"Error: {e}")
             raise RuntimeError(f"OmniParser MUST work. Error: {e}")
     
-    def parse_screen(self, screenshot_path, user_command):
-        """Parse screenshot with robust error handling - MUST work"""
+    @property
+    def som_model(self):
+        return self._registry.get("omniparser.yolo")
+
+    @property
+    def ocr_model(self):
+        return self._registry.get("omniparser.paddleocr")
+
+    def prefetch(self):
+        """Reload evicted local models in the background ahead of a predicted vision step"""
+        if self.models_loaded:
+            self._registry.prefetch("omniparser.yolo")
+            self._registry.prefetch("omniparser.paddleocr")
+
+    def parse_screen(self, screenshot_path, user_command, track=True):
+        """
+        Parse screenshot with robust error handling - MUST work
+
+        Args:
+            screenshot_path: Path to the screenshot, or an in-memory PIL image
+            user_command: Command the parse is for (logging context)
+            track: Update the element tracker (disable for partial/region parses)
+        """
         try:
             from PIL import Image
-            import torch
-            import numpy as np
-        
-            logger.info(f"📸 Parsing: {screenshot_path}")
-        
+
             # Load image
-            image = Image.open(screenshot_path)
-            width, height = image.size
-            logger.info(f"Image: {width}x{height}")
-        
-            elements = []
-            element_id = 1
-        
-            # YOLO detection
-            logger.info("Running YOLO detection...")
-            results = self.som_model.predict(
-            image,
-            conf=0.15,
-            device=self.device,
-            verbose=False
-            )
-        
-            clickable_count = 0
-            for box in results[0].boxes:
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                center_x = int((x1 + x2) / 2)
-                center_y = int((y1 + y2) / 2)
-                conf = float(box.conf[0])
-            
-                elements.append({
-                'id': element_id,
-                'label': f'UI Element {element_id}',
-                'x': center_x,
-                'y': center_y,
-                'confidence': conf,
-                'type': 'clickable',
-                'bbox': [int(x1), int(y1), int(x2), int(y2)]
-                })
-                element_id += 1
-                clickable_count += 1
-        
-            logger.info(f"✓ YOLO: {clickable_count} elements")
-        
-            # OCR detection with robust parsing
-            logger.info("Running OCR...")
-            img_array = np.array(image)
-        
-            try:
-                ocr_result = self.ocr_model.ocr(img_array)
-            except Exception as ocr_error:
-                logger.warning(f"OCR call failed: {ocr_error}, continuing with YOLO-only results")
-                ocr_result = None
-        
-            text_count = 0
-            if ocr_result and len(ocr_result) > 0 and ocr_result[0]:
-                for line in ocr_result[0]:
-                    try:
-                        # Robust parsing: PaddleOCR format is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]], (text, confidence)
-                        if len(line) < 2:
-                            logger.debug(f"Skipping malformed OCR line: {line}")
-                            continue
-                    
-                        bbox = line[0]  # Bounding box coordinates
-                        text_data = line[1]  # Text and confidence
-                    
-                        # Extract text and confidence safely
-                        if isinstance(text_data, (list, tuple)) and len(text_data) >= 2:
-                            text = str(text_data[0])
-                            conf = float(text_data[1]) if text_data[1] is not None else 0.5
-                        elif isinstance(text_data, str):
-                            # Fallback: if line[1] is just text string
-                            text = str(text_data)
-                            conf = 0.7  # Default confidence
-                        else:
-                            logger.debug(f"Skipping: unknown text_data format: {text_data}")
-                            continue
-                    
-                        # Extract bbox coordinates
-                        if not bbox or len(bbox) < 2:
-                            logger.debug(f"Skipping: invalid bbox: {bbox}")
-                            continue
-                    
-                        x_coords = [float(p[0]) for p in bbox if len(p) >= 2]
-                        y_coords = [float(p[1]) for p in bbox if len(p) >= 2]
-                    
-                        if not x_coords or not y_coords:
-                            logger.debug(f"Skipping: no valid coordinates in bbox")
-                            continue
-                    
-                        center_x = int(sum(x_coords) / len(x_coords))
-                        center_y = int(sum(y_coords) / len(y_coords))
-                    
-                        # Add non-empty text elements
-                        if len(text.strip()) > 1 and conf > 0.3:
-                            elements.append({
-                            'id': element_id,
-                            'label': f'Text: {text[:50]}',  # Truncate long text
-                            'x': center_x,
-                            'y': center_y,
-                            'confidence': conf,
-                            'type': 'text',
-                            'bbox': [int(min(x_coords)), int(min(y_coords)), 
-                                    int(max(x_coords)), int(max(y_coords))]
-                            })
-                            element_id += 1
-                            text_count += 1
-                
-                    except (IndexError, ValueError, TypeError) as e:
-                        logger.debug(f"Skipping OCR line due to format error: {e}, line: {line}")
-                        continue
-        
-            logger.info(f"✓ OCR: {text_count} text elements")
-            logger.info(f"✅ TOTAL: {len(elements)} elements detected")
-        
-            if len(elements) == 0:
-                logger.warning("⚠️ No elements detected (YOLO + OCR both empty)")
-
-            return {
-            "elements": elements,
-            "total": len(elements),
-            "resolution": f"{width}x{height}"
-            }
-    
+            if isinstance(screenshot_path, (str, Path)):
+                logger.info(f"📸 Parsing: {screenshot_path}")
+                image = Image.open(screenshot_path)
+            else:
+                logger.info("📸 Parsing in-memory image")
+                image = screenshot_path
+
+            result = None
+            if self.service:
+                try:
+                    result = self.service.parse(image)
+                    logger.info(f"✓ Parse service: {result['total']} elements")
+                except Exception as service_error:
+                    logger.warning(f"Parse service failed ({service_error}), falling back to local models")
+
+            if result is None:
+                result = self.parse_batch([image])[0]
+
+            result["changes"] = None
+            if track:
+                self.track(result)
+
+            return result
+
         except Exception as e:
             logger.critical(f"❌ CRITICAL: OmniParser parse failed: {e}", exc_info=True)
             raise RuntimeError(f"OmniParser parse MUST work. Error: {e}")
+
+    def track(self, result):
+        """Stable identities across parses (ids are detection order only); sets result['changes']"""
+        if result["resolution"] != self._last_resolution:
+            self.tracker.reset()
+            self._last_resolution = result["resolution"]
+        changes = self.tracker.update(result["elements"])
+        logger.info(f"✓ Tracker: +{len(changes['added'])} -{len(changes['removed'])} ~{len(changes['moved'])}")
+        result["changes"] = changes
+        return changes
+
+    def parse_batch(self, images):
+        """
+        Parse several PIL images locally with one batched YOLO call.
+
+        Returns:
+            list of {"elements": [...], "total": int, "resolution": "WxH", "scale": float,
+            "timings": {stage: seconds}} in input order
+        """
+        import numpy as np
+
+        with self._parse_lock:
+            if not self.models_loaded:
+                self._load_local_models()
+
+            # Held for the whole batch so a prefetch elsewhere cannot evict them mid-parse
+            with self._registry.use("omniparser.yolo") as som, self._registry.use("omniparser.paddleocr") as ocr:
+                policy = self.resolution_policy
+                scales = [policy.scale_for(image.size) if policy else 1.0 for image in images]
+                for image, scale in zip(images, scales):
+                    logger.info(f"Image: {image.size[0]}x{image.size[1]} (inference scale {scale:.2f})")
+
+                # YOLO detection (boxes come back in original image coordinates)
+                predict_kwargs = {}
+                if policy:
+                    sizes = [policy.yolo_imgsz(image.size, scale) for image, scale in zip(images, scales)]
+                    predict_kwargs["imgsz"] = (max(h for h, _ in sizes), max(w for _, w in sizes))
+                logger.info(f"Running YOLO detection (batch of {len(images)})...")
+                yolo_start = time.perf_counter()
+                results = som.predict(
+                images if len(images) > 1 else images[0],
+                conf=0.15,
+                device=self.device,
+                verbose=False,
+                **predict_kwargs
+                )
+                yolo_seconds = (time.perf_counter() - yolo_start) / len(images)
+
+                parsed = []
+                for image, scale, yolo_result in zip(images, scales, results):
+                    width, height = image.size
+                    elements = self._yolo_elements(yolo_result, start_id=1)
+                    logger.info(f"✓ YOLO: {len(elements)} elements")
+
+                    # OCR detection with robust parsing
+                    logger.info("Running OCR...")
+                    ocr_start = time.perf_counter()
+                    ocr_image = policy.downscale(image, scale) if policy else image
+                    img_array = np.array(ocr_image)
+
+                    try:
+                        ocr_result = ocr.ocr(img_array)
+                    except Exception as ocr_error:
+                        logger.warning(f"OCR call failed: {ocr_error}, continuing with YOLO-only results")
+                        ocr_result = None
+
+                    text_elements = self._ocr_elements(ocr_result, start_id=len(elements) + 1)
+                    ResolutionPolicy.map_back(text_elements, image.size, ocr_image.size)
+                    if policy:
+                        policy.observe(text_elements)
+                    ocr_seconds = time.perf_counter() - ocr_start
+                    elements.extend(text_elements)
+                    logger.info(f"✓ OCR: {len(text_elements)} text elements")
+                    logger.info(f"✅ TOTAL: {len(elements)} elements detected")
+
+                    if len(elements) == 0:
+                        logger.warning("⚠️ No elements detected (YOLO + OCR both empty)")
+
+                    parsed.append({
+                    "elements": elements,
+                    "total": len(elements),
+                    "resolution": f"{width}x{height}",
+                    "scale": scale,
+                    "timings": {"yolo": yolo_seconds, "ocr": ocr_seconds}
+                    })
+                return parsed
+
+    def locate(self, image, target, roi=None, min_score=0.85, batch_size=8, max_candidates=48):
+        """
+        Find the text line containing `target` without recognizing the whole frame.
+
+        Runs PaddleOCR text detection only, ranks the detected line boxes by how well
+        their size fits the target and how close they are to the ROI, then recognizes
+        candidates in batches until one matches confidently.
+
+        Args:
+            image: Path or PIL image
+            target: Text to find
+            roi: Optional [x1, y1, x2, y2] focus region (e.g. the active window)
+            min_score: Text similarity (0-1) needed to accept a line
+            batch_size: Lines recognized per recognition call
+            max_candidates: Stop after recognizing this many lines
+
+        Returns:
+            Text element dict (parse_screen format, plus 'match_score') or None
+        """
+        import numpy as np
+        from PIL import Image
+
+        target = (target or "").strip()
+        if len(target) < 2:
+            return None
+        if self.service and not self.models_loaded:
+            return None  # detection-only calls need the local models
+
+        if isinstance(image, (str, Path)):
+            image = Image.open(image)
+        img_array = np.array(image.convert("RGB"))
+        height, width = img_array.shape[:2]
+
+        with self._parse_lock:
+            if not self.models_loaded:
+                self._load_local_models()
+
+            with self._registry.use("omniparser.paddleocr") as ocr:
+                # Detect on the policy-scaled frame, recognize crops from the full-resolution one
+                scale = self.resolution_policy.scale_for((width, height)) if self.resolution_policy else 1.0
+                det_array = np.array(self.resolution_policy.downscale(image.convert("RGB"), scale)) if scale < 1 else img_array
+                sx, sy = width / det_array.shape[1], height / det_array.shape[0]
+
+                start = time.perf_counter()
+                try:
+                    det_result = ocr.ocr(det_array, det=True, rec=False, cls=False)
+                except Exception as e:
+                    logger.warning(f"Text detection failed: {e}")
+                    return None
+                quads = det_result[0] if det_result and det_result[0] else []
+                det_seconds = time.perf_counter() - start
+
+                boxes = []
+                for quad in quads:
+                    xs = [float(p[0]) * sx for p in quad]
+                    ys = [float(p[1]) * sy for p in quad]
+                    x1, y1 = max(0, int(min(xs))), max(0, int(min(ys)))
+                    x2, y2 = min(width, int(math.ceil(max(xs)))), min(height, int(math.ceil(max(ys))))
+                    if x2 - x1 > 2 and y2 - y1 > 2:
+                        boxes.append([x1, y1, x2, y2])
+                candidates = sorted(boxes, key=lambda b: self._line_rank(b, target, roi, width, height))
+
+                best, recognized = None, 0
+                rec_start = time.perf_counter()
+                for offset in range(0, min(len(candidates), max_candidates), batch_size):
+                    batch = candidates[offset:offset + batch_size]
+                    crops = [img_array[b[1]:b[3], b[0]:b[2]] for b in batch]
+                    recognized += len(batch)
+                    for bbox, (text, conf) in zip(batch, self._recognize(ocr, crops)):
+                        score, fraction = self._text_match(target, text)
+                        if best is None or score > best[0]:
+                            best = (score, fraction, bbox, text, conf)
+                    if best and best[0] >= min_score:
+                        break
+                rec_seconds = time.perf_counter() - rec_start
+
+        logger.info(f"Locate '{target}': {len(boxes)} lines detected ({det_seconds * 1000:.0f}ms), "
+                    f"{recognized} recognized ({rec_seconds * 1000:.0f}ms)")
+        if not best or best[0] < min_score:
+            return None
+
+        score, fraction, (x1, y1, x2, y2), text, conf = best
+        return {
+            'id': 1,
+            'label': f'Text: {text[:50]}',
+            'x': int(x1 + fraction * (x2 - x1)),  # centre of the matched substring, not the line
+            'y': (y1 + y2) // 2,
+            'confidence': conf,
+            'type': 'text',
+            'bbox': [x1, y1, x2, y2],
+            'match_score': score,
+        }
+
+    @staticmethod
+    def _line_rank(bbox, target, roi, width, height):
+        """Cheap pre-recognition cost of a detected line (lower = recognize sooner)"""
+        x1, y1, x2, y2 = bbox
+        line_height = max(1, y2 - y1)
+        # Latin text runs ~0.55 line heights per character
+        expected_width = 0.55 * line_height * len(target)
+        ratio = (x2 - x1) / expected_width
+        # Lines shorter than the target cannot contain it; longer ones might hold it plus other text
+        length_cost = -math.log(ratio) * 2 if ratio < 1 else math.log(ratio) * 0.5
+
+        proximity_cost = 0.0
+        if roi:
+            cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+            dx = max(roi[0] - cx, 0, cx - roi[2])
+            dy = max(roi[1] - cy, 0, cy - roi[3])
+            proximity_cost = math.hypot(dx, dy) / math.hypot(width, height) * 4
+        return length_cost + proximity_cost
+
+    @staticmethod
+    def _recognize(ocr, crops):
+        """Recognize a batch of line crops with a PaddleOCR instance -> [(text, confidence)]"""
+        recognizer = getattr(ocr, "text_recognizer", None)
+        try:
+            if recognizer is not None:
+                results, _ = recognizer(crops)
+                return [(str(text), float(conf)) for text, conf in results]
+        except Exception as e:
+            logger.debug(f"Batched recognition failed ({e}), recognizing lines one by one")
+
+        results = []
+        for crop in crops:
+            try:
+                res = ocr.ocr(crop, det=False, rec=True, cls=False)
+                text, conf = res[0][0]
+                results.append((str(text), float(conf)))
+            except Exception:
+                results.append(("", 0.0))
+        return results
+
+    @staticmethod
+    def _text_match(target, text):
+        """
+        Similarity of `target` to the best matching part of `text`.
+
+        Returns:
+            (score 0-1, horizontal position of the match within the line as a 0-1 fraction)
+        """
+        target, text = target.lower(), (text or "").lower().strip()
+        if not text:
+            return 0.0, 0.5
+        index = text.find(target)
+        if index >= 0:
+            return 1.0, (index + len(target) / 2) / len(text)
+        if len(text) <= len(target):
+            return SequenceMatcher(None, target, text).ratio(), 0.5
+
+        best_score, best_index = 0.0, 0
+        for i in range(len(text) - len(target) + 1):
+            score = SequenceMatcher(None, target, text[i:i + len(target)]).ratio()
+            if score > best_score:
+                best_score, best_index = score, i
+        return best_score, (best_index + len(target) / 2) / len(text)
+
+    @staticmethod
+    def _yolo_elements(yolo_result, start_id):
+        """Convert one YOLO result into clickable elements"""
+        elements = []
+        element_id = start_id
+        for box in yolo_result.boxes:
+            x1, y1, x2, y2 = box.xyxy[0].tolist()
+            center_x = int((x1 + x2) / 2)
+            center_y = int((y1 + y2) / 2)
+            conf = float(box.conf[0])
+
+            elements.append({
+            'id': element_id,
+            'label': f'UI Element {element_id}',
+            'x': center_x,
+            'y': center_y,
+            'confidence': conf,
+            'type': 'clickable',
+            'bbox': [int(x1), int(y1), int(x2), int(y2)]
+            })
+            element_id += 1
+        return elements
+
+    @staticmethod
+    def _ocr_elements(ocr_result, start_id):
+        """Convert a PaddleOCR result into text elements"""
+        elements = []
+        element_id = start_id
+        if not (ocr_result and len(ocr_result) > 0 and ocr_result[0]):
+            return elements
+
+        for line in ocr_result[0]:
+            try:
+                # Robust parsing: PaddleOCR format is [[x1,y1], [x2,y2], [x3,y3], [x4,y4]], (text, confidence)
+                if len(line) < 2:
+                    logger.debug(f"Skipping malformed OCR line: {line}")
+                    continue
+
+                bbox = line[0]  # Bounding box coordinates
+                text_data = line[1]  # Text and confidence
+
+                # Extract text and confidence safely
+                if isinstance(text_data, (list, tuple)) and len(text_data) >= 2:
+                    text = str(text_data[0])
+                    conf = float(text_data[1]) if text_data[1] is not None else 0.5
+                elif isinstance(text_data, str):
+                    # Fallback: if line[1] is just text string
+                    text = str(text_data)
+                    conf = 0.7  # Default confidence
+                else:
+                    logger.debug(f"Skipping: unknown text_data format: {text_data}")
+                    continue
+
+                # Extract bbox coordinates
+                if not bbox or len(bbox) < 2:
+                    logger.debug(f"Skipping: invalid bbox: {bbox}")
+                    continue
+
+                x_coords = [float(p[0]) for p in bbox if len(p) >= 2]
+                y_coords = [float(p[1]) for p in bbox if len(p) >= 2]
+
+                if not x_coords or not y_coords:
+                    logger.debug(f"Skipping: no valid coordinates in bbox")
+                    continue
+
+                center_x = int(sum(x_coords) / len(x_coords))
+                center_y = int(sum(y_coords) / len(y_coords))
+
+                # Add non-empty text elements
+                if len(text.strip()) > 1 and conf > 0.3:
+                    elements.append({
+                    'id': element_id,
+                    'label': f'Text: {text[:50]}',  # Truncate long text
+                    'x': center_x,
+                    'y': center_y,
+                    'confidence': conf,
+                    'type': 'text',
+                    'bbox': [int(min(x_coords)), int(min(y_coords)),
+                            int(max(x_coords)), int(max(y_coords))]
+                    })
+                    element_id += 1
+
+            except (IndexError, ValueError, TypeError) as e:
+                logger.debug(f"Skipping OCR line due to format error: {e}, line: {line}")
+                continue
+        return elements
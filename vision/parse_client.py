@@ -0,0 +1,173 @@
+"""
+Parse Service Client - thin client for the out-of-process OmniParser server
+Frames travel as a compact binary payload (zlib-compressed raw pixels) or,
+when the server runs on the same host, through shared memory. Requests carry
+the shared token from EVA_PARSE_SERVICE_TOKEN when it is set.
+"""
+
+import ipaddress
+import json
+import logging
+import os
+import struct
+import urllib.request
+import zlib
+from urllib.parse import urlparse
+
+logger = logging.getLogger("ParseServiceClient")
+
+# Frame payload: header + body
+#   magic(4s) version(B) kind(B) width(H) height(H) channels(B)
+FRAME_MAGIC = b"EVAF"
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct(">4sBBHHB")
+
+KIND_RAW = 0   # body = raw pixels
+KIND_ZLIB = 1  # body = zlib(raw pixels)
+KIND_PNG = 2   # body = PNG file bytes
+KIND_SHM = 3   # body = utf-8 name of a shared memory block holding raw pixels (loopback clients only)
+
+TOKEN_ENV = "EVA_PARSE_SERVICE_TOKEN"
+TOKEN_HEADER = "X-EVA-Token"
+
+MODES_BY_CHANNELS = {1: "L", 3: "RGB", 4: "RGBA"}
+
+
+def is_loopback(host):
+    """True for 127.0.0.0/8, ::1 and 'localhost'"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def encode_frame(image, kind=KIND_ZLIB, shm_name=None):
+    """Serialize a PIL image into a frame payload"""
+    if image.mode not in ("L", "RGB", "RGBA"):
+        image = image.convert("RGB")
+    channels = len(image.getbands())
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, kind, image.width, image.height, channels)
+
+    if kind == KIND_RAW:
+        body = image.tobytes()
+    elif kind == KIND_ZLIB:
+        body = zlib.compress(image.tobytes(), 1)
+    elif kind == KIND_PNG:
+        import io
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", compress_level=1)
+        body = buffer.getvalue()
+    elif kind == KIND_SHM:
+        body = shm_name.encode("utf-8")
+    else:
+        raise ValueError(f"Unknown frame kind: {kind}")
+    return header + body
+
+
+def decode_frame(payload, allow_shm=False):
+    """
+    Deserialize a frame payload back into a PIL image.
+
+    Args:
+        allow_shm: Accept KIND_SHM payloads (the body names a block to map, so only
+            for clients on this host)
+    """
+    from PIL import Image
+
+    magic, version, kind, width, height, channels = FRAME_HEADER.unpack_from(payload)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError("Not an EVA frame payload")
+    body = payload[FRAME_HEADER.size:]
+    mode = MODES_BY_CHANNELS[channels]
+
+    if kind == KIND_RAW:
+        return Image.frombytes(mode, (width, height), body)
+    if kind == KIND_ZLIB:
+        return Image.frombytes(mode, (width, height), zlib.decompress(body))
+    if kind == KIND_PNG:
+        import io
+        return Image.open(io.BytesIO(body)).convert(mode)
+    if kind == KIND_SHM:
+        if not allow_shm:
+            raise PermissionError("Shared-memory frames are only accepted from loopback clients")
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=body.decode("utf-8"))
+        try:
+            size = width * height * channels
+            return Image.frombytes(mode, (width, height), bytes(shm.buf[:size]))
+        finally:
+            shm.close()
+    raise ValueError(f"Unknown frame kind: {kind}")
+
+
+class ParseServiceClient:
+    """HTTP client for vision/parse_server.py"""
+
+    def __init__(self, url, timeout=30.0, use_shared_memory=None, token=None):
+        """
+        Args:
+            url: Server base URL, e.g. http://127.0.0.1:8765
+            timeout: Seconds to wait for a parse
+            use_shared_memory: Pass frames via shared memory (default: only for localhost servers)
+            token: Shared token the server requires (default: $EVA_PARSE_SERVICE_TOKEN)
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        host = urlparse(self.url).hostname
+        if use_shared_memory is None:
+            use_shared_memory = is_loopback(host)
+        self.use_shared_memory = use_shared_memory
+        self.token = token if token is not None else os.environ.get(TOKEN_ENV)
+
+    def _headers(self, **headers):
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        return headers
+
+    def is_available(self):
+        """True if the server answers its health check"""
+        try:
+            request = urllib.request.Request(f"{self.url}/health", headers=self._headers())
+            with urllib.request.urlopen(request, timeout=1.0) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.debug(f"Parse service health check failed: {e}")
+            return False
+
+    def parse(self, image):
+        """
+        Parse a PIL image remotely.
+
+        Returns:
+            dict: {"elements": [...], "total": int, "resolution": "WxH", ...}
+        """
+        shm = None
+        try:
+            if self.use_shared_memory:
+                from multiprocessing import shared_memory
+                if image.mode not in ("L", "RGB", "RGBA"):
+                    image = image.convert("RGB")
+                raw = image.tobytes()
+                shm = shared_memory.SharedMemory(create=True, size=len(raw))
+                shm.buf[:len(raw)] = raw
+                payload = encode_frame(image, KIND_SHM, shm_name=shm.name)
+            else:
+                payload = encode_frame(image, KIND_ZLIB)
+
+            request = urllib.request.Request(
+                f"{self.url}/parse",
+                data=payload,
+                headers=self._headers(**{"Content-Type": "application/x-eva-frame"}),
+                method="POST",
+            )
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                result = json.loads(response.read().decode("utf-8"))
+            if "error" in result:
+                raise RuntimeError(result["error"])
+            return result
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
@@ -0,0 +1,179 @@
+"""
+Parse Server - runs OmniParser (YOLO + PaddleOCR) in its own process
+Keeps heavy inference out of the GUI process and lets one machine serve
+several desktops. Concurrent requests are dynamically batched.
+
+Shared-memory frames are only accepted from loopback clients. Binding to a
+non-loopback address requires a shared token (--token or
+EVA_PARSE_SERVICE_TOKEN) that clients send in the X-EVA-Token header; the
+traffic itself is plain HTTP, so only expose the server on a trusted network.
+
+Usage:
+    python -m vision.parse_server --port 8765
+    EVA_PARSE_SERVICE_TOKEN=<secret> python -m vision.parse_server --host 192.168.1.20 --port 8765
+
+Endpoints:
+    GET  /health  -> {"status": "ok", ...}
+    POST /parse   -> frame payload (see vision/parse_client.py) -> element list JSON
+"""
+
+import argparse
+import hmac
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from vision.parse_client import TOKEN_ENV, TOKEN_HEADER, decode_frame, is_loopback
+
+logger = logging.getLogger("ParseServer")
+
+
+class BatchingParser:
+    """Collects concurrent parse requests into batches for OmniParserExecutor.parse_batch"""
+
+    def __init__(self, omniparser, max_batch=4, max_wait_ms=15):
+        """
+        Args:
+            omniparser: Locally-loaded OmniParserExecutor
+            max_batch: Largest batch handed to the models
+            max_wait_ms: How long the first request of a batch waits for company
+        """
+        self.omniparser = omniparser
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests_served = 0
+        self.batches_run = 0
+        self._queue = queue.Queue()
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def submit(self, image):
+        """Parse one image, blocking until its batch completes"""
+        request = {"image": image, "event": threading.Event(), "result": None, "error": None}
+        self._queue.put(request)
+        request["event"].wait()
+        if request["error"]:
+            raise request["error"]
+        return request["result"]
+
+    def _worker(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            start = time.perf_counter()
+            try:
+                results = self.omniparser.parse_batch([r["image"] for r in batch])
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                for request, result in zip(batch, results):
+                    result["batch_size"] = len(batch)
+                    result["server_ms"] = round(elapsed_ms, 1)
+                    request["result"] = result
+            except Exception as e:
+                logger.error(f"Batch parse failed: {e}", exc_info=True)
+                for request in batch:
+                    request["error"] = e
+            finally:
+                self.batches_run += 1
+                self.requests_served += len(batch)
+                for request in batch:
+                    request["event"].set()
+            logger.info(f"Parsed batch of {len(batch)} in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+def make_handler(batcher, token=None):
+    """Build the request handler class bound to a BatchingParser (token: required X-EVA-Token value)"""
+
+    class ParseRequestHandler(BaseHTTPRequestHandler):
+        def _authorized(self):
+            if token and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+                self._send_json(401, {"error": "unauthorized"})
+                return False
+            return True
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            if self.path != "/health":
+                self._send_json(404, {"error": "not found"})
+                return
+            self._send_json(200, {
+                "status": "ok",
+                "requests_served": batcher.requests_served,
+                "batches_run": batcher.batches_run,
+            })
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            if self.path != "/parse":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                image = decode_frame(self.rfile.read(length), allow_shm=is_loopback(self.client_address[0]))
+                self._send_json(200, batcher.submit(image))
+            except PermissionError as e:
+                logger.warning(f"Rejected request from {self.client_address[0]}: {e}")
+                self._send_json(403, {"error": str(e)})
+            except Exception as e:
+                logger.error(f"Parse request failed: {e}")
+                self._send_json(500, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return ParseRequestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EVA OmniParser parse server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=4)
+    parser.add_argument("--max-wait-ms", type=int, default=15)
+    parser.add_argument("--target-text-px", type=int, default=0,
+                        help="Enable adaptive downscaling keeping text at least this tall (0 = full resolution)")
+    parser.add_argument("--token", default=os.environ.get(TOKEN_ENV),
+                        help=f"Shared token clients must send (default: ${TOKEN_ENV}); required off loopback")
+    args = parser.parse_args()
+    if not is_loopback(args.host) and not args.token:
+        parser.error(f"--host {args.host} is reachable from other machines: set --token or {TOKEN_ENV}")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from vision.omniparser_executor import OmniParserExecutor
+    from vision.resolution_policy import ResolutionPolicy
+    policy = ResolutionPolicy(target_text_px=args.target_text_px) if args.target_text_px else None
+    batcher = BatchingParser(OmniParserExecutor(resolution_policy=policy),
+                             max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(batcher, args.token))
+    logger.info(f"✅ Parse server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Parse server stopped")
+
+
+if __name__ == "__main__":
+    main()
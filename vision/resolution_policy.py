@@ -0,0 +1,113 @@
+"""
+Resolution Policy - picks the detection/OCR input scale per frame
+Text only needs ~10-12 px of height to be detected and recognized reliably,
+so high-DPI frames (or screens with larger-than-standard text) are OCR'd at a
+reduced scale and coordinates are mapped back to screen pixels afterwards.
+YOLO never runs above the detector's native input size.
+"""
+
+import logging
+import statistics
+
+logger = logging.getLogger("ResolutionPolicy")
+
+BASE_DPI = 96
+BASE_TEXT_HEIGHT = 13  # px height of a 9pt UI text line at 96 DPI
+YOLO_STRIDE = 32
+DETECTOR_IMGSZ = 640  # icon detector's training/native input size (ultralytics default)
+
+
+def system_dpi():
+    """DPI of the primary display (96 when unknown)"""
+    try:
+        import ctypes
+        return ctypes.windll.user32.GetDpiForSystem() or BASE_DPI
+    except Exception:
+        return BASE_DPI
+
+
+def round_to_stride(value, stride=YOLO_STRIDE):
+    """Round a side length up to the detector stride"""
+    return max(stride, int(-(-value // stride) * stride))
+
+
+class ResolutionPolicy:
+    """Chooses the inference scale from screen size, DPI and observed text height"""
+
+    def __init__(self, target_text_px=11, min_scale=0.4, dpi=None, fixed_scale=None, detector_imgsz=DETECTOR_IMGSZ):
+        """
+        Args:
+            target_text_px: Smallest text height (px) the scaled frame should keep
+            min_scale: Never scale below this
+            dpi: Display DPI (detected when None)
+            fixed_scale: Force a scale (benchmark sweeps); disables adaptation
+            detector_imgsz: Longest YOLO input side; larger inputs only cost time
+        """
+        self.target_text_px = target_text_px
+        self.min_scale = min_scale
+        self.dpi = dpi or system_dpi()
+        self.fixed_scale = fixed_scale
+        self.detector_imgsz = detector_imgsz
+        self.observed_text_height = None  # median OCR line height at full resolution
+
+    def scale_for(self, size):
+        """Inference scale (0-1] for a frame of `size` (width, height)"""
+        if self.fixed_scale:
+            return self.fixed_scale
+
+        # Standard-DPI text is already close to the target: downscaling only costs recall
+        if self.observed_text_height is not None:
+            if self.observed_text_height <= BASE_TEXT_HEIGHT:
+                return 1.0
+            text_height = self.observed_text_height
+        elif self.dpi > BASE_DPI:
+            text_height = BASE_TEXT_HEIGHT * self.dpi / BASE_DPI
+        else:
+            return 1.0
+        scale = self.target_text_px / max(1.0, text_height)
+        return max(self.min_scale, min(1.0, scale))
+
+    def scaled_size(self, size, scale):
+        width, height = size
+        return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+    def yolo_imgsz(self, size, scale):
+        """YOLO imgsz (h, w) for a frame parsed at `scale`, capped at detector_imgsz on the long side"""
+        width, height = self.scaled_size(size, scale)
+        cap = self.detector_imgsz / max(width, height)
+        if cap < 1:
+            width, height = width * cap, height * cap
+        return round_to_stride(height), round_to_stride(width)
+
+    def downscale(self, image, scale):
+        """Resized copy of a PIL image (the image itself at scale 1)"""
+        if scale >= 0.999:
+            return image
+        from PIL import Image
+        return image.resize(self.scaled_size(image.size, scale), Image.BILINEAR)
+
+    @staticmethod
+    def map_back(elements, original_size, scaled_size):
+        """Map element x/y/bbox from the scaled frame back to original pixels (in place)"""
+        sx = original_size[0] / scaled_size[0]
+        sy = original_size[1] / scaled_size[1]
+        if sx == 1 and sy == 1:
+            return elements
+        for elem in elements:
+            x1, y1, x2, y2 = elem['bbox']
+            elem['bbox'] = [int(round(x1 * sx)), int(round(y1 * sy)), int(round(x2 * sx)), int(round(y2 * sy))]
+            elem['x'] = int(round(elem['x'] * sx))
+            elem['y'] = int(round(elem['y'] * sy))
+        return elements
+
+    def observe(self, elements):
+        """Learn the screen's typical text height from full-resolution text elements"""
+        heights = [e['bbox'][3] - e['bbox'][1] for e in elements if e.get('type') == 'text' and e.get('bbox')]
+        if len(heights) < 5:
+            return
+        median = statistics.median(heights)
+        if self.observed_text_height is None:
+            self.observed_text_height = median
+        else:
+            self.observed_text_height = 0.8 * self.observed_text_height + 0.2 * median
+        logger.debug(f"Observed text height: {self.observed_text_height:.1f}px")
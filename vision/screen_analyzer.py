@@ -9,6 +9,8 @@ import re
 import google.generativeai as genai
 from difflib import SequenceMatcher
 
+import config
+
 logger = logging.getLogger("ScreenAnalyzer")
 
 
@@ -18,7 +20,9 @@ class ScreenAnalyzer:
     def __init__(self, api_key):
         """Initialize Gemini for screen analysis"""
         self.logger = logging.getLogger("ScreenAnalyzer")
-        
+        if not api_key:
+            raise ValueError(config.GEMINI_API_KEY_MISSING)
+
         try:
             genai.configure(api_key=api_key)
             
@@ -246,23 +250,8 @@ JSON:"""
             self.logger.error(f"Coordinate filtering error: {e}")
             return {"x": 0, "y": 0, "operation": "click", "confidence": 0}
     
-    def select_coordinate(self, elements, target_label, step_context, profile_name=None):
-        """
-        Use Gemini to select best coordinate from OmniParser elements
-        
-        Args:
-            elements: List of {id, label, x, y, type, confidence} from OmniParser
-            target_label: What we're looking for (e.g., "Code Crusaders", "Type a message")
-            step_context: Full step dict with description
-            profile_name: Optional profile name to look for.
-        
-        Returns:
-            (x, y) tuple or None
-        """
-        if not elements:
-            self.logger.warning("No elements to select from")
-            return None
-        
+    def _build_selection_prompt(self, elements, target_label, step_context, profile_name=None):
+        """Build the Gemini element-selection prompt (top 50 elements by confidence)"""
         # Sort elements by confidence for better selection
         sorted_elements = sorted(
             elements, 
@@ -316,6 +305,26 @@ Examples:
 - Target "Send button" → Select button element with "Send"
 
 JSON:"""
+        return prompt
+    
+    def select_coordinate(self, elements, target_label, step_context, profile_name=None):
+        """
+        Use Gemini to select best coordinate from OmniParser elements
+        
+        Args:
+            elements: List of {id, label, x, y, type, confidence} from OmniParser
+            target_label: What we're looking for (e.g., "Code Crusaders", "Type a message")
+            step_context: Full step dict with description
+            profile_name: Optional profile name to look for.
+        
+        Returns:
+            (x, y) tuple or None
+        """
+        if not elements:
+            self.logger.warning("No elements to select from")
+            return None
+        
+        prompt = self._build_selection_prompt(elements, target_label, step_context, profile_name)
         
         try:
             response = self.model.generate_content(prompt)
@@ -0,0 +1,205 @@
+"""
+Screen Indexer - optional always-on element index of the screen
+Watches for frame changes at low FPS, re-parses changed regions while the
+CPU is idle and serves SCREEN_ANALYSIS lookups from the current index.
+"""
+
+import logging
+import threading
+import time
+
+import config
+from vision.screenshot_handler import frame_signature, frames_differ
+
+try:
+    import psutil
+except ImportError:  # idle detection is best-effort
+    psutil = None
+
+logger = logging.getLogger("ScreenIndexer")
+
+SIGNATURE_SIZE = (64, 36)
+
+
+def changed_region(sig_a, sig_b, screen_size, tolerance=8, margin=24):
+    """
+    Bounding box (screen pixels) of the thumbnail cells that changed between two signatures.
+
+    Returns:
+        [x1, y1, x2, y2] or None if nothing changed
+    """
+    if sig_a is None or sig_b is None or len(sig_a) != len(sig_b):
+        return [0, 0, screen_size[0], screen_size[1]]
+
+    cols, rows = SIGNATURE_SIZE
+    min_c, min_r, max_c, max_r = cols, rows, -1, -1
+    for i, (a, b) in enumerate(zip(sig_a, sig_b)):
+        if abs(a - b) > tolerance:
+            r, c = divmod(i, cols)
+            min_c, max_c = min(min_c, c), max(max_c, c)
+            min_r, max_r = min(min_r, r), max(max_r, r)
+    if max_c < 0:
+        return None
+
+    sx, sy = screen_size[0] / cols, screen_size[1] / rows
+    return [
+        max(0, int(min_c * sx) - margin),
+        max(0, int(min_r * sy) - margin),
+        min(screen_size[0], int((max_c + 1) * sx) + margin),
+        min(screen_size[1], int((max_r + 1) * sy) + margin),
+    ]
+
+
+class ScreenIndexer:
+    """Background daemon keeping a parsed element index of the current screen"""
+
+    def __init__(self, screenshot_handler, omniparser, fps=None, idle_cpu_percent=None,
+                 max_region_fraction=None, settle_seconds=None):
+        """
+        Args:
+            screenshot_handler: ScreenshotHandler used for in-memory grabs
+            omniparser: OmniParserExecutor used for (region) parses
+            fps: Frame-change polling rate
+            idle_cpu_percent: Re-parse only while system CPU usage is below this
+            max_region_fraction: Changed regions larger than this fraction of the screen trigger a full parse
+            settle_seconds: Frames captured this soon after an input event may predate its effect
+        """
+        self.screenshot_handler = screenshot_handler
+        self.omniparser = omniparser
+        self.interval = 1.0 / (fps or config.SCREEN_INDEXER_FPS)
+        self.idle_cpu_percent = idle_cpu_percent or config.SCREEN_INDEXER_IDLE_CPU
+        self.max_region_fraction = max_region_fraction or config.SCREEN_INDEXER_MAX_REGION
+        self.settle_seconds = settle_seconds if settle_seconds is not None else config.SCREEN_INDEXER_SETTLE
+        self.change_tolerance = config.FRAME_CHANGE_TOLERANCE
+
+        self.is_running = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # Current index: elements valid for the frame saved at frame_path, captured at indexed_at
+        self.elements = []
+        self.resolution = None
+        self.frame_path = None
+        self.indexed_at = 0.0
+        self._indexed_signature = None
+        self._latest_signature = None
+        self._pending_region = None
+
+    # ---------- Lifecycle ----------
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f"✓ Screen indexer started ({1.0 / self.interval:.1f} FPS)")
+
+    def stop(self):
+        self.is_running = False
+        logger.info("Screen indexer stopped")
+
+    # ---------- Lookup ----------
+    def lookup(self, since=0.0):
+        """
+        Serve the current index if it reflects the screen after `since`.
+
+        Args:
+            since: Timestamp of the last input event; older indexes are stale
+
+        Returns:
+            (frame_path, parse_result, indexed_at) or None when stale
+        """
+        with self._lock:
+            if not self.frame_path or self.indexed_at <= since + self.settle_seconds:
+                return None
+            if self._pending_region is not None or frames_differ(
+                    self._latest_signature, self._indexed_signature, self.change_tolerance):
+                return None
+            parse_result = {
+                "elements": [dict(e) for e in self.elements],
+                "total": len(self.elements),
+                "resolution": self.resolution,
+                "indexed_at": self.indexed_at,
+            }
+            return self.frame_path, parse_result, self.indexed_at
+
+    # ---------- Worker ----------
+    def _cpu_idle(self):
+        if psutil is None:
+            return True
+        return psutil.cpu_percent(interval=None) < self.idle_cpu_percent
+
+    def _run(self):
+        while self.is_running:
+            started = time.time()
+            try:
+                self._tick()
+            except Exception as e:
+                logger.warning(f"Indexer tick failed: {e}")
+            time.sleep(max(0.0, self.interval - (time.time() - started)))
+
+    def _tick(self):
+        image = self.screenshot_handler.grab()
+        if image is None:
+            return
+        captured_at = time.time()
+        signature = frame_signature(image, SIGNATURE_SIZE)
+
+        with self._lock:
+            previous = self._latest_signature
+            self._latest_signature = signature
+            if previous is not None and previous != signature:
+                region = changed_region(previous, signature, image.size)
+                if region:
+                    self._pending_region = self._union(self._pending_region, region)
+            needs_parse = self.frame_path is None or self._pending_region is not None
+
+        if not needs_parse or not self._cpu_idle():
+            return
+
+        with self._lock:
+            region = self._pending_region
+            self._pending_region = None
+
+        width, height = image.size
+        full_parse = (
+            region is None or not self.elements or self.resolution != f"{width}x{height}"
+            or (region[2] - region[0]) * (region[3] - region[1]) > self.max_region_fraction * width * height
+        )
+
+        if full_parse:
+            result = self.omniparser.parse_screen(image, "background index", track=False)
+            elements = result.get("elements", [])
+        else:
+            crop = image.crop(tuple(region))
+            result = self.omniparser.parse_screen(crop, "background index (region)", track=False)
+            elements = self._merge_region(region, result.get("elements", []))
+
+        frame_path = self.screenshot_handler.save(image)
+        with self._lock:
+            self.elements = elements
+            self.resolution = f"{width}x{height}"
+            self.frame_path = frame_path
+            self.indexed_at = captured_at
+            self._indexed_signature = signature
+        logger.info(f"Index updated ({'full' if full_parse else 'region'}): {len(elements)} elements")
+
+    def _merge_region(self, region, region_elements):
+        """Replace indexed elements inside `region` with a re-parse of that region"""
+        x1, y1, x2, y2 = region
+        kept = [e for e in self.elements if not (x1 <= e['x'] <= x2 and y1 <= e['y'] <= y2)]
+        for elem in region_elements:
+            elem['x'] += x1
+            elem['y'] += y1
+            bx1, by1, bx2, by2 = elem['bbox']
+            elem['bbox'] = [bx1 + x1, by1 + y1, bx2 + x1, by2 + y1]
+            kept.append(elem)
+        for idx, elem in enumerate(kept, start=1):
+            elem['id'] = idx
+        return kept
+
+    @staticmethod
+    def _union(a, b):
+        if a is None:
+            return b
+        return [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
@@ -6,6 +6,20 @@ from datetime import datetime
 import config
 from utils.logger import setup_logger
 
+
+def frame_signature(image, size=(64, 36)):
+    """Tiny grayscale thumbnail used to detect whether the screen changed"""
+    return image.convert("L").resize(size).tobytes()
+
+
+def frames_differ(sig_a, sig_b, tolerance=2.0):
+    """True if two frame signatures differ by more than `tolerance` mean gray levels"""
+    if sig_a is None or sig_b is None or len(sig_a) != len(sig_b):
+        return True
+    total = sum(abs(a - b) for a, b in zip(sig_a, sig_b))
+    return total / len(sig_a) > tolerance
+
+
 class ScreenshotHandler:
     """Capture and manage screenshots"""
     
@@ -30,6 +44,30 @@ class ScreenshotHandler:
         except Exception as e:
             self.logger.error(f"Screenshot capture error: {e}")
             return None
+
+    def grab(self):
+        """Capture the full screen in memory (no file written)"""
+        try:
+            return pyautogui.screenshot()
+        except Exception as e:
+            self.logger.error(f"Screen grab error: {e}")
+            return None
+
+    def save(self, image):
+        """Save an in-memory capture to the temp folder and return its path"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        filepath = os.path.join(config.SCREENSHOT_TEMP_DIR, f"screen_{timestamp}.png")
+        image.save(filepath)
+        self.logger.info(f"Screenshot saved: {filepath}")
+        return filepath
+
+    def capture_region(self, left, top, width, height):
+        """Capture a screen region in memory (no file written)"""
+        try:
+            return pyautogui.screenshot(region=(int(left), int(top), int(width), int(height)))
+        except Exception as e:
+            self.logger.error(f"Region capture error: {e}")
+            return None
     
     def cleanup_old_screenshots(self, keep_last_n=10):
         """Clean up old screenshots, keeping only the last N"""